@@ -0,0 +1,145 @@
+from array import array
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from gridworld.costs import Costs
+from gridworld.direction import Direction
+from gridworld.terrain import Terrain
+
+# A step of a search graph over flat cells: the cell stepped to, and the
+# (non-positive) health and moves spent getting there.
+Edge = Tuple[int, int, int]
+
+# Order of the edges out of each cell, as in labels.neighbor_table().
+DIRECTIONS = (Direction.UP, Direction.LEFT, Direction.RIGHT, Direction.DOWN)
+DIRECTION_SLOTS = {d: i for i, d in enumerate(DIRECTIONS)}
+
+NO_EDGE = -1
+
+# Topologies kept for reuse, one per grid dimensions.
+TOPOLOGY_CACHE_SIZE = 8
+
+
+@dataclass(frozen=True, eq=False)
+class Topology:
+    """
+    Topology is the part of an Adjacency no Costs changes: the edges of a
+    grid of some dimensions, laid out as in Adjacency.
+
+    Every Adjacency of those dimensions shares one Topology's arrays, so
+    they must not be changed.
+    """
+
+    offsets: array
+    targets: array
+    by_direction: array
+
+
+@lru_cache(maxsize=TOPOLOGY_CACHE_SIZE)
+def topology(dimensions: Tuple[int, int]) -> Topology:
+    """
+    Returns the Topology of a grid of dimensions, built once and shared.
+    """
+    m, n = dimensions
+    offsets = array("i", [0])
+    targets = array("i")
+    by_direction = array("i", [NO_EDGE]) * (4 * m * n)
+    for r in range(m):
+        for c in range(n):
+            u = r * n + c
+            for slot, v, ok in (
+                (0, u - n, r > 0),
+                (1, u - 1, c > 0),
+                (2, u + 1, c < n - 1),
+                (3, u + n, r < m - 1),
+            ):
+                if ok:
+                    by_direction[u * 4 + slot] = len(targets)
+                    targets.append(v)
+            offsets.append(len(targets))
+    return Topology(offsets, targets, by_direction)
+
+
+def _int_array(values: np.ndarray) -> array:
+    result = array("i")
+    result.frombytes(values.astype(np.intc).tobytes())
+    return result
+
+
+@dataclass(eq=False)
+class Adjacency:
+    """
+    Adjacency is a grid compiled for search under one Costs: a CSR graph
+    over flat cell indexes.
+
+    The edges out of cell u are offsets[u] up to offsets[u + 1], in up,
+    left, right, down order.  targets holds the cell each edge enters, and
+    health_deltas and move_deltas what entering it costs.
+    by_direction[u * 4 + slot] is the edge out of u in DIRECTIONS[slot], or
+    NO_EDGE off the grid.  health_costs and move_costs are the costs of
+    entering each cell, for searches that run backward.
+
+    offsets, targets and by_direction come from topology() and are shared
+    with every other Adjacency of the same dimensions.
+    """
+
+    dimensions: Tuple[int, int]
+    offsets: array
+    targets: array
+    health_deltas: array
+    move_deltas: array
+    by_direction: array
+    health_costs: array
+    move_costs: array
+
+    @classmethod
+    def compile(
+        cls, dimensions: Tuple[int, int], cells: Iterable[int], costs: Costs
+    ) -> "Adjacency":
+        """
+        Returns the adjacency of a grid of the given dimensions and flat
+        terrain cells; see Grid.compile().
+        """
+        m, n = dimensions
+        shared = topology((m, n))
+        terrain = np.frombuffer(bytes(cells), dtype=np.uint8)
+        targets = np.frombuffer(shared.targets, dtype=np.intc)
+        hc = np.array([costs.health_cost_of(t) for t in Terrain])
+        mc = np.array([costs.move_cost_of(t) for t in Terrain])
+        return cls(
+            dimensions=(m, n),
+            offsets=shared.offsets,
+            targets=shared.targets,
+            health_deltas=_int_array(hc[terrain[targets]]),
+            move_deltas=_int_array(mc[terrain[targets]]),
+            by_direction=shared.by_direction,
+            health_costs=_int_array(hc[terrain]),
+            move_costs=_int_array(mc[terrain]),
+        )
+
+    @cached_property
+    def steps(self) -> Tuple[Tuple[Edge, ...], ...]:
+        """
+        Returns the edges out of each cell as (target, health, moves)
+        tuples, which pure Python loops iterate faster than the arrays.
+        """
+        offsets = self.offsets
+        edges = list(zip(self.targets, self.health_deltas, self.move_deltas))
+        return tuple(
+            tuple(edges[lo:hi]) for lo, hi in zip(offsets, offsets[1:])
+        )
+
+    def edge(self, cell: int, direction: Direction) -> int:
+        """
+        Returns the index of the edge out of cell in direction, or NO_EDGE.
+        """
+        slot = DIRECTION_SLOTS.get(direction)
+        if slot is None:
+            raise ValueError(f"invalid direction: {direction!r}")
+        return self.by_direction[cell * 4 + slot]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class Budget:
+    """
+    Budget bounds an anytime search by wall-clock seconds, by expansions,
+    or by cooperative cancellation, whichever comes first.
+
+    Unset limits are unbounded.  cancel() may be called from any thread.
+    """
+
+    seconds: Optional[float] = None
+    expansions: Optional[int] = None
+    _cancelled: threading.Event = field(
+        default_factory=threading.Event, init=False, repr=False
+    )
+    _deadline: Optional[float] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.seconds is not None and self.seconds <= 0:
+            raise ValueError(f"non-positive seconds: {self.seconds}")
+        if self.expansions is not None and self.expansions <= 0:
+            raise ValueError(f"non-positive expansions: {self.expansions}")
+
+    def start(self) -> None:
+        """
+        Starts the clock; searches call this as they begin.
+        """
+        if self.seconds is not None:
+            self._deadline = time.monotonic() + self.seconds
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def is_exhausted(self, expanded: int) -> bool:
+        """
+        Returns True if a search that has expanded this many states must
+        stop now.
+        """
+        if self._cancelled.is_set():
+            return True
+        if self.expansions is not None and expanded >= self.expansions:
+            return True
+        if self._deadline is None:
+            return False
+        return time.monotonic() >= self._deadline
+
+
+async def solve_cancellable(solve: Callable[[Budget], T], budget: Budget) -> T:
+    """
+    Runs solve(budget) in a worker thread so an asyncio task can await it.
+
+    Cancelling the awaiting task cancels budget, so the search stops at its
+    next expansion instead of running on unobserved.
+    """
+    try:
+        return await asyncio.to_thread(solve, budget)
+    except asyncio.CancelledError:
+        budget.cancel()
+        raise
@@ -0,0 +1,123 @@
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from gridworld.bucket_queue import costs_to
+from gridworld.costs import Costs
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.labels import (
+    Label,
+    cell_of,
+    check_costs,
+    insert_label,
+)
+from gridworld.solver_stats import SolverStats
+from gridworld.wellness_solver import TravelingAgent
+
+
+def lower_bounds(
+    grid: Grid, costs: Costs, goal: Tuple[int, int]
+) -> Tuple[List[int], List[int]]:
+    """
+    Returns per-cell lower bounds of (health, moves) spent reaching goal.
+
+    Each bound minimizes one resource on its own, ignoring the other, so
+    together they never overestimate what any real path would spend.
+    """
+    adjacency = grid.compile(costs)
+    g = cell_of(goal, grid.dimensions)
+    return (
+        costs_to(g, adjacency.health_costs, adjacency.steps),
+        costs_to(g, adjacency.move_costs, adjacency.steps),
+    )
+
+
+@dataclass
+class AStarSolver:
+    """
+    A* search over (health, moves) labels toward the game's goal.
+
+    A label's priority is an upper bound on the wellness it could still
+    reach: its vitals less the per-cell lower bounds from lower_bounds().
+    Labels that cannot reach the goal alive are pruned, and the first label
+    popped at the goal is optimal.
+    """
+
+    game: Game
+    expanded: int = field(default=0, init=False)
+    stats: SolverStats = field(default_factory=SolverStats, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.game, Game):
+            raise ValueError(f"invalid game: {self.game!r}")
+        check_costs(self.game.costs)
+
+    def solve(self) -> Optional[TravelingAgent]:
+        stats = self.stats = SolverStats()
+        t0 = time.perf_counter()
+        game = self.game
+        dims = game.grid.dimensions
+        agent = game.agent
+        self.expanded = 0
+        if agent.is_dead():
+            return None
+        steps = game.grid.compile(game.costs).steps
+        health_need, moves_need = lower_bounds(
+            game.grid, game.costs, game.goal_position
+        )
+        goal = cell_of(game.goal_position, dims)
+        fronts: List[List[Label]] = [[] for _ in range(len(game.grid))]
+        queue: List[Tuple[int, int, int, Label]] = []
+        seq = 0
+        live = 0
+
+        def push(label: Label) -> None:
+            nonlocal seq, live
+            spare_health = label.health - health_need[label.cell]
+            spare_moves = label.moves - moves_need[label.cell]
+            if spare_health <= 0 or spare_moves <= 0:
+                return
+            front = fronts[label.cell]
+            before = len(front)
+            if not insert_label(front, label):
+                stats.pruned += 1
+                return
+            stats.pruned += before + 1 - len(front)
+            live += len(front) - before
+            seq += 1
+            bound = spare_health * spare_moves
+            heapq.heappush(queue, (-bound, label.steps, seq, label))
+
+        push(Label(cell_of(agent.position, dims), agent.health, agent.moves))
+        stats.peak_queue = len(queue)
+        stats.peak_live = live
+        t1 = time.perf_counter()
+        stats.setup_time = t1 - t0
+        while queue:
+            label = heapq.heappop(queue)[3]
+            stats.popped += 1
+            if label.dead:
+                continue
+            if label.cell == goal:
+                t2 = time.perf_counter()
+                stats.search_time = t2 - t1
+                got = TravelingAgent.from_label(label, agent, dims)
+                stats.reconstruct_time = time.perf_counter() - t2
+                return got
+            self.expanded += 1
+            for cell, health_cost, move_cost in steps[label.cell]:
+                push(
+                    Label(
+                        cell,
+                        label.health + health_cost,
+                        label.moves + move_cost,
+                        parent=label,
+                        steps=label.steps + 1,
+                    )
+                )
+            stats.peak_queue = max(stats.peak_queue, len(queue))
+            stats.peak_live = max(stats.peak_live, live)
+        stats.search_time = time.perf_counter() - t1
+        return None
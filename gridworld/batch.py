@@ -0,0 +1,151 @@
+import glob
+import json
+import os.path
+import time
+from dataclasses import asdict, dataclass
+from functools import partial
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from gridworld.feasibility import find_infeasibility
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.solve_cache import SolveCache, solve_key
+from gridworld.solvers import (
+    SolverEngine,
+    SolverOptions,
+    answer_options,
+    make_solver,
+)
+from gridworld.wellness_solver import TravelingAgent
+
+DEFAULT_CHUNKSIZE = 1
+
+
+@dataclass
+class BatchRecord:
+    grid_path: str
+    solvable: bool
+    health: Optional[int]
+    moves: Optional[int]
+    path: Optional[List[Tuple[int, int]]]
+    elapsed: float
+    # The resource that proved the grid unsolvable without a search.
+    infeasible: Optional[str] = None
+
+    def to_json_str(self) -> str:
+        return json.dumps(asdict(self))
+
+
+def grid_paths(pattern: str) -> List[str]:
+    """
+    Returns sorted grid file paths for a directory (its *.out files) or a
+    glob pattern.
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.out")
+    return sorted(glob.glob(pattern))
+
+
+def _read_game(grid_path: str) -> Game:
+    with open(grid_path, "r") as f:
+        return Game.from_grid(Grid.from_str(f.read()))
+
+
+def _record(
+    grid_path: str, got: Optional[TravelingAgent], elapsed: float
+) -> BatchRecord:
+    if got is None:
+        return BatchRecord(grid_path, False, None, None, None, elapsed)
+    return BatchRecord(
+        grid_path,
+        True,
+        got.agent.health,
+        got.agent.moves,
+        got.path,
+        elapsed,
+    )
+
+
+def _solve_game(
+    grid_path: str,
+    engine: SolverEngine = SolverEngine.PARETO,
+    options: Optional[SolverOptions] = None,
+) -> Tuple[BatchRecord, Optional[TravelingAgent]]:
+    # Also returns the solver's answer, for the caller to cache.
+    game = _read_game(grid_path)
+    t0 = time.perf_counter()
+    infeasible = find_infeasibility(game)
+    if infeasible is not None:
+        elapsed = time.perf_counter() - t0
+        return (
+            BatchRecord(
+                grid_path,
+                False,
+                None,
+                None,
+                None,
+                elapsed,
+                infeasible=infeasible.resource,
+            ),
+            None,
+        )
+    if options is None:
+        options = SolverOptions()
+    got = make_solver(engine, game, **vars(options)).solve()
+    return _record(grid_path, got, time.perf_counter() - t0), got
+
+
+def solve_grid_file(
+    grid_path: str,
+    engine: SolverEngine = SolverEngine.PARETO,
+    options: Optional[SolverOptions] = None,
+) -> BatchRecord:
+    return _solve_game(grid_path, engine, options)[0]
+
+
+def solve_batch(
+    grid_paths: Iterable[str],
+    engine: SolverEngine = SolverEngine.PARETO,
+    workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    options: Optional[SolverOptions] = None,
+    cache: Optional[SolveCache] = None,
+) -> Iterator[BatchRecord]:
+    """
+    Solves grid files across a pool of worker processes.
+
+    Yields one record per grid as each completes, so not in input order.
+    workers defaults to the number of CPUs, and options to the engine's
+    defaults.  With a cache, grids solved before are answered from it
+    first, and only the rest go to the pool; their answers are cached.
+    """
+    if workers is not None and workers <= 0:
+        raise ValueError(f"non-positive workers: {workers}")
+    if chunksize <= 0:
+        raise ValueError(f"non-positive chunksize: {chunksize}")
+    if options is None:
+        options = SolverOptions()
+    keys = {}
+    if cache is not None:
+        settings = answer_options(engine, options)
+        misses = []
+        for path in grid_paths:
+            t0 = time.perf_counter()
+            key = solve_key(_read_game(path), engine, settings)
+            data = cache.get(key)
+            if data is None:
+                keys[path] = key
+                misses.append(path)
+                continue
+            got = (
+                None if data == "null" else TravelingAgent.from_json_str(data)
+            )
+            yield _record(path, got, time.perf_counter() - t0)
+        grid_paths = misses
+    solve = partial(_solve_game, engine=engine, options=options)
+    with Pool(processes=workers) as pool:
+        for record, got in pool.imap_unordered(solve, grid_paths, chunksize):
+            if cache is not None and record.infeasible is None:
+                cache.put(keys[record.grid_path], got)
+            yield record
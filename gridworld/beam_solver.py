@@ -0,0 +1,198 @@
+import json
+import time
+from array import array
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from gridworld.agent import Agent
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.labels import cell_of, check_costs, position_of
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.solver_stats import SolverStats
+from gridworld.state_store import StateStore
+from gridworld.wellness_solver import TravelingAgent
+
+DEFAULT_BEAM_WIDTH = 64
+
+# Ranks a beam state, given as an Agent, on its way to a goal position.
+Score = Callable[[Agent, Tuple[int, int]], float]
+
+
+def utility_score(agent: Agent, goal: Tuple[int, int]) -> float:
+    """
+    Returns TravelingAgent.utility_score for agent, the default beam score.
+    """
+    return TravelingAgent(agent=agent, path=[agent.position]).utility_score(
+        goal
+    )
+
+
+@dataclass
+class BeamSolver:
+    """
+    Beam search: keeps only the width best states at each depth, ranked by
+    score.
+
+    Each state is also checked against the best state seen on its cell so
+    far and dropped if that one dominates it.  A state on the goal ends
+    its path rather than taking a place in the beam.  Since an optimal path
+    never revisits a cell, the search stops after len(grid) - 1 steps at
+    most.
+
+    Memory is bounded by width and the grid: the beam itself, one record
+    per cell, and the parent chains of the states in the beam, which
+    mostly share prefixes.  Answers may fall short of optimal; see
+    gap_report().
+    """
+
+    game: Game
+    width: int = DEFAULT_BEAM_WIDTH
+    score: Score = utility_score
+    expanded: int = field(default=0, init=False)
+    stats: SolverStats = field(default_factory=SolverStats, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.game, Game):
+            raise ValueError(f"invalid game: {self.game!r}")
+        if self.width <= 0:
+            raise ValueError(f"non-positive width: {self.width}")
+        check_costs(self.game.costs)
+
+    def solve(self) -> Optional[TravelingAgent]:
+        stats = self.stats = SolverStats()
+        t0 = time.perf_counter()
+        game = self.game
+        agent = game.agent
+        dims = game.grid.dimensions
+        self.expanded = 0
+        if agent.is_dead():
+            return None
+        steps = game.grid.compile(game.costs).steps
+        goal = cell_of(game.goal_position, dims)
+        store = StateStore()
+        root = store.add(
+            cell_of(agent.position, dims),
+            agent.health,
+            agent.moves,
+            store.NO_PARENT,
+        )
+        # Vitals of the best state seen on each cell.
+        seen_health = array("i", [0]) * len(game.grid)
+        seen_moves = array("i", [0]) * len(game.grid)
+        seen_health[store.cell[root]] = agent.health
+        seen_moves[store.cell[root]] = agent.moves
+        best = root if store.cell[root] == goal else StateStore.NO_PARENT
+        if best != StateStore.NO_PARENT:
+            store.hold(best)
+        beam = [root]
+        t1 = time.perf_counter()
+        stats.setup_time = t1 - t0
+        for _depth in range(len(game.grid) - 1):
+            if not beam:
+                break
+            candidates = []
+            for s in beam:
+                self.expanded += 1
+                stats.popped += 1
+                for cell, health_cost, move_cost in steps[store.cell[s]]:
+                    health = store.health[s] + health_cost
+                    moves = store.moves[s] + move_cost
+                    if health <= 0 or moves <= 0:
+                        continue
+                    if (
+                        seen_health[cell] >= health
+                        and seen_moves[cell] >= moves
+                    ):
+                        stats.pruned += 1
+                        continue
+                    if cell == goal:
+                        if best == StateStore.NO_PARENT or health * moves > (
+                            store.health[best] * store.moves[best]
+                        ):
+                            if best != StateStore.NO_PARENT:
+                                store.release(best)
+                            best = store.add(cell, health, moves, s)
+                            seen_health[cell] = health
+                            seen_moves[cell] = moves
+                        continue
+                    position = position_of(cell, dims)
+                    rank = self.score(
+                        Agent(
+                            position=position,
+                            health=health,
+                            max_health=agent.max_health,
+                            moves=moves,
+                            max_moves=agent.max_moves,
+                        ),
+                        game.goal_position,
+                    )
+                    candidates.append((rank, s, cell, health, moves))
+            candidates.sort(key=lambda x: x[0], reverse=True)
+            next_beam: List[int] = []
+            for _rank, parent, cell, health, moves in candidates:
+                if len(next_beam) >= self.width:
+                    break
+                if seen_health[cell] >= health and seen_moves[cell] >= moves:
+                    stats.pruned += 1
+                    continue
+                if health * moves > seen_health[cell] * seen_moves[cell]:
+                    seen_health[cell] = health
+                    seen_moves[cell] = moves
+                next_beam.append(store.add(cell, health, moves, parent))
+            stats.peak_queue = max(stats.peak_queue, len(candidates))
+            for s in beam:
+                store.release(s)
+            beam = next_beam
+        t2 = time.perf_counter()
+        stats.search_time = t2 - t1
+        stats.peak_live = store.peak_live
+        if best == StateStore.NO_PARENT:
+            return None
+        path = [position_of(c, dims) for c in store.cells(best)]
+        got = TravelingAgent(
+            agent=Agent(
+                position=path[-1],
+                health=store.health[best],
+                max_health=agent.max_health,
+                moves=store.moves[best],
+                max_moves=agent.max_moves,
+            ),
+            path=path,
+        )
+        stats.reconstruct_time = time.perf_counter() - t2
+        return got
+
+
+@dataclass
+class BeamGap:
+    grid_path: str
+    width: int
+    exact_wellness: Optional[float]
+    beam_wellness: Optional[float]
+    # Fraction of the exact wellness the beam answer falls short by.
+    gap: float
+
+    def to_json_str(self) -> str:
+        return json.dumps(asdict(self))
+
+
+def gap_report(
+    grid_paths: Iterable[str], width: int = DEFAULT_BEAM_WIDTH
+) -> Iterator[BeamGap]:
+    """
+    Yields how far beam answers of the given width fall short of exact
+    ParetoSolver answers, one grid file at a time.
+    """
+    for grid_path in grid_paths:
+        with open(grid_path, "r") as f:
+            grid = Grid.from_str(f.read())
+        exact = ParetoSolver(Game.from_grid(grid)).solve()
+        beam = BeamSolver(Game.from_grid(grid), width=width).solve()
+        exact_w = None if exact is None else exact.wellness
+        beam_w = None if beam is None else beam.wellness
+        if not exact_w:
+            gap = 0.0
+        else:
+            gap = (exact_w - (beam_w or 0.0)) / exact_w
+        yield BeamGap(grid_path, width, exact_w, beam_w, gap)
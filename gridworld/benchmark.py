@@ -0,0 +1,236 @@
+import gc
+import json
+import os.path
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from random import Random
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from gridworld.agent import DEFAULT_HEALTH, DEFAULT_MOVES, Agent
+from gridworld.batch import grid_paths
+from gridworld.costs import Costs
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.solvers import SOLVERS, make_solver, solver_entry
+
+# Sides of the seeded random square grids benchmarked.
+BENCHMARK_SIDES = (10, 25, 50, 100, 200)
+BENCHMARK_SEED = 0
+
+# Random grids get the default agent's health and moves, scaled by their
+# rows plus columns over this, so that bigger grids stay solvable.
+BUDGET_SPAN = 40
+
+# A run regresses if it takes this many times its baseline's time, and at
+# least NOISE_SECONDS more, or this many times its peak memory, and at
+# least NOISE_BYTES more.
+TIME_TOLERANCE = 1.5
+NOISE_SECONDS = 0.05
+MEMORY_TOLERANCE = 1.25
+NOISE_BYTES = 1 << 16
+
+
+def benchmark_games(
+    grids_dir: str,
+    sides: Iterable[int] = BENCHMARK_SIDES,
+    seed: int = BENCHMARK_SEED,
+) -> List[Tuple[str, Game]]:
+    """
+    Returns the named games benchmarked: the grid files in grids_dir with
+    the default agent, then a random grid of each side.
+    """
+    games = []
+    for path in grid_paths(grids_dir):
+        with open(path) as f:
+            grid = Grid.from_str(f.read())
+        games.append((os.path.basename(path), Game.from_grid(grid)))
+    for side in sides:
+        if side <= 0:
+            raise ValueError(f"non-positive side: {side}")
+        grid = Grid.random((side, side), Random(seed))
+        scale = max(2 * side / BUDGET_SPAN, 1)
+        health = int(DEFAULT_HEALTH * scale)
+        moves = int(DEFAULT_MOVES * scale)
+        game = Game(
+            grid=grid,
+            agent=Agent(
+                (0, 0),
+                health=health,
+                max_health=health,
+                moves=moves,
+                max_moves=moves,
+            ),
+            start_position=(0, 0),
+            goal_position=(side - 1, side - 1),
+            costs=Costs(),
+        )
+        games.append((f"random-{side}x{side}:{seed}", game))
+    return games
+
+
+@dataclass
+class BenchmarkRecord:
+    engine: str
+    grid: str
+    cells: int
+    solvable: bool
+    wellness: Optional[float]
+    # wellness over the best any engine found on the grid, 0.0 if this
+    # engine found no path, or None if no engine did.
+    quality: Optional[float]
+    expanded: int
+    elapsed: float
+    # Peak bytes traced while solving, in this process.
+    peak_memory: int
+
+    def to_json_str(self) -> str:
+        return json.dumps(asdict(self))
+
+
+def _solve(engine: str, game: Game, seed: int):
+    sv = make_solver(engine, game, seed=seed)
+    return sv, sv.solve()
+
+
+def run_benchmark(
+    games: Iterable[Tuple[str, Game]],
+    engines: Optional[Iterable[str]] = None,
+    seed: int = BENCHMARK_SEED,
+) -> Iterator[BenchmarkRecord]:
+    """
+    Solves every game with every engine, all registered ones by default.
+
+    Engines skip grids bigger than their benchmark_cells.  Each solve
+    runs twice: once timed, then once with tracemalloc for its peak
+    memory, which slows it down.  Neither counts compiling the grid,
+    which every engine shares.  Yields a game's records once every
+    engine has solved it, since quality compares them.
+    """
+    names = sorted(SOLVERS) if engines is None else list(engines)
+    entries = [solver_entry(name) for name in names]
+    for grid_name, game in games:
+        cells = len(game.grid)
+        # Compile the grid before any timer starts, so the first engine
+        # does not pay for what the rest then find cached.
+        game.grid.compile(game.costs)
+        records = []
+        for entry in entries:
+            limit = entry.benchmark_cells
+            if limit is not None and cells > limit:
+                continue
+            gc.collect()
+            t0 = time.perf_counter()
+            sv, got = _solve(entry.name, game, seed)
+            elapsed = time.perf_counter() - t0
+            gc.collect()
+            tracemalloc.start()
+            try:
+                _solve(entry.name, game, seed)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            records.append(
+                BenchmarkRecord(
+                    engine=entry.name,
+                    grid=grid_name,
+                    cells=cells,
+                    solvable=got is not None,
+                    wellness=None if got is None else got.wellness,
+                    quality=None,
+                    expanded=sv.expanded,
+                    elapsed=elapsed,
+                    peak_memory=peak,
+                )
+            )
+        best = max(
+            (r.wellness for r in records if r.wellness is not None),
+            default=None,
+        )
+        for record in records:
+            if best is not None:
+                record.quality = (record.wellness or 0.0) / best
+            yield record
+
+
+def save_benchmark(path: str, records: Iterable[BenchmarkRecord]) -> None:
+    with open(path, "w") as f:
+        json.dump([asdict(r) for r in records], f, indent=1)
+        f.write("\n")
+
+
+def load_benchmark(path: str) -> List[BenchmarkRecord]:
+    with open(path) as f:
+        return [BenchmarkRecord(**r) for r in json.load(f)]
+
+
+@dataclass
+class Regression:
+    engine: str
+    grid: str
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        return (
+            f"regression: {self.engine} on {self.grid}: {self.metric}"
+            f" {self.baseline} -> {self.current}"
+        )
+
+
+def compare_benchmarks(
+    records: Iterable[BenchmarkRecord],
+    baseline: Iterable[BenchmarkRecord],
+    time_tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+) -> List[Regression]:
+    """
+    Returns the regressions of records against the baseline runs of the
+    same engines on the same grids.
+
+    A run regresses if it finds a worse path, or none where the baseline
+    found one, or if it is slower or bigger past the tolerances.  Runs
+    missing from either side are not compared.
+    """
+    if time_tolerance < 1:
+        raise ValueError(f"time_tolerance below 1: {time_tolerance}")
+    if memory_tolerance < 1:
+        raise ValueError(f"memory_tolerance below 1: {memory_tolerance}")
+    before: Dict[Tuple[str, str], BenchmarkRecord] = {
+        (r.engine, r.grid): r for r in baseline
+    }
+    regressions = []
+    for r in records:
+        b = before.get((r.engine, r.grid))
+        if b is None:
+            continue
+        if b.wellness is not None and (
+            r.wellness is None or r.wellness < b.wellness
+        ):
+            regressions.append(
+                Regression(
+                    r.engine, r.grid, "wellness", b.wellness, r.wellness or 0
+                )
+            )
+        if (
+            r.elapsed > b.elapsed * time_tolerance
+            and r.elapsed - b.elapsed > NOISE_SECONDS
+        ):
+            regressions.append(
+                Regression(r.engine, r.grid, "elapsed", b.elapsed, r.elapsed)
+            )
+        if (
+            r.peak_memory > b.peak_memory * memory_tolerance
+            and r.peak_memory - b.peak_memory > NOISE_BYTES
+        ):
+            regressions.append(
+                Regression(
+                    r.engine,
+                    r.grid,
+                    "peak_memory",
+                    b.peak_memory,
+                    r.peak_memory,
+                )
+            )
+    return regressions
@@ -0,0 +1,228 @@
+import heapq
+import math
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from gridworld.agent import Agent
+from gridworld.astar_solver import lower_bounds
+from gridworld.game import Game
+from gridworld.labels import (
+    Label,
+    cell_of,
+    check_costs,
+    insert_label,
+    position_of,
+)
+from gridworld.solver_stats import SolverStats
+from gridworld.wellness_solver import TravelingAgent
+
+
+@dataclass
+class BidirectionalSolver:
+    """
+    Meet-in-the-middle label search between the agent and the goal.
+
+    The forward half holds agent vitals.  The backward half holds the cost
+    deltas of walking from a cell to the goal, excluding the cell itself,
+    since costs are paid on entering: stepping backward from v to u pays
+    for v.  Both halves pop labels in order of weighted consumption
+    (health spent * moves + moves spent * health), always advancing the
+    half that has spent less, and join whenever a new label lands next to
+    a label of the other half.
+
+    A winning path spending g in total is joined once the two halves have
+    popped past thresholds adding up to more than g.  The best join so far
+    caps the g of any better path, which lets the search stop early; each
+    half is also pruned, as in AStarSolver, by lower bounds on what the
+    other half must still spend.
+    """
+
+    game: Game
+    expanded: int = field(default=0, init=False)
+    stats: SolverStats = field(default_factory=SolverStats, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.game, Game):
+            raise ValueError(f"invalid game: {self.game!r}")
+        check_costs(self.game.costs)
+
+    def solve(self) -> Optional[TravelingAgent]:
+        stats = self.stats = SolverStats()
+        t0 = time.perf_counter()
+        game = self.game
+        dims = game.grid.dimensions
+        agent = game.agent
+        self.expanded = 0
+        if agent.is_dead():
+            return None
+        h0, m0 = agent.health, agent.moves
+        adjacency = game.grid.compile(game.costs)
+        steps = adjacency.steps
+        health_costs = adjacency.health_costs
+        move_costs = adjacency.move_costs
+        start = cell_of(agent.position, dims)
+        goal = cell_of(game.goal_position, dims)
+        # Least spent from a cell on to the goal, and from start into a cell
+        # (the reverse of reaching start from that cell).
+        goal_h, goal_m = lower_bounds(
+            game.grid, game.costs, game.goal_position
+        )
+        back_h, back_m = lower_bounds(game.grid, game.costs, agent.position)
+        start_h = [
+            need + health_costs[start] - health_costs[c]
+            for c, need in enumerate(back_h)
+        ]
+        start_m = [
+            need + move_costs[start] - move_costs[c]
+            for c, need in enumerate(back_m)
+        ]
+
+        forward: List[List[Label]] = [[] for _ in range(len(game.grid))]
+        backward: List[List[Label]] = [[] for _ in range(len(game.grid))]
+        f_queue: List[Tuple[int, int, Label]] = []
+        b_queue: List[Tuple[int, int, Label]] = []
+        best: Optional[Tuple[int, int, Label, Optional[Label]]] = None
+        seq = 0
+        live = 0
+
+        def insert(front: List[Label], label: Label) -> bool:
+            nonlocal live
+            before = len(front)
+            if not insert_label(front, label):
+                stats.pruned += 1
+                return False
+            stats.pruned += before + 1 - len(front)
+            live += len(front) - before
+            return True
+
+        def consider(
+            wellness: int, steps: int, f: Label, b: Optional[Label] = None
+        ) -> None:
+            nonlocal best
+            if best is None or (wellness, -steps) > (best[0], -best[1]):
+                best = (wellness, steps, f, b)
+
+        def push_forward(f: Label) -> None:
+            nonlocal seq
+            spare_h = f.health - goal_h[f.cell]
+            spare_m = f.moves - goal_m[f.cell]
+            if spare_h <= 0 or spare_m <= 0:
+                return
+            if best is not None and spare_h * spare_m < best[0]:
+                return
+            if not insert(forward[f.cell], f):
+                return
+            if f.cell == goal:
+                consider(f.health * f.moves, f.steps, f)
+                return
+            for v, health_cost, move_cost in steps[f.cell]:
+                for b in backward[v]:
+                    health = f.health + health_cost + b.health
+                    moves = f.moves + move_cost + b.moves
+                    if health > 0 and moves > 0:
+                        consider(health * moves, f.steps + 1 + b.steps, f, b)
+            seq += 1
+            spent = (h0 - f.health) * m0 + (m0 - f.moves) * h0
+            heapq.heappush(f_queue, (spent, seq, f))
+
+        def push_backward(b: Label) -> None:
+            nonlocal seq
+            spare_h = h0 - start_h[b.cell] + b.health
+            spare_m = m0 - start_m[b.cell] + b.moves
+            if spare_h <= 0 or spare_m <= 0:
+                return
+            if best is not None and spare_h * spare_m < best[0]:
+                return
+            if not insert(backward[b.cell], b):
+                return
+            hc, mc = health_costs[b.cell], move_costs[b.cell]
+            for u, _, _ in steps[b.cell]:
+                for f in forward[u]:
+                    health = f.health + hc + b.health
+                    moves = f.moves + mc + b.moves
+                    if health > 0 and moves > 0:
+                        consider(health * moves, f.steps + 1 + b.steps, f, b)
+            seq += 1
+            spent = -b.health * m0 - b.moves * h0
+            heapq.heappush(b_queue, (spent, seq, b))
+
+        push_forward(Label(start, h0, m0))
+        push_backward(Label(goal, 0, 0))
+        budget = h0 * m0
+        stats.peak_queue = len(f_queue) + len(b_queue)
+        stats.peak_live = live
+        t1 = time.perf_counter()
+        stats.setup_time = t1 - t0
+        while f_queue and b_queue:
+            f_spent, b_spent = f_queue[0][0], b_queue[0][0]
+            if best is not None:
+                # A better path spending fractions x, y of health and moves
+                # has (1 - x) * (1 - y) > best / budget, which bounds x + y
+                # below 2 - 2 * sqrt(best / budget).
+                ratio = best[0] / budget
+                cap = budget * (2.0 - 2.0 * math.sqrt(ratio))
+                if f_spent + b_spent >= cap + 1.0:
+                    break
+            if f_spent <= b_spent:
+                label = heapq.heappop(f_queue)[2]
+                stats.popped += 1
+                if label.dead:
+                    continue
+                self.expanded += 1
+                for cell, health_cost, move_cost in steps[label.cell]:
+                    push_forward(
+                        Label(
+                            cell,
+                            label.health + health_cost,
+                            label.moves + move_cost,
+                            parent=label,
+                            steps=label.steps + 1,
+                        )
+                    )
+            else:
+                label = heapq.heappop(b_queue)[2]
+                stats.popped += 1
+                if label.dead:
+                    continue
+                self.expanded += 1
+                hc, mc = health_costs[label.cell], move_costs[label.cell]
+                for cell, _, _ in steps[label.cell]:
+                    push_backward(
+                        Label(
+                            cell,
+                            label.health + hc,
+                            label.moves + mc,
+                            parent=label,
+                            steps=label.steps + 1,
+                        )
+                    )
+            stats.peak_queue = max(
+                stats.peak_queue, len(f_queue) + len(b_queue)
+            )
+            stats.peak_live = max(stats.peak_live, live)
+        t2 = time.perf_counter()
+        stats.search_time = t2 - t1
+        if best is None:
+            return None
+        _w, _s, f, b = best
+        cells = f.cells()
+        health, moves = f.health, f.moves
+        if b is not None:
+            back_cells = b.cells()
+            back_cells.reverse()
+            cells.extend(back_cells)
+            health += health_costs[b.cell] + b.health
+            moves += move_costs[b.cell] + b.moves
+        path = [position_of(c, dims) for c in cells]
+        stats.reconstruct_time = time.perf_counter() - t2
+        return TravelingAgent(
+            agent=Agent(
+                position=path[-1],
+                health=health,
+                max_health=agent.max_health,
+                moves=moves,
+                max_moves=agent.max_moves,
+            ),
+            path=path,
+        )
@@ -0,0 +1,197 @@
+import heapq
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import (
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from gridworld.adjacency import Edge
+from gridworld.game import Game
+from gridworld.labels import cell_of
+
+T = TypeVar("T")
+
+
+class BucketQueue(Generic[T]):
+    """
+    BucketQueue is a Dial bucket queue: a min-priority queue for integer
+    priorities that never fall below the last one popped, nor rise above
+    it by more than max_step.
+
+    Items wait in a ring of max_step + 1 first-in first-out buckets, one
+    per priority, so push() and pop() take constant time, plus a scan over
+    empty buckets that never passes a priority twice.  Items of equal
+    priority come out in the order they went in, as from a heap keyed on
+    (priority, sequence number).
+
+    Searches that take every item in turn should iterate drain(), which
+    costs less per item than pop().
+    """
+
+    def __init__(self, max_step: int):
+        if max_step < 0:
+            raise ValueError(f"negative max_step: {max_step}")
+        self.max_step = max_step
+        # Buckets are made as first used: wide rings mostly stay empty.
+        self._buckets: List[Optional[List[T]]] = [None] * (max_step + 1)
+        # The priority last popped, below which nothing may be pushed, and
+        # how many items of its bucket are gone.
+        self._floor = 0
+        self._head = 0
+        self._len = 0
+
+    def push(self, priority: int, item: T) -> None:
+        if not self._floor <= priority <= self._floor + self.max_step:
+            raise ValueError(f"priority out of range: {priority}")
+        i = priority % len(self._buckets)
+        bucket = self._buckets[i]
+        if bucket is None:
+            bucket = self._buckets[i] = []
+        bucket.append(item)
+        self._len += 1
+
+    def _advance(self) -> List[T]:
+        # Moves the floor up to the least priority with items left, and
+        # returns its bucket.  Emptied buckets are cleared on the way.
+        buckets = self._buckets
+        size = len(buckets)
+        while True:
+            bucket = buckets[self._floor % size]
+            if bucket is not None:
+                if self._head < len(bucket):
+                    return bucket
+                bucket.clear()
+            self._floor += 1
+            self._head = 0
+
+    def pop(self) -> Tuple[int, T]:
+        """
+        Removes and returns the (priority, item) of least priority.
+        """
+        if not self._len:
+            raise IndexError("pop from an empty queue")
+        bucket = self._advance()
+        item = bucket[self._head]
+        self._head += 1
+        self._len -= 1
+        return self._floor, item
+
+    def drain(self) -> Iterator[Tuple[int, T]]:
+        """
+        Yields and removes (priority, item) pairs, least priority first,
+        until the queue is empty.  Items may be pushed meanwhile.
+        """
+        while self._len:
+            bucket = self._advance()
+            floor = self._floor
+            # Items pushed at floor meanwhile lengthen the bucket in hand.
+            while self._head < len(bucket):
+                item = bucket[self._head]
+                self._head += 1
+                self._len -= 1
+                yield floor, item
+
+    def __len__(self) -> int:
+        return self._len
+
+
+def costs_to(
+    goal: int, step_costs: Sequence[int], steps: Tuple[Tuple[Edge, ...], ...]
+) -> List[int]:
+    """
+    Returns the least total of -step_costs spent from each cell to goal.
+
+    This is Dijkstra outward from goal over a BucketQueue.  Costs are paid
+    on entering a cell, so stepping from u to v adds the cost of v.  Every
+    step cost must be non-positive.
+    """
+    inf = float("inf")
+    dist: List[float] = [inf] * len(step_costs)
+    dist[goal] = 0
+    queue: BucketQueue[int] = BucketQueue(max(0, -min(step_costs)))
+    queue.push(0, goal)
+    push = queue.push
+    for d, v in queue.drain():
+        if d > dist[v]:
+            continue
+        nd = d - step_costs[v]
+        for u, _, _ in steps[v]:
+            if nd < dist[u]:
+                dist[u] = nd
+                push(nd, u)
+    return [int(d) for d in dist]
+
+
+def _heap_costs_to(
+    goal: int, step_costs: Sequence[int], steps: Tuple[Tuple[Edge, ...], ...]
+) -> List[int]:
+    # costs_to() over heapq, as queue_benchmark()'s baseline.
+    inf = float("inf")
+    dist: List[float] = [inf] * len(step_costs)
+    dist[goal] = 0
+    queue = [(0, goal)]
+    while queue:
+        d, v = heapq.heappop(queue)
+        if d > dist[v]:
+            continue
+        nd = d - step_costs[v]
+        for u, _, _ in steps[v]:
+            if nd < dist[u]:
+                dist[u] = nd
+                heapq.heappush(queue, (nd, u))
+    return [int(d) for d in dist]
+
+
+@dataclass
+class QueueBenchmark:
+    name: str
+    dimensions: Tuple[int, int]
+    cells: int
+    # Best of the rounds, bounding both resources.
+    heap_time: float
+    bucket_time: float
+    speedup: float
+
+    def to_json_str(self) -> str:
+        return json.dumps(asdict(self))
+
+
+def queue_benchmark(name: str, game: Game, rounds: int = 3) -> QueueBenchmark:
+    """
+    Times costs_to() over health and moves to the game's goal, as used
+    for solver lower bounds, with heapq and with a BucketQueue.
+    """
+    if rounds <= 0:
+        raise ValueError(f"non-positive rounds: {rounds}")
+    dims = game.grid.dimensions
+    adjacency = game.grid.compile(game.costs)
+    goal = cell_of(game.goal_position, dims)
+    timings = []
+    for search in (_heap_costs_to, costs_to):
+        best = float("inf")
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            got = [
+                search(goal, adjacency.health_costs, adjacency.steps),
+                search(goal, adjacency.move_costs, adjacency.steps),
+            ]
+            best = min(best, time.perf_counter() - t0)
+        timings.append((best, got))
+    (heap_time, want), (bucket_time, got) = timings
+    if want != got:
+        raise ValueError(f"bucket queue costs differ: {name}")
+    return QueueBenchmark(
+        name=name,
+        dimensions=dims,
+        cells=len(game.grid),
+        heap_time=heap_time,
+        bucket_time=bucket_time,
+        speedup=heap_time / bucket_time,
+    )
@@ -0,0 +1,164 @@
+import json
+import os
+import sqlite3
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from gridworld.game import Game
+from gridworld.solver_stats import SolverStats
+from gridworld.spill import Table
+from gridworld.state_store import StateStore
+
+CHECKPOINT_VERSION = 1
+
+DEFAULT_CHECKPOINT_SECONDS = 60.0
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    cursor = conn.cursor()
+    cursor.execute(
+        r"""
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY
+          , value TEXT NOT NULL
+        )
+        """
+    )
+    cursor.execute(
+        r"""
+        CREATE TABLE IF NOT EXISTS arrays (
+            name TEXT PRIMARY KEY
+          , data BLOB NOT NULL
+        )
+        """
+    )
+    cursor.execute(
+        r"""
+        CREATE TABLE IF NOT EXISTS frontier (
+            seq INTEGER PRIMARY KEY
+          , data BLOB NOT NULL
+        )
+        """
+    )
+    conn.commit()
+    return conn
+
+
+def save_checkpoint(
+    path: Path | str,
+    game: Game,
+    expanded: int,
+    stats: SolverStats,
+    store: StateStore,
+    best: Table,
+    seen: Table,
+    frontier: Iterable[array],
+) -> None:
+    """
+    Writes the state of a breadth-first solve between two expansions to a
+    sqlite file at path: the game, the StateStore, the per-cell tables,
+    and the queue oldest entry first, in chunks.
+
+    The file is written aside and moved into place, so an interrupted save
+    leaves the previous checkpoint whole.
+    """
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = _connect(tmp_path)
+    try:
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [
+                ("version", str(CHECKPOINT_VERSION)),
+                ("game", game.to_json_str()),
+                ("expanded", str(expanded)),
+                ("stats", stats.to_json_str()),
+            ],
+        )
+        arrays = {name: a.tobytes() for name, a in store.columns().items()}
+        arrays["best"] = bytes(best)
+        arrays["seen"] = bytes(seen)
+        conn.executemany(
+            "INSERT INTO arrays (name, data) VALUES (?, ?)", arrays.items()
+        )
+        conn.executemany(
+            "INSERT INTO frontier (data) VALUES (?)",
+            ((chunk.tobytes(),) for chunk in frontier if chunk),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class Checkpoint:
+    """
+    Checkpoint is a breadth-first solve read back by load_checkpoint().
+
+    The queue stays on disk until frontier() reads it.
+    """
+
+    path: str
+    game: Game
+    expanded: int
+    stats: SolverStats
+    store: StateStore
+    best: array
+    seen: bytearray
+
+    def frontier(self) -> Iterator[array]:
+        """
+        Yields the saved queue in chunks, oldest entry first.
+        """
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            for (data,) in conn.execute(
+                "SELECT data FROM frontier ORDER BY seq"
+            ):
+                chunk = array("i")
+                chunk.frombytes(data)
+                yield chunk
+        finally:
+            conn.close()
+
+
+def load_checkpoint(path: Path | str) -> Checkpoint:
+    if not os.path.exists(path):
+        raise ValueError(f"no such checkpoint: {path}")
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        blobs = dict(conn.execute("SELECT name, data FROM arrays"))
+    except sqlite3.DatabaseError:
+        raise ValueError(f"invalid checkpoint: {path}")
+    finally:
+        conn.close()
+    if meta.get("version") != str(CHECKPOINT_VERSION):
+        raise ValueError(f"invalid checkpoint: {path}")
+    try:
+        columns = {}
+        for name in ("cell", "health", "moves", "parent", "refs", "free"):
+            columns[name] = array("i")
+            columns[name].frombytes(blobs[name])
+        stats = SolverStats(**json.loads(meta["stats"]))
+        best = array("i")
+        best.frombytes(blobs["best"])
+        return Checkpoint(
+            path=str(path),
+            game=Game.from_json_str(meta["game"]),
+            expanded=int(meta["expanded"]),
+            stats=stats,
+            store=StateStore.from_columns(columns, stats.peak_live),
+            best=best,
+            seen=bytearray(blobs["seen"]),
+        )
+    except KeyError as e:
+        # A truncated or hand-edited file, missing an array or meta key.
+        raise ValueError(f"invalid checkpoint: {path}: missing {e}") from e
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"invalid checkpoint: {path}: {e}") from e
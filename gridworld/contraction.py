@@ -0,0 +1,296 @@
+import json
+import time
+from array import array
+from collections import deque
+from dataclasses import asdict, dataclass
+from random import Random
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from gridworld.adjacency import Edge
+from gridworld.costs import Costs
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.labels import cell_of, neighbor_table
+from gridworld.terrain import Terrain
+
+DEFAULT_MAX_BOUNDARY = 64
+
+NO_COMPONENT = -1
+
+
+def zero_move_terrains(costs: Costs) -> FrozenSet[Terrain]:
+    """
+    Returns the terrains costing no moves to enter, speeders by default.
+    """
+    return frozenset(t for t in Terrain if costs.move_cost_of(t) == 0)
+
+
+def _direct_distances(
+    source: int,
+    component: array,
+    hoods: Tuple[Tuple[int, ...], ...],
+    is_boundary: bytearray,
+) -> Dict[int, int]:
+    # Breadth-first step counts from source to the boundary cells of its
+    # component that some shortest walk reaches through no other boundary
+    # cell.  Walks through one are covered by the steps out of that cell.
+    comp = component[source]
+    dist = {source: 0}
+    # Source, and inner cells some such walk reaches.
+    open_cells = {source}
+    result = {}
+    frontier = [source]
+    while frontier:
+        layer: List[int] = []
+        reached = set()
+        for u in frontier:
+            for v in hoods[u]:
+                if component[v] != comp:
+                    continue
+                if v not in dist:
+                    dist[v] = dist[u] + 1
+                    layer.append(v)
+                if dist[v] == dist[u] + 1 and u in open_cells:
+                    reached.add(v)
+        for v in reached:
+            if is_boundary[v]:
+                result[v] = dist[v]
+            else:
+                open_cells.add(v)
+        frontier = layer
+    return result
+
+
+class ContractedGraph:
+    """
+    ContractedGraph is a search graph over the cells of a grid in which
+    components of contracted terrain are crossed in single steps.
+
+    Inside a component every cell costs the same, so the cheapest way
+    across it in both health and moves is the fewest steps.  Only the
+    boundary cells of a component, those next to other terrain or kept on
+    request, remain nodes.  Each boundary cell steps straight to the other
+    boundary cells of its component for the cost of the shortest walk
+    between them, unless that walk passes another boundary cell.  Those
+    steps are found by a breadth-first walk the first time a search asks
+    for them, so components a search never reaches cost only their flood
+    fill.  Components with more boundary cells than max_boundary or than
+    inner cells are left as they are: their many steps would cost the
+    search more than the cells saved.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        costs: Costs,
+        keep: Iterable[int] = (),
+        terrains: Optional[Iterable[Terrain]] = None,
+        max_boundary: int = DEFAULT_MAX_BOUNDARY,
+    ):
+        if max_boundary <= 0:
+            raise ValueError(f"non-positive max_boundary: {max_boundary}")
+        chosen = (
+            zero_move_terrains(costs)
+            if terrains is None
+            else frozenset(terrains)
+        )
+        self.dimensions = grid.dimensions
+        adjacency = grid.compile(costs)
+        self.health_costs = adjacency.health_costs
+        self.move_costs = adjacency.move_costs
+        self._hoods = hoods = neighbor_table(grid.dimensions)
+        cells = grid.cells
+        kept = set(keep)
+        # The contracted component of each cell, or NO_COMPONENT.
+        self.component = component = array("i", [NO_COMPONENT]) * len(grid)
+        self._boundaries: List[List[int]] = []
+        self._is_boundary = bytearray(len(grid))
+        seen = bytearray(len(grid))
+        contracted = 0
+        for seed in range(len(grid)):
+            if cells[seed] not in chosen or seen[seed]:
+                continue
+            comp = len(self._boundaries)
+            members = [seed]
+            component[seed] = comp
+            seen[seed] = 1
+            for u in members:
+                for v in hoods[u]:
+                    if cells[v] == cells[seed] and not seen[v]:
+                        component[v] = comp
+                        seen[v] = 1
+                        members.append(v)
+            boundary = [
+                u
+                for u in members
+                if u in kept or any(component[v] != comp for v in hoods[u])
+            ]
+            # Contracting pays for itself only where most of a component
+            # is inner cells, and steps across it stay few.
+            inner = len(members) - len(boundary)
+            if len(boundary) > max_boundary or inner < len(boundary):
+                for u in members:
+                    component[u] = NO_COMPONENT
+                self._boundaries.append([])
+                continue
+            self._boundaries.append(boundary)
+            for u in boundary:
+                self._is_boundary[u] = 1
+            contracted += len(members) - len(boundary)
+        self.nodes = len(grid) - contracted
+        self._steps: Dict[int, Tuple[Edge, ...]] = {}
+
+    @property
+    def cells(self) -> int:
+        return self.dimensions[0] * self.dimensions[1]
+
+    @property
+    def reduction(self) -> float:
+        """
+        Fraction of the grid's cells contracted away.
+        """
+        return 1 - self.nodes / self.cells
+
+    def is_node(self, u: int) -> bool:
+        comp = self.component[u]
+        return comp == NO_COMPONENT or bool(self._is_boundary[u])
+
+    def steps(self, u: int) -> Tuple[Edge, ...]:
+        """
+        Returns the steps out of node u.
+        """
+        got = self._steps.get(u)
+        if got is not None:
+            return got
+        comp = self.component[u]
+        health_costs, move_costs = self.health_costs, self.move_costs
+        got = tuple(
+            (v, health_costs[v], move_costs[v])
+            for v in self._hoods[u]
+            if self.is_node(v)
+            and (comp == NO_COMPONENT or self.component[v] != comp)
+        )
+        if comp != NO_COMPONENT:
+            h, m = health_costs[u], move_costs[u]
+            dist = _direct_distances(
+                u, self.component, self._hoods, self._is_boundary
+            )
+            got += tuple((v, h * d, m * d) for v, d in dist.items())
+        self._steps[u] = got
+        return got
+
+    def expand(self, cells: List[int]) -> List[int]:
+        """
+        Returns the grid path for a path through the graph, filling in
+        the cells walked inside components.
+        """
+        hoods = self._hoods
+        result = cells[:1]
+        for u, v in zip(cells, cells[1:]):
+            if v in hoods[u]:
+                result.append(v)
+                continue
+            # A step across a component: walk back from v to u.
+            comp = self.component[u]
+            parent = {u: u}
+            queue = deque([u])
+            while v not in parent:
+                w = queue.popleft()
+                for x in hoods[w]:
+                    if self.component[x] == comp and x not in parent:
+                        parent[x] = w
+                        queue.append(x)
+            walk = [v]
+            while walk[-1] != u:
+                walk.append(parent[walk[-1]])
+            walk.reverse()
+            result.extend(walk[1:])
+        return result
+
+
+def speeder_heavy_grid(
+    dimensions: Tuple[int, int], share: float, rand: Optional[Random] = None
+) -> Grid:
+    """
+    Returns a random grid with about share of its cells speeders, laid in
+    square patches over otherwise random other terrain.
+    """
+    if not 0 <= share <= 1:
+        raise ValueError(f"invalid share: {share}")
+    if not rand:
+        rand = Random()
+    m, n = dimensions
+    others = [t for t in Terrain if t != Terrain.SPEEDER]
+    cells: List[Terrain] = [rand.choice(others) for _ in range(m * n)]
+    speeders = 0
+    side = max(2, min(m, n) // 6)
+    while speeders < share * m * n:
+        k = rand.randint(1, min(side, m, n))
+        r0, c0 = rand.randrange(m - k + 1), rand.randrange(n - k + 1)
+        for r in range(r0, r0 + k):
+            for c in range(c0, c0 + k):
+                if cells[r * n + c] != Terrain.SPEEDER:
+                    cells[r * n + c] = Terrain.SPEEDER
+                    speeders += 1
+    return Grid(dimensions, cells)
+
+
+@dataclass
+class ContractionReport:
+    dimensions: Tuple[int, int]
+    cells: int
+    nodes: int
+    # Fraction of cells contracted away.
+    reduction: float
+    plain_expanded: int
+    contracted_expanded: int
+    plain_time: float
+    # Includes building the ContractedGraph.
+    contracted_time: float
+    speedup: float
+
+    def to_json_str(self) -> str:
+        return json.dumps(asdict(self))
+
+
+def contraction_report(game: Game) -> ContractionReport:
+    """
+    Solves game with ParetoSolver with and without contraction, and
+    reports the node count reduction and end-to-end speedup.
+    """
+    # Imported here: pareto_solver builds on this module.
+    from gridworld.pareto_solver import ParetoSolver
+
+    dims = game.grid.dimensions
+    graph = ContractedGraph(
+        game.grid,
+        game.costs,
+        keep=(
+            cell_of(game.agent.position, dims),
+            cell_of(game.goal_position, dims),
+        ),
+    )
+    # Both solves find the grid compiled, so neither pays for it.
+    game.grid.compile(game.costs)
+    plain = ParetoSolver(game)
+    t0 = time.perf_counter()
+    want = plain.solve()
+    t1 = time.perf_counter()
+    contracted = ParetoSolver(game, contract=True)
+    got = contracted.solve()
+    t2 = time.perf_counter()
+    if (want is None) != (got is None) or (
+        want is not None and got is not None and want.wellness != got.wellness
+    ):
+        raise ValueError(f"contracted solve differs: {want} != {got}")
+    return ContractionReport(
+        dimensions=dims,
+        cells=graph.cells,
+        nodes=graph.nodes,
+        reduction=graph.reduction,
+        plain_expanded=plain.expanded,
+        contracted_expanded=contracted.expanded,
+        plain_time=t1 - t0,
+        contracted_time=t2 - t1,
+        speedup=(t1 - t0) / (t2 - t1),
+    )
@@ -0,0 +1,245 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from gridworld.agent import Agent
+from gridworld.game import Game
+from gridworld.heatmap import NO_PARENT, Heatmap
+from gridworld.labels import check_costs
+from gridworld.solver_stats import SolverStats
+from gridworld.terrain import Terrain
+from gridworld.wellness_solver import TravelingAgent
+
+# Marks (moves, cell) states the agent cannot be in alive.
+UNREACHED = -1
+
+
+def _neighbor_max(layer: np.ndarray) -> np.ndarray:
+    # Elementwise max over the up/down/left/right neighbors of each cell.
+    out = np.full_like(layer, UNREACHED)
+    np.maximum(out[1:, :], layer[:-1, :], out=out[1:, :])
+    np.maximum(out[:-1, :], layer[1:, :], out=out[:-1, :])
+    np.maximum(out[:, 1:], layer[:, :-1], out=out[:, 1:])
+    np.maximum(out[:, :-1], layer[:, 1:], out=out[:, :-1])
+    return out
+
+
+@dataclass
+class DPSolver:
+    """
+    Exact dense dynamic program over (moves remaining, cell).
+
+    table[m, r, c] holds the most health the agent can have on (r, c) with
+    exactly m moves remaining, or UNREACHED.  Layers are filled from the
+    agent's moves down to 1 with whole-array relaxations over the grid;
+    terrains that cost no moves relax within a layer until it settles.
+    The best path by wellness is then traced back through the table.
+    """
+
+    game: Game
+    table: Optional[np.ndarray] = field(default=None, init=False)
+    # Number of reachable (moves, cell) states in the table.
+    expanded: int = field(default=0, init=False)
+    stats: SolverStats = field(default_factory=SolverStats, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.game, Game):
+            raise ValueError(f"invalid game: {self.game!r}")
+        check_costs(self.game.costs)
+
+    def _fill(self) -> np.ndarray:
+        game = self.game
+        agent = game.agent
+        m0 = agent.moves
+        terrain = np.asarray(game.grid.cells, dtype=np.uint8).reshape(
+            game.grid.dimensions
+        )
+        masks = {t: terrain == t for t in Terrain if (terrain == t).any()}
+        health_costs = {t: game.costs.health_cost_of(t) for t in masks}
+        move_costs = {t: -game.costs.move_cost_of(t) for t in masks}
+        # Small enough for int16 in the common case.
+        widest = agent.health - min(health_costs.values()) + 1
+        dtype = np.int16 if widest < np.iinfo(np.int16).max else np.int32
+        table = np.full(
+            (m0 + 1,) + game.grid.dimensions, UNREACHED, dtype=dtype
+        )
+        table[(m0,) + agent.position] = agent.health
+        free = [t for t in masks if move_costs[t] == 0]
+        for m in range(m0, 0, -1):
+            layer = table[m]
+            nbr_max: Dict[int, np.ndarray] = {}
+            for t in masks:
+                k = move_costs[t]
+                if k == 0 or m + k > m0:
+                    continue
+                if k not in nbr_max:
+                    nbr_max[k] = _neighbor_max(table[m + k])
+                cand = nbr_max[k] + health_costs[t]
+                np.maximum(layer, cand, out=layer, where=masks[t])
+            while free:
+                before = layer.copy()
+                cand_all = _neighbor_max(layer)
+                for t in free:
+                    cand = cand_all + health_costs[t]
+                    np.maximum(layer, cand, out=layer, where=masks[t])
+                layer[layer <= 0] = UNREACHED
+                if np.array_equal(before, layer):
+                    break
+            layer[layer <= 0] = UNREACHED
+        return table
+
+    def solve(self) -> Optional[TravelingAgent]:
+        stats = self.stats = SolverStats()
+        t0 = time.perf_counter()
+        game = self.game
+        agent = game.agent
+        self.table = None
+        self.expanded = 0
+        if agent.is_dead():
+            return None
+        t1 = time.perf_counter()
+        stats.setup_time = t1 - t0
+        table = self._fill()
+        self.table = table
+        self.expanded = stats.peak_live = int(np.count_nonzero(table > 0))
+        t2 = time.perf_counter()
+        stats.search_time = t2 - t1
+        goal = game.goal_position
+        at_goal = table[(slice(None),) + goal].astype(np.int64)
+        wellness = np.where(at_goal > 0, at_goal * np.arange(len(at_goal)), -1)
+        m = int(np.argmax(wellness))
+        if wellness[m] <= 0:
+            stats.reconstruct_time = time.perf_counter() - t2
+            return None
+        path = self._trace(table, m, goal)
+        stats.reconstruct_time = time.perf_counter() - t2
+        return TravelingAgent(
+            agent=Agent(
+                position=goal,
+                health=int(table[(m,) + goal]),
+                max_health=agent.max_health,
+                moves=m,
+                max_moves=agent.max_moves,
+            ),
+            path=path,
+        )
+
+    def solve_all(self) -> Heatmap:
+        """
+        Returns the best state the agent can reach on every cell, from the
+        one table fill solve() makes for a single goal.
+        """
+        stats = self.stats = SolverStats()
+        t0 = time.perf_counter()
+        game = self.game
+        agent = game.agent
+        dims = rows, cols = game.grid.dimensions
+        self.table = None
+        self.expanded = 0
+        health = np.zeros(dims, dtype=np.int32)
+        moves = np.zeros(dims, dtype=np.int32)
+        parent = np.full(dims, NO_PARENT, dtype=np.int32)
+        heatmap = Heatmap(
+            max_health=agent.max_health,
+            max_moves=agent.max_moves,
+            health=health,
+            moves=moves,
+            parent=parent,
+        )
+        if agent.is_dead():
+            return heatmap
+        adjacency = game.grid.compile(game.costs)
+        health_costs = np.asarray(adjacency.health_costs).reshape(dims)
+        move_costs = np.asarray(adjacency.move_costs).reshape(dims)
+        t1 = time.perf_counter()
+        stats.setup_time = t1 - t0
+        table = self._fill()
+        self.table = table
+        self.expanded = stats.peak_live = int(np.count_nonzero(table > 0))
+        t2 = time.perf_counter()
+        stats.search_time = t2 - t1
+        layers = np.arange(len(table), dtype=np.int64).reshape(-1, 1, 1)
+        wellness = np.where(table > 0, table * layers, -1)
+        best = np.argmax(wellness, axis=0)
+        reached = np.take_along_axis(table, best[np.newaxis], axis=0)[0]
+        reachable = reached > 0
+        health[reachable] = reached[reachable]
+        moves[reachable] = best[reachable]
+        # A cell's parent holds the state its best state was entered from.
+        src_moves = np.minimum(moves - move_costs, len(table) - 1)
+        want = health - health_costs
+        r, c = np.indices(dims)
+        for dr, dc in ((-1, 0), (0, -1), (0, 1), (1, 0)):
+            pr, pc = r + dr, c + dc
+            inside = (0 <= pr) & (pr < rows) & (0 <= pc) & (pc < cols)
+            pr, pc = np.clip(pr, 0, rows - 1), np.clip(pc, 0, cols - 1)
+            found = (
+                reachable
+                & inside
+                & (parent == NO_PARENT)
+                & (moves - move_costs < len(table))
+                & (table[src_moves, pr, pc] == want)
+            )
+            parent[found] = (pr * cols + pc)[found]
+        parent[agent.position] = NO_PARENT
+        stats.reconstruct_time = time.perf_counter() - t2
+        return heatmap
+
+    def path_to(
+        self, position: Tuple[int, int]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Returns a best path to position through the table the last solve()
+        or solve_all() filled, or None if position is out of reach.
+        """
+        if self.table is None:
+            raise ValueError("no table: solve first")
+        reached = self.table[(slice(None),) + position].astype(np.int64)
+        wellness = np.where(reached > 0, reached * np.arange(len(reached)), -1)
+        m = int(np.argmax(wellness))
+        if wellness[m] <= 0:
+            return None
+        return self._trace(self.table, m, position)
+
+    def _trace(
+        self, table: np.ndarray, moves: int, goal: Tuple[int, int]
+    ) -> list[Tuple[int, int]]:
+        # Breadth-first back through states whose values are consistent
+        # with the table, so that zero-cost terrain cannot trap the walk.
+        game = self.game
+        agent = game.agent
+        rows, cols = game.grid.dimensions
+        root = (agent.moves, agent.position)
+        state = (moves, goal)
+        came_from: Dict[
+            Tuple[int, Tuple[int, int]], Optional[Tuple[int, Tuple[int, int]]]
+        ] = {state: None}
+        queue: Deque[Tuple[int, Tuple[int, int]]] = deque([state])
+        while queue:
+            state = queue.popleft()
+            m, pos = state
+            if state == root:
+                break
+            t = game.grid[pos]
+            src = m - game.costs.move_cost_of(t)
+            want = int(table[(m,) + pos]) - game.costs.health_cost_of(t)
+            if src >= len(table):
+                continue
+            r, c = pos
+            for prev in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if not (0 <= prev[0] < rows and 0 <= prev[1] < cols):
+                    continue
+                key = (src, prev)
+                if key in came_from or table[(src,) + prev] != want:
+                    continue
+                came_from[key] = state
+                queue.append(key)
+        path = []
+        step: Optional[Tuple[int, Tuple[int, int]]] = state
+        while step is not None:
+            path.append(step[1])
+            step = came_from[step]
+        return path
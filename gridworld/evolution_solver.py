@@ -0,0 +1,300 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from gridworld.agent import Agent
+from gridworld.anytime import Budget
+from gridworld.game import Game
+from gridworld.labels import check_costs
+from gridworld.solver_stats import SolverStats
+from gridworld.terrain import Terrain
+from gridworld.wellness_solver import TravelingAgent
+
+DEFAULT_POPULATION = 128
+DEFAULT_GENERATIONS = 400
+
+# Genomes are this many times the grid's rows plus columns long.
+LENGTH_FACTOR = 2
+
+# Genomes copied unchanged into the next generation, and the fewest a
+# generation may hold to breed more.
+ELITE = 2
+MIN_POPULATION = ELITE + 2
+
+# Genes a mutation changes per genome, on average.
+MUTATIONS = 1.0
+
+# Share of each generation replaced by fresh random genomes.
+IMMIGRANTS = 0.1
+
+# Adjacent genes a mutation swaps per genome, which moves one cell of the
+# walk and leaves the rest in place.
+SWAPS = 4
+
+# Row and column steps of each gene, an index into DIRECTIONS (up, left,
+# right, down), so that 3 - gene is the opposite direction.
+ROW_STEPS = np.array([-1, 0, 0, 1])
+COL_STEPS = np.array([0, -1, 1, 0])
+
+
+@dataclass
+class Walks:
+    """
+    Walks holds one vectorized scoring of a population of genomes.
+
+    Walk i took end[i] steps, and reached the goal alive if reached[i],
+    or died on its last step if died[i].
+    Walks stop at the goal, at the step the agent dies, or before the
+    first step that would leave the grid, at off[i] (or the genome length
+    if none would).  rows and cols hold every walk's positions after each
+    step; health and moves its vitals.
+    """
+
+    rows: np.ndarray
+    cols: np.ndarray
+    health: np.ndarray
+    moves: np.ndarray
+    end: np.ndarray
+    off: np.ndarray
+    reached: np.ndarray
+    died: np.ndarray
+    fitness: np.ndarray
+
+
+def _first(mask: np.ndarray) -> np.ndarray:
+    # Index of the first True in each row of mask, or its width if none.
+    width = mask.shape[1]
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), width)
+
+
+@dataclass
+class EvolutionSolver:
+    """
+    Evolutionary search over fixed-length genomes of directions.
+
+    A genome is a direction string, held as gene codes into
+    adjacency.DIRECTIONS, and walked from the agent's start.  A whole
+    population is scored in one pass of array operations: positions are
+    running sums of the steps, terrain is gathered from the grid's cells,
+    and vitals are running sums of per-terrain cost vectors.  Walks
+    reaching the goal alive rank by wellness, above all others, which rank
+    mostly by how close they end up.
+
+    Each generation keeps the ELITE best genomes, and breeds the rest by
+    tournament selection, one-point crossover, mutation and swaps of
+    adjacent genes, with a few fresh genomes mixed in.  Steps off the grid
+    are turned around in place, and fatal steps put off by one.  Searches
+    run for generations generations, or with a budget until it runs out.
+    history records (seconds, generation, wellness) each time the best
+    path improves.  Answers may fall short of optimal.
+    """
+
+    game: Game
+    population: int = DEFAULT_POPULATION
+    generations: int = DEFAULT_GENERATIONS
+    seed: Optional[int] = None
+    # Genomes scored.
+    expanded: int = field(default=0, init=False)
+    # False if the last solve() stopped early on its budget.
+    complete: bool = field(default=False, init=False)
+    history: List[Tuple[float, int, float]] = field(
+        default_factory=list, init=False
+    )
+    stats: SolverStats = field(default_factory=SolverStats, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.game, Game):
+            raise ValueError(f"invalid game: {self.game!r}")
+        check_costs(self.game.costs)
+        if self.population < MIN_POPULATION:
+            raise ValueError(
+                f"population below {MIN_POPULATION}: {self.population}"
+            )
+        if self.generations <= 0:
+            raise ValueError(f"non-positive generations: {self.generations}")
+        game = self.game
+        self._cells = np.frombuffer(game.grid.cells, dtype=np.uint8)
+        self._health_costs = np.array(
+            [game.costs.health_cost_of(t) for t in Terrain]
+        )
+        self._move_costs = np.array(
+            [game.costs.move_cost_of(t) for t in Terrain]
+        )
+
+    def score(self, genes: np.ndarray) -> Walks:
+        """
+        Walks every genome, a row of genes, from the agent's start.
+        """
+        game = self.game
+        agent = game.agent
+        m, n = game.grid.dimensions
+        r0, c0 = agent.position
+        gr, gc = game.goal_position
+        rows = r0 + np.cumsum(ROW_STEPS[genes], axis=1)
+        cols = c0 + np.cumsum(COL_STEPS[genes], axis=1)
+        off = _first((rows < 0) | (rows >= m) | (cols < 0) | (cols >= n))
+        # Positions past off are clipped to be gathered, then ignored.
+        cells = np.clip(rows, 0, m - 1) * n + np.clip(cols, 0, n - 1)
+        terrain = self._cells[cells]
+        health = agent.health + np.cumsum(self._health_costs[terrain], axis=1)
+        moves = agent.moves + np.cumsum(self._move_costs[terrain], axis=1)
+        at_goal = _first((rows == gr) & (cols == gc))
+        dead = _first((health <= 0) | (moves <= 0))
+        reached = (at_goal < dead) & (at_goal < off)
+        died = (dead <= at_goal) & (dead < off)
+        # Steps onto the goal or into death are taken; steps off are not.
+        end = np.minimum(np.minimum(at_goal, dead) + 1, off)
+        # Vitals and position after the last step taken.
+        i = np.arange(len(genes))
+        last = np.maximum(end - 1, 0)
+        taken = end > 0
+        final_r = np.where(taken, rows[i, last], r0)
+        final_c = np.where(taken, cols[i, last], c0)
+        final_h = np.where(taken, health[i, last], agent.health)
+        final_m = np.where(taken, moves[i, last], agent.moves)
+        wellness = (final_h * final_m) / (agent.max_health * agent.max_moves)
+        distance = np.abs(final_r - gr) + np.abs(final_c - gc)
+        fitness = np.where(
+            reached,
+            1 + wellness,
+            0.9 * (1 - distance / (m + n)) + 0.1 * np.maximum(wellness, 0),
+        )
+        return Walks(
+            rows, cols, health, moves, end, off, reached, died, fitness
+        )
+
+    def _initial(self, rng: np.random.Generator, length: int) -> np.ndarray:
+        # Random genomes leaning toward the goal by varying amounts.
+        game = self.game
+        r0, c0 = game.agent.position
+        gr, gc = game.goal_position
+        toward = np.array(
+            [gr < r0, gc < c0, gc > c0, gr > r0], dtype=np.float64
+        )
+        if not toward.any():
+            toward[:] = 1
+        lean = rng.random((self.population, 1))
+        weights = lean * toward / toward.sum() + (1 - lean) / 4
+        draws = rng.random((self.population, length, 1))
+        bounds = np.cumsum(weights, axis=1)[:, None, :]
+        genes = (draws > bounds[:, :, :3]).sum(axis=2)
+        return genes.astype(np.int8)
+
+    def _breed(
+        self, rng: np.random.Generator, genes: np.ndarray, walks: Walks
+    ) -> np.ndarray:
+        size, length = genes.shape
+        fitness = walks.fitness
+        # Steps off the grid turn around, and fatal steps trade places
+        # with the next, keeping the rest of the walk.
+        i = np.flatnonzero((walks.off == walks.end) & (walks.off < length))
+        genes[i, walks.off[i]] = 3 - genes[i, walks.off[i]]
+        i = np.flatnonzero(walks.died & (walks.end < length))
+        k = walks.end[i] - 1
+        genes[i, k], genes[i, k + 1] = genes[i, k + 1], genes[i, k].copy()
+        elite = np.argsort(-fitness, kind="stable")[:ELITE]
+        children = size - ELITE
+        pairs = rng.integers(size, size=(2 * children, 2))
+        parents = np.where(
+            fitness[pairs[:, 0]] >= fitness[pairs[:, 1]],
+            pairs[:, 0],
+            pairs[:, 1],
+        )
+        mothers = genes[parents[:children]]
+        fathers = genes[parents[children:]]
+        cuts = rng.integers(1, max(length, 2), size=(children, 1))
+        kids = np.where(np.arange(length) < cuts, mothers, fathers)
+        mutate = rng.random(kids.shape) < MUTATIONS / length
+        kids[mutate] = rng.integers(4, size=int(mutate.sum()))
+        if length > 1:
+            rows = np.arange(children)
+            for _ in range(SWAPS):
+                j = rng.integers(length - 1, size=children)
+                kids[rows, j], kids[rows, j + 1] = (
+                    kids[rows, j + 1],
+                    kids[rows, j].copy(),
+                )
+        fresh = int(IMMIGRANTS * size)
+        if fresh:
+            kids[-fresh:] = self._initial(rng, length)[:fresh]
+        return np.concatenate([genes[elite], kids]).astype(np.int8)
+
+    def solve(
+        self,
+        budget: Optional[Budget] = None,
+        on_improve: Optional[Callable[[TravelingAgent], None]] = None,
+    ) -> Optional[TravelingAgent]:
+        """
+        Returns the best path to the goal found, or None if none was.
+
+        With a budget, searches until it runs out instead of for
+        generations generations.  on_improve is called with each path that
+        beats every earlier one.
+        """
+        stats = self.stats = SolverStats()
+        t0 = time.perf_counter()
+        game = self.game
+        agent = game.agent
+        self.expanded = 0
+        self.complete = False
+        self.history = []
+        if agent.is_dead():
+            self.complete = True
+            return None
+        if agent.position == game.goal_position:
+            self.complete = True
+            return TravelingAgent(agent=agent, path=[agent.position])
+        if budget is not None:
+            budget.start()
+        rng = np.random.default_rng(self.seed)
+        m, n = game.grid.dimensions
+        genes = self._initial(rng, LENGTH_FACTOR * (m + n))
+        best: Optional[TravelingAgent] = None
+        stats.peak_queue = stats.peak_live = self.population
+        t1 = time.perf_counter()
+        stats.setup_time = t1 - t0
+        generation = 0
+        while True:
+            if budget is None:
+                if generation >= self.generations:
+                    self.complete = True
+                    break
+            elif budget.is_exhausted(self.expanded):
+                break
+            walks = self.score(genes)
+            self.expanded += len(genes)
+            stats.popped += len(genes)
+            top = int(np.argmax(walks.fitness))
+            if walks.reached[top]:
+                got = self._traveling_agent(walks, top)
+                if best is None or got.wellness > best.wellness:
+                    best = got
+                    self.history.append(
+                        (time.perf_counter() - t1, generation, got.wellness)
+                    )
+                    if on_improve is not None:
+                        on_improve(got)
+            genes = self._breed(rng, genes, walks)
+            generation += 1
+        stats.search_time = time.perf_counter() - t1
+        return best
+
+    def _traveling_agent(self, walks: Walks, i: int) -> TravelingAgent:
+        agent = self.game.agent
+        end = int(walks.end[i])
+        path = [agent.position] + [
+            (int(r), int(c))
+            for r, c in zip(walks.rows[i, :end], walks.cols[i, :end])
+        ]
+        return TravelingAgent(
+            agent=Agent(
+                position=path[-1],
+                health=int(walks.health[i, end - 1]),
+                max_health=agent.max_health,
+                moves=int(walks.moves[i, end - 1]),
+                max_moves=agent.max_moves,
+            ),
+            path=path,
+        )
@@ -0,0 +1,103 @@
+import json
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+from typing import Optional, Tuple
+
+from gridworld.adjacency import Edge
+from gridworld.bucket_queue import BucketQueue
+from gridworld.game import Game
+from gridworld.labels import cell_of
+from gridworld.terrain import Terrain
+
+
+class Resource(StrEnum):
+    HEALTH = "health"
+    MOVES = "moves"
+
+
+@dataclass
+class Infeasibility:
+    """
+    Infeasibility proves a game unwinnable: every path to the goal spends
+    at least need of resource, and the agent has only have, so it would
+    arrive dead.
+    """
+
+    resource: Resource
+    need: int
+    have: int
+
+    def __str__(self) -> str:
+        return (
+            f"infeasible: every path to the goal costs at least"
+            f" {self.need} {self.resource}, and the agent has {self.have}"
+        )
+
+    def to_json_str(self) -> str:
+        return json.dumps(asdict(self))
+
+
+def _least_spend(
+    source: int,
+    goal: int,
+    slot: int,
+    steps: Tuple[Tuple[Edge, ...], ...],
+    limit: int,
+    max_step: int,
+) -> int:
+    # Dijkstra outward from source over one resource, the edge field at
+    # slot.  Cells costing limit or more are never queued, so the walk
+    # stops at the goal or returns limit as a lower bound.  No step spends
+    # more than max_step, so a BucketQueue orders the walk.
+    if limit <= 0:
+        return 0
+    dist = [limit] * len(steps)
+    dist[source] = 0
+    queue: BucketQueue[int] = BucketQueue(max_step)
+    queue.push(0, source)
+    push = queue.push
+    for d, u in queue.drain():
+        if u == goal:
+            return d
+        if d > dist[u]:
+            continue
+        for edge in steps[u]:
+            v = edge[0]
+            nd = d - edge[slot]
+            if nd < dist[v]:
+                dist[v] = nd
+                push(nd, v)
+    return limit
+
+
+def find_infeasibility(game: Game) -> Optional[Infeasibility]:
+    """
+    Returns why the game's agent cannot reach the goal alive, or None if
+    the check cannot rule it out.
+
+    Minimizes health spent ignoring moves, then moves spent ignoring
+    health, from the agent to the goal.  Either alone exceeding the
+    agent's budget proves the game unwinnable, without searching over the
+    two together.  Costs that restore a resource make no bound, so those
+    games are never ruled out.
+    """
+    agent = game.agent
+    costs = game.costs
+    if any(
+        costs.health_cost_of(t) > 0 or costs.move_cost_of(t) > 0
+        for t in Terrain
+    ):
+        return None
+    dims = game.grid.dimensions
+    steps = game.grid.compile(costs).steps
+    source = cell_of(agent.position, dims)
+    goal = cell_of(game.goal_position, dims)
+    for resource, slot, have, cost_of in (
+        (Resource.HEALTH, 1, agent.health, costs.health_cost_of),
+        (Resource.MOVES, 2, agent.moves, costs.move_cost_of),
+    ):
+        max_step = -min(cost_of(t) for t in Terrain)
+        need = _least_spend(source, goal, slot, steps, have, max_step)
+        if need >= have:
+            return Infeasibility(resource, need, have)
+    return None
@@ -4,9 +4,11 @@ from dataclasses import dataclass
 from typing import Tuple, Optional
 
 from gridworld.direction import Direction
-from gridworld.positions import is_valid_at, translate_along, neighborhood
+from gridworld.positions import is_valid_at, translate_along
 from gridworld.agent import Agent
+from gridworld.anytime import Budget
 from gridworld.costs import Costs
+from gridworld.goal_table import GoalTable, goal_table_for
 from gridworld.grid import Grid
 
 
@@ -61,8 +63,11 @@ class Game:
 
     @classmethod
     def from_dimensions(cls, dimensions: Tuple[int, int]) -> "Game":
-        m, n = dimensions
-        grid = Grid.random(dimensions)
+        return cls.from_grid(Grid.random(dimensions))
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "Game":
+        m, n = grid.dimensions
         start = (0, 0)
         goal = (m - 1, n - 1)
         agent = Agent(position=start)
@@ -85,6 +90,59 @@ class Game:
         # it's still a loss.
         return not self.agent.is_alive()
 
+    def goal_table(
+        self, budget: Optional[Budget] = None
+    ) -> Optional[GoalTable]:
+        """
+        Returns the table of resources needed to reach the goal from each
+        cell, shared by every game with the same grid, costs, goal and
+        agent maximums, or None if budget ran out building it.
+
+        Building it searches the whole grid, so callers serving requests
+        should bound it with a budget.
+        """
+        return goal_table_for(
+            self.grid,
+            self.costs,
+            self.goal_position,
+            self.agent.max_health,
+            self.agent.max_moves,
+            budget,
+        )
+
+    def is_winnable(self) -> bool:
+        """
+        Returns True if the agent can still reach the goal alive.
+        """
+        table = self.goal_table()
+        assert table is not None
+        return table.is_winnable(self.agent)
+
+    def best_direction(self) -> Optional[Direction]:
+        """
+        Returns the agent's first move along its best path to the goal, or
+        None if there is none.
+        """
+        table = self.goal_table()
+        assert table is not None
+        return table.best_direction(self.agent)
+
+    def _step(
+        self, direction: Direction, position: Tuple[int, int]
+    ) -> Optional[Tuple[Tuple[int, int], int, int]]:
+        # The cell one step from position in direction, and the health and
+        # moves entering it costs, or None off the grid.  One lookup, so a
+        # single move never compiles the grid; solvers use compile().
+        new_pos = translate_along(position=position, direction=direction)
+        if not is_valid_at(position=new_pos, dimensions=self.grid.dimensions):
+            return None
+        terrain = self.grid[new_pos]
+        return (
+            new_pos,
+            self.costs.health_cost_of(terrain),
+            self.costs.move_cost_of(terrain),
+        )
+
     def move(self, direction: Direction) -> bool:
         """
         Performs a move of the game agent if possible, adjusting
@@ -92,15 +150,12 @@ class Game:
 
         Returns True if the move is possible, False otherwise.
         """
-        dims = self.grid.dimensions
-        pos = self.agent.position
-        hood = neighborhood(dimensions=dims, position=pos)
-        new_pos = translate_along(position=pos, direction=direction)
-        if new_pos not in hood:
+        step = self._step(direction, self.agent.position)
+        if step is None:
             return False
-        terrain = self.grid[new_pos]
-        self.agent.health += self.costs.health_cost_of(terrain)
-        self.agent.moves += self.costs.move_cost_of(terrain)
+        new_pos, health_cost, move_cost = step
+        self.agent.health += health_cost
+        self.agent.moves += move_cost
         self.agent.position = new_pos
         return True
 
@@ -114,15 +169,12 @@ class Game:
         Does not mutate any component of this Game.
         """
         agent = agent or self.agent
-        dims = self.grid.dimensions
-        pos = agent.position
-        hood = neighborhood(dimensions=dims, position=pos)
-        new_pos = translate_along(position=pos, direction=direction)
-        result = copy.deepcopy(agent)
-        if new_pos not in hood:
+        step = self._step(direction, agent.position)
+        if step is None:
             return None
-        terrain = self.grid[new_pos]
-        result.health += self.costs.health_cost_of(terrain)
-        result.moves += self.costs.move_cost_of(terrain)
+        new_pos, health_cost, move_cost = step
+        result = copy.copy(agent)
+        result.health += health_cost
+        result.moves += move_cost
         result.position = new_pos
         return result
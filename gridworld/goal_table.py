@@ -0,0 +1,272 @@
+import hashlib
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from gridworld.agent import Agent
+from gridworld.anytime import Budget
+from gridworld.costs import Costs
+from gridworld.direction import Direction
+from gridworld.grid import Grid
+from gridworld.labels import (
+    Label,
+    cell_of,
+    check_costs,
+    insert_label,
+    position_of,
+)
+
+
+class GoalSearch:
+    """
+    GoalSearch is a resumable label-setting search rooted at a goal.
+
+    Labels hold the (non-positive) cost deltas of walking from their cell
+    to the goal, excluding the cell itself since costs are paid on
+    entering.  Each label's parent is its next cell toward the goal.
+    Labels are settled in order of least health spent, so advance() can
+    stop as soon as the rest would spend more health than an agent has.
+    """
+
+    def __init__(
+        self, grid: Grid, costs: Costs, goal: Tuple[int, int], max_moves: int
+    ):
+        check_costs(costs)
+        self.max_moves = max_moves
+        adjacency = grid.compile(costs)
+        self.health_costs = adjacency.health_costs
+        self.move_costs = adjacency.move_costs
+        self.steps = adjacency.steps
+        root = Label(cell_of(goal, grid.dimensions), 0, 0)
+        self.fronts: List[List[Label]] = [[] for _ in range(len(grid))]
+        self.fronts[root.cell].append(root)
+        self._queue: List[Tuple[int, int, int, Label]] = [(0, 0, 0, root)]
+        self._seq = 0
+        self.expanded = 0
+
+    def advance(self, health: int, budget: Optional[Budget] = None) -> int:
+        """
+        Settles every label spending less than health, or as many as budget
+        allows, returning how many labels that expanded.
+        """
+        queue = self._queue
+        expanded = 0
+        while queue and queue[0][0] < health:
+            if budget is not None and budget.is_exhausted(
+                self.expanded + expanded
+            ):
+                break
+            label = heapq.heappop(queue)[3]
+            if label.dead:
+                continue
+            expanded += 1
+            health_after = label.health + self.health_costs[label.cell]
+            moves_after = label.moves + self.move_costs[label.cell]
+            if -moves_after >= self.max_moves:
+                continue
+            for cell, _, _ in self.steps[label.cell]:
+                new_label = Label(
+                    cell,
+                    health_after,
+                    moves_after,
+                    parent=label,
+                    steps=label.steps + 1,
+                )
+                if insert_label(self.fronts[cell], new_label):
+                    self._seq += 1
+                    heapq.heappush(
+                        queue,
+                        (-health_after, -moves_after, self._seq, new_label),
+                    )
+        self.expanded += expanded
+        return expanded
+
+    def is_settled(self, health: int) -> bool:
+        """
+        Returns True if every label spending less than health is settled.
+        """
+        return not self._queue or self._queue[0][0] >= health
+
+
+@dataclass
+class GoalTable:
+    """
+    GoalTable holds, for every cell, the Pareto-minimal (health, moves)
+    an agent must spend to get from it to the goal.
+
+    The needs of cell are entries offsets[cell] to offsets[cell + 1] of
+    health_needs, move_needs and next_cells, sorted by health.  Being
+    Pareto-minimal, their moves fall as their health rises, so a
+    winnability check is one binary search of the cell's health needs.
+    """
+
+    dimensions: Tuple[int, int]
+    offsets: array
+    health_needs: array
+    move_needs: array
+    next_cells: array
+
+    @classmethod
+    def build(
+        cls,
+        grid: Grid,
+        costs: Costs,
+        goal: Tuple[int, int],
+        max_health: int,
+        max_moves: int,
+        budget: Optional[Budget] = None,
+    ) -> Optional["GoalTable"]:
+        """
+        Returns the table, or None if budget ran out building it.
+        """
+        if budget is not None:
+            budget.start()
+        search = GoalSearch(grid, costs, goal, max_moves)
+        search.advance(max_health, budget)
+        if not search.is_settled(max_health):
+            return None
+        offsets = array("i", [0])
+        health_needs = array("i")
+        move_needs = array("i")
+        next_cells = array("i")
+        for cell, front in enumerate(search.fronts):
+            entries = sorted(
+                (
+                    -b.health,
+                    -b.moves,
+                    b.parent.cell if b.parent is not None else cell,
+                )
+                for b in front
+                if -b.health < max_health
+            )
+            for health, moves, next_cell in entries:
+                health_needs.append(health)
+                move_needs.append(moves)
+                next_cells.append(next_cell)
+            offsets.append(len(health_needs))
+        return cls(
+            grid.dimensions, offsets, health_needs, move_needs, next_cells
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            a.itemsize * len(a)
+            for a in (
+                self.offsets,
+                self.health_needs,
+                self.move_needs,
+                self.next_cells,
+            )
+        )
+
+    def needs(self, cell: int) -> List[Tuple[int, int, int]]:
+        """
+        Returns the (health, moves, next cell) needs of cell, by health.
+        """
+        lo, hi = self.offsets[cell], self.offsets[cell + 1]
+        return list(
+            zip(
+                self.health_needs[lo:hi],
+                self.move_needs[lo:hi],
+                self.next_cells[lo:hi],
+            )
+        )
+
+    def is_winnable(self, agent: Agent) -> bool:
+        """
+        Returns True if agent can still reach the goal alive.
+        """
+        if agent.is_dead():
+            return False
+        cell = cell_of(agent.position, self.dimensions)
+        lo, hi = self.offsets[cell], self.offsets[cell + 1]
+        # Needs spending less health than the agent has; the last of them
+        # spends the fewest moves.
+        i = bisect_left(self.health_needs, agent.health, lo, hi)
+        return i > lo and self.move_needs[i - 1] < agent.moves
+
+    def best_direction(self, agent: Agent) -> Optional[Direction]:
+        """
+        Returns the first step of agent's best way to the goal, or None if
+        agent is on the goal or cannot reach it.
+
+        Scans only the needs of agent's cell, whose count is bounded by the
+        distinct health totals, not by the grid size.
+        """
+        if agent.is_dead():
+            return None
+        cell = cell_of(agent.position, self.dimensions)
+        best = None
+        best_wellness = 0
+        for health, moves, next_cell in self.needs(cell):
+            if health >= agent.health:
+                break
+            if moves >= agent.moves or next_cell == cell:
+                continue
+            wellness = (agent.health - health) * (agent.moves - moves)
+            if wellness > best_wellness:
+                best, best_wellness = next_cell, wellness
+        if best is None:
+            return None
+        r, c = agent.position
+        nr, nc = position_of(best, self.dimensions)
+        if nr < r:
+            return Direction.UP
+        if nr > r:
+            return Direction.DOWN
+        if nc < c:
+            return Direction.LEFT
+        return Direction.RIGHT
+
+
+# Total bytes of goal tables kept for reuse, least recently used dropped
+# first.  A table bigger than this is built but not kept.
+GOAL_TABLE_CACHE_BYTES = 64 << 20
+
+_goal_tables: OrderedDict[Tuple, GoalTable] = OrderedDict()
+_goal_tables_bytes = 0
+_goal_tables_lock = threading.Lock()
+
+
+def goal_table_for(
+    grid: Grid,
+    costs: Costs,
+    goal: Tuple[int, int],
+    max_health: int,
+    max_moves: int,
+    budget: Optional[Budget] = None,
+) -> Optional[GoalTable]:
+    """
+    Returns the GoalTable for these inputs, built once and then shared,
+    or None if budget ran out building it.
+    """
+    global _goal_tables_bytes
+    key = (
+        grid.dimensions,
+        hashlib.sha256(grid.cells).digest(),
+        costs.to_json_str(),
+        goal,
+        max_health,
+        max_moves,
+    )
+    with _goal_tables_lock:
+        table = _goal_tables.get(key)
+        if table is not None:
+            _goal_tables.move_to_end(key)
+            return table
+    table = GoalTable.build(grid, costs, goal, max_health, max_moves, budget)
+    if table is None or table.nbytes > GOAL_TABLE_CACHE_BYTES:
+        return table
+    with _goal_tables_lock:
+        if key not in _goal_tables:
+            _goal_tables[key] = table
+            _goal_tables_bytes += table.nbytes
+        while _goal_tables_bytes > GOAL_TABLE_CACHE_BYTES:
+            _, dropped = _goal_tables.popitem(last=False)
+            _goal_tables_bytes -= dropped.nbytes
+    return table
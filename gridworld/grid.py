@@ -2,10 +2,15 @@ import json
 from array import array
 from dataclasses import dataclass
 from random import Random
-from typing import Iterable, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
+from gridworld.adjacency import Adjacency
+from gridworld.costs import Costs
 from gridworld.terrain import Terrain
 
+# Compiled adjacencies a grid keeps, one per Costs, oldest dropped first.
+COMPILED_CACHE_SIZE = 4
+
 
 @dataclass
 class Grid:
@@ -32,6 +37,38 @@ class Grid:
             t = Terrain(cell)
             # print(f'{t!r}')
             self.cells.append(t)
+        self._compiled: Dict[str, Adjacency] = {}
+        self._last_compiled: Optional[Tuple[Costs, Adjacency]] = None
+
+    def __getstate__(self):
+        # Compiled adjacencies are rebuilt on demand, not shipped around.
+        return {"dimensions": self.dimensions, "cells": self.cells}
+
+    def __setstate__(self, state):
+        self.dimensions = state["dimensions"]
+        self.cells = state["cells"]
+        self._compiled = {}
+        self._last_compiled = None
+
+    def compile(self, costs: Costs) -> Adjacency:
+        """
+        Returns this grid compiled for search under costs.
+
+        The last COMPILED_CACHE_SIZE Costs compiled are kept for later
+        calls, so cells must not change afterward.
+        """
+        last = self._last_compiled
+        if last is not None and last[0] is costs:
+            return last[1]
+        key = costs.to_json_str()
+        adjacency = self._compiled.get(key)
+        if adjacency is None:
+            adjacency = Adjacency.compile(self.dimensions, self.cells, costs)
+            if len(self._compiled) >= COMPILED_CACHE_SIZE:
+                del self._compiled[next(iter(self._compiled))]
+            self._compiled[key] = adjacency
+        self._last_compiled = (costs, adjacency)
+        return adjacency
 
     @classmethod
     def from_rows(cls, rows: Iterable[str]) -> "Grid":
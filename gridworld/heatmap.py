@@ -0,0 +1,77 @@
+import json
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+# Marks the start cell, and cells the agent cannot reach alive.
+NO_PARENT = -1
+
+# Cells shown by tenths of wellness, and cells out of reach.
+SHADES = "0123456789"
+UNREACHABLE = "-"
+
+
+@dataclass(eq=False)
+class Heatmap:
+    """
+    Heatmap holds the best state one agent can reach on every cell of a
+    grid, as (rows, columns) arrays.
+
+    health and moves are the vitals of the state with the greatest
+    wellness on each cell, both 0 on cells the agent cannot reach alive.
+    parent is the flat index of the cell the best path to each cell enters
+    it from, or NO_PARENT.  Best paths to neighboring cells may differ, so
+    following parents does not rebuild a path; DPSolver.path_to() does.
+    """
+
+    max_health: int
+    max_moves: int
+    health: np.ndarray
+    moves: np.ndarray
+    parent: np.ndarray
+
+    @property
+    def dimensions(self) -> Tuple[int, int]:
+        rows, cols = self.health.shape
+        return rows, cols
+
+    @property
+    def reachable(self) -> np.ndarray:
+        return self.health > 0
+
+    @property
+    def wellness(self) -> np.ndarray:
+        """
+        Returns the best wellness on each cell, 0 where out of reach.
+        """
+        product = self.health.astype(np.int64) * self.moves
+        return product / (self.max_health * self.max_moves)
+
+    def render(self) -> str:
+        """
+        Returns rows of one character per cell: the tenth of full wellness
+        the best state there reaches, or UNREACHABLE.
+        """
+        tenths = np.minimum((self.wellness * 10).astype(np.int64), 9)
+        reachable = self.reachable
+        rows, cols = self.dimensions
+        return "\n".join(
+            "".join(
+                SHADES[tenths[r, c]] if reachable[r, c] else UNREACHABLE
+                for c in range(cols)
+            )
+            for r in range(rows)
+        )
+
+    def to_json_str(self) -> str:
+        return json.dumps(
+            {
+                "dimensions": self.dimensions,
+                "max_health": self.max_health,
+                "max_moves": self.max_moves,
+                "health": self.health.tolist(),
+                "moves": self.moves.tolist(),
+                "parent": self.parent.tolist(),
+            }
+        )
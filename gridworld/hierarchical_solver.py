@@ -0,0 +1,389 @@
+import heapq
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from gridworld.agent import Agent
+from gridworld.costs import Costs
+from gridworld.game import Game
+from gridworld.labels import (
+    Label,
+    cell_of,
+    check_costs,
+    insert_label,
+    neighbor_table,
+    position_of,
+)
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.solver_stats import SolverStats
+from gridworld.terrain import Terrain
+from gridworld.wellness_solver import TravelingAgent
+
+DEFAULT_TILE_SIZE = 16
+DEFAULT_PORTALS = 4
+
+# Per terrain health costs, then per terrain move costs, in Terrain order.
+CostsKey = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+
+def _costs_key(costs: Costs) -> CostsKey:
+    return (
+        tuple(costs.health_cost_of(t) for t in Terrain),
+        tuple(costs.move_cost_of(t) for t in Terrain),
+    )
+
+
+def _portal_offsets(length: int, portals: int) -> List[int]:
+    # Evenly spaced along a tile side, without repeats on short sides.
+    return sorted(
+        {(i + 1) * length // (portals + 1) for i in range(portals)}
+        & set(range(length))
+        or {length // 2}
+    )
+
+
+def _tile_search(
+    cells: bytes,
+    dims: Tuple[int, int],
+    source: int,
+    costs: CostsKey,
+    max_health: int,
+    max_moves: int,
+) -> List[List[Label]]:
+    # Label-setting from source within one tile.  Labels hold the
+    # (non-positive) deltas of walking from source, which is not paid for.
+    health_costs = [costs[0][t] for t in cells]
+    move_costs = [costs[1][t] for t in cells]
+    hoods = neighbor_table(dims)
+    fronts: List[List[Label]] = [[] for _ in range(len(cells))]
+    root = Label(source, 0, 0)
+    fronts[source].append(root)
+    seq = 0
+    queue = [(0, 0, seq, root)]
+    while queue:
+        label = heapq.heappop(queue)[3]
+        if label.dead:
+            continue
+        for cell in hoods[label.cell]:
+            health = label.health + health_costs[cell]
+            moves = label.moves + move_costs[cell]
+            if -health >= max_health or -moves >= max_moves:
+                continue
+            new_label = Label(
+                cell, health, moves, parent=label, steps=label.steps + 1
+            )
+            if insert_label(fronts[cell], new_label):
+                seq += 1
+                heapq.heappush(queue, (-health, -moves, seq, new_label))
+    return fronts
+
+
+@lru_cache(maxsize=4096)
+def _tile_costs(
+    cells: bytes,
+    dims: Tuple[int, int],
+    nodes: Tuple[int, ...],
+    costs: CostsKey,
+    max_health: int,
+    max_moves: int,
+) -> Tuple[Tuple[Tuple[int, int, int], ...], ...]:
+    # For each node, the Pareto-minimal (target node index, health, moves)
+    # deltas of reaching the tile's other nodes without leaving the tile.
+    # Keyed by tile content, so identical tiles share one entry.
+    result = []
+    for source in nodes:
+        fronts = _tile_search(
+            cells, dims, source, costs, max_health, max_moves
+        )
+        result.append(
+            tuple(
+                (j, b.health, b.moves)
+                for j, target in enumerate(nodes)
+                if target != source
+                for b in fronts[target]
+            )
+        )
+    return tuple(result)
+
+
+@dataclass
+class _Tile:
+    origin: Tuple[int, int]
+    dims: Tuple[int, int]
+    cells: bytes
+    # Abstract nodes as flat grid cells, and each node's edges within the
+    # tile as (target cell, health delta, moves delta).
+    nodes: List[int]
+    edges: Dict[int, List[Tuple[int, int, int]]]
+
+
+@dataclass
+class HierarchicalSolver:
+    """
+    HPA*-style search over tiles of the grid.
+
+    The grid is cut into tile_size square tiles.  Each side shared by two
+    tiles gets a few portals: pairs of facing cells that an abstract path
+    may cross by.  Within a tile, the Pareto-minimal (health, moves) costs
+    between its portal cells are found by a local label-setting search and
+    cached by tile content.  Tiles are only built once the abstract search
+    reaches them, so work grows with the area the agent can reach rather
+    than with the grid.  That is its only advantage: where the agent can
+    reach most of the grid, AStarSolver is faster and exact.
+
+    The abstract search is label-setting over portal cells, pruned by the
+    best wellness reached at the goal so far.  Each hop within a tile of
+    the winning abstract path is then refined into cells by searching that
+    tile again.  Paths are limited to crossing tiles at portals, so the
+    answer may fall short of optimal; with portals >= tile_size every
+    border cell is a portal and the answer is exact.  If no path crosses
+    at portals, the game is solved again by ParetoSolver, so None means
+    the game cannot be won.
+    """
+
+    game: Game
+    tile_size: int = DEFAULT_TILE_SIZE
+    portals: int = DEFAULT_PORTALS
+    expanded: int = field(default=0, init=False)
+    # Tiles built by the last solve().
+    tiles_built: int = field(default=0, init=False)
+    # Whether the last solve() fell back to ParetoSolver.
+    fell_back: bool = field(default=False, init=False)
+    stats: SolverStats = field(default_factory=SolverStats, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.game, Game):
+            raise ValueError(f"invalid game: {self.game!r}")
+        if self.tile_size <= 0:
+            raise ValueError(f"non-positive tile_size: {self.tile_size}")
+        if self.portals <= 0:
+            raise ValueError(f"non-positive portals: {self.portals}")
+        check_costs(self.game.costs)
+
+    def _tile_of(self, cell: int) -> Tuple[int, int]:
+        r, c = position_of(cell, self.game.grid.dimensions)
+        return r // self.tile_size, c // self.tile_size
+
+    def _build_tile(self, tile: Tuple[int, int]) -> _Tile:
+        game = self.game
+        m, n = game.grid.dimensions
+        size = self.tile_size
+        r0, c0 = tile[0] * size, tile[1] * size
+        r1, c1 = min(r0 + size, m), min(c0 + size, n)
+        rows, cols = r1 - r0, c1 - c0
+        parts = []
+        for r in range(r0, r1):
+            first, last = r * n + c0, r * n + c1
+            parts.append(bytes(game.grid.cells[first:last]))
+        cells = b"".join(parts)
+        local = set()
+        for off in _portal_offsets(rows, self.portals):
+            if c0 > 0:
+                local.add((off, 0))
+            if c1 < n:
+                local.add((off, cols - 1))
+        for off in _portal_offsets(cols, self.portals):
+            if r0 > 0:
+                local.add((0, off))
+            if r1 < m:
+                local.add((rows - 1, off))
+        for pos in (game.agent.position, game.goal_position):
+            if r0 <= pos[0] < r1 and c0 <= pos[1] < c1:
+                local.add((pos[0] - r0, pos[1] - c0))
+        ordered = sorted(local)
+        nodes = [(r0 + r) * n + (c0 + c) for r, c in ordered]
+        costs = _tile_costs(
+            cells,
+            (rows, cols),
+            tuple(r * cols + c for r, c in ordered),
+            _costs_key(game.costs),
+            game.agent.max_health,
+            game.agent.max_moves,
+        )
+        edges = {
+            node: [(nodes[j], dh, dm) for j, dh, dm in costs[i]]
+            for i, node in enumerate(nodes)
+        }
+        self.tiles_built += 1
+        return _Tile((r0, c0), (rows, cols), cells, nodes, edges)
+
+    def _crossings(self, cell: int) -> List[int]:
+        # Cells in neighboring tiles facing cell across a portal.
+        m, n = self.game.grid.dimensions
+        size = self.tile_size
+        r, c = position_of(cell, (m, n))
+        r0, c0 = r - r % size, c - c % size
+        rows, cols = min(size, m - r0), min(size, n - c0)
+        result = []
+        if c == c0 and c > 0 and r - r0 in _portal_offsets(rows, self.portals):
+            result.append(cell - 1)
+        if c == c0 + cols - 1 and c < n - 1:
+            if r - r0 in _portal_offsets(rows, self.portals):
+                result.append(cell + 1)
+        if r == r0 and r > 0 and c - c0 in _portal_offsets(cols, self.portals):
+            result.append(cell - n)
+        if r == r0 + rows - 1 and r < m - 1:
+            if c - c0 in _portal_offsets(cols, self.portals):
+                result.append(cell + n)
+        return result
+
+    def _refine(
+        self, tile: _Tile, source: int, target: int, health: int, moves: int
+    ) -> List[int]:
+        # Cells after source up to target, along a path within tile
+        # spending exactly (health, moves).
+        game = self.game
+        n = game.grid.dimensions[1]
+        r0, c0 = tile.origin
+        cols = tile.dims[1]
+
+        def to_local(cell: int) -> int:
+            r, c = divmod(cell, n)
+            return (r - r0) * cols + (c - c0)
+
+        fronts = _tile_search(
+            tile.cells,
+            tile.dims,
+            to_local(source),
+            _costs_key(game.costs),
+            game.agent.max_health,
+            game.agent.max_moves,
+        )
+        for b in fronts[to_local(target)]:
+            if b.health == health and b.moves == moves:
+                return [
+                    (r0 + lc // cols) * n + c0 + lc % cols
+                    for lc in b.cells()[1:]
+                ]
+        raise ValueError(f"no path within tile: {source} -> {target}")
+
+    def solve(self) -> Optional[TravelingAgent]:
+        stats = self.stats = SolverStats()
+        t0 = time.perf_counter()
+        game = self.game
+        dims = game.grid.dimensions
+        agent = game.agent
+        self.expanded = 0
+        self.tiles_built = 0
+        self.fell_back = False
+        if agent.is_dead():
+            return None
+        health_costs = _costs_key(game.costs)[0]
+        move_costs = _costs_key(game.costs)[1]
+        cells = game.grid.cells
+        goal = cell_of(game.goal_position, dims)
+        tiles: Dict[Tuple[int, int], _Tile] = {}
+        fronts: Dict[int, List[Label]] = {}
+        root = Label(cell_of(agent.position, dims), agent.health, agent.moves)
+        fronts[root.cell] = [root]
+        seq = 0
+        queue = [(-root.health, -root.moves, seq, root)]
+        best: Optional[Label] = root if root.cell == goal else None
+        live = stats.peak_queue = stats.peak_live = 1
+
+        def push(label: Label) -> None:
+            nonlocal seq, live, best
+            if label.health <= 0 or label.moves <= 0:
+                return
+            if best is not None and (
+                label.health * label.moves <= best.health * best.moves
+            ):
+                stats.pruned += 1
+                return
+            front = fronts.setdefault(label.cell, [])
+            before = len(front)
+            if not insert_label(front, label):
+                stats.pruned += 1
+                return
+            stats.pruned += before + 1 - len(front)
+            live += len(front) - before
+            if label.cell == goal:
+                best = label
+                return
+            seq += 1
+            heapq.heappush(queue, (-label.health, -label.moves, seq, label))
+
+        t1 = time.perf_counter()
+        stats.setup_time = t1 - t0
+        while queue:
+            label = heapq.heappop(queue)[3]
+            stats.popped += 1
+            if label.dead:
+                continue
+            if best is not None and (
+                label.health * label.moves <= best.health * best.moves
+            ):
+                continue
+            self.expanded += 1
+            key = self._tile_of(label.cell)
+            if key not in tiles:
+                tiles[key] = self._build_tile(key)
+            for target, dh, dm in tiles[key].edges.get(label.cell, ()):
+                push(
+                    Label(
+                        target,
+                        label.health + dh,
+                        label.moves + dm,
+                        parent=label,
+                        steps=label.steps + 1,
+                    )
+                )
+            for cell in self._crossings(label.cell):
+                t = cells[cell]
+                push(
+                    Label(
+                        cell,
+                        label.health + health_costs[t],
+                        label.moves + move_costs[t],
+                        parent=label,
+                        steps=label.steps + 1,
+                    )
+                )
+            stats.peak_queue = max(stats.peak_queue, len(queue))
+            stats.peak_live = max(stats.peak_live, live)
+        t2 = time.perf_counter()
+        stats.search_time = t2 - t1
+        if best is None:
+            if self.portals >= self.tile_size:
+                return None
+            # Crossing only at portals may miss every path there is.
+            self.fell_back = True
+            exact = ParetoSolver(game)
+            got = exact.solve()
+            self.expanded += exact.expanded
+            stats.reconstruct_time = time.perf_counter() - t2
+            return got
+        hops = []
+        hop: Optional[Label] = best
+        while hop is not None:
+            hops.append(hop)
+            hop = hop.parent
+        hops.reverse()
+        path_cells = [hops[0].cell]
+        for a, b in zip(hops, hops[1:]):
+            key = self._tile_of(a.cell)
+            if key != self._tile_of(b.cell):
+                path_cells.append(b.cell)
+                continue
+            path_cells.extend(
+                self._refine(
+                    tiles[key],
+                    a.cell,
+                    b.cell,
+                    b.health - a.health,
+                    b.moves - a.moves,
+                )
+            )
+        path = [position_of(c, dims) for c in path_cells]
+        stats.reconstruct_time = time.perf_counter() - t2
+        return TravelingAgent(
+            agent=Agent(
+                position=path[-1],
+                health=best.health,
+                max_health=agent.max_health,
+                moves=best.moves,
+                max_moves=agent.max_moves,
+            ),
+            path=path,
+        )
@@ -0,0 +1,196 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from gridworld.agent import Agent
+from gridworld.astar_solver import lower_bounds
+from gridworld.game import Game
+from gridworld.labels import (
+    cell_of,
+    check_costs,
+    position_of,
+)
+from gridworld.solver_stats import SolverStats
+from gridworld.wellness_solver import TravelingAgent
+
+DEFAULT_TABLE_SIZE = 1 << 16
+
+
+class TranspositionTable:
+    """
+    TranspositionTable remembers the (health, moves) of states already
+    searched on each cell, holding at most size entries.
+
+    A state is covered if a remembered state on its cell has at least its
+    health and moves.  Once full, the cells added earliest are forgotten
+    first.
+    """
+
+    def __init__(self, size: int):
+        if size < 0:
+            raise ValueError(f"negative size: {size}")
+        self.size = size
+        self._entries: Dict[int, List[Tuple[int, int]]] = {}
+        self._count = 0
+
+    def covers(self, cell: int, health: int, moves: int) -> bool:
+        for h, m in self._entries.get(cell, ()):
+            if h >= health and m >= moves:
+                return True
+        return False
+
+    def add(self, cell: int, health: int, moves: int) -> None:
+        if self.size == 0:
+            return
+        old = self._entries.pop(cell, [])
+        kept = [(h, m) for h, m in old if h > health or m > moves]
+        kept.append((health, moves))
+        self._count += len(kept) - len(old)
+        self._entries[cell] = kept
+        while self._count > self.size:
+            first = next(iter(self._entries))
+            self._count -= len(self._entries.pop(first))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+
+@dataclass
+class IDAStarSolver:
+    """
+    Iterative-deepening depth-first search for the best wellness.
+
+    Each iteration searches depth-first for a goal whose wellness reaches
+    a threshold, pruning states whose wellness bound (their vitals less the
+    lower_bounds() to the goal) falls below it, and raising the threshold
+    past each goal found so the best one wins.  If no goal clears the
+    threshold, the next iteration lowers it to the best bound pruned, so
+    the first iteration to find a goal finds the optimum.
+
+    Only the current path is kept, one stack entry per step, plus the
+    per-cell tables and a transposition table of at most table_size
+    states, which skips states dominated by one already searched in the
+    same iteration.
+    """
+
+    game: Game
+    table_size: int = DEFAULT_TABLE_SIZE
+    expanded: int = field(default=0, init=False)
+    # Thresholds tried by the last solve().
+    iterations: int = field(default=0, init=False)
+    stats: SolverStats = field(default_factory=SolverStats, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.game, Game):
+            raise ValueError(f"invalid game: {self.game!r}")
+        if self.table_size < 0:
+            raise ValueError(f"negative table_size: {self.table_size}")
+        check_costs(self.game.costs)
+
+    def solve(self) -> Optional[TravelingAgent]:
+        stats = self.stats = SolverStats()
+        t0 = time.perf_counter()
+        game = self.game
+        dims = game.grid.dimensions
+        agent = game.agent
+        self.expanded = 0
+        self.iterations = 0
+        if agent.is_dead():
+            return None
+        steps = game.grid.compile(game.costs).steps
+        health_need, moves_need = lower_bounds(
+            game.grid, game.costs, game.goal_position
+        )
+        goal = cell_of(game.goal_position, dims)
+        start = cell_of(agent.position, dims)
+        table = TranspositionTable(self.table_size)
+        on_path = bytearray(len(game.grid))
+        t1 = time.perf_counter()
+        stats.setup_time = t1 - t0
+        spare_health = agent.health - health_need[start]
+        spare_moves = agent.moves - moves_need[start]
+        if spare_health <= 0 or spare_moves <= 0:
+            stats.search_time = time.perf_counter() - t1
+            return None
+        threshold = spare_health * spare_moves
+        best_path: List[int] = []
+        best_health = best_moves = 0
+        while True:
+            self.iterations += 1
+            table.clear()
+            # Goals must beat floor, which rises as goals are found.
+            floor = threshold - 1
+            next_threshold = 0
+            # Each entry: cell, health, moves, index of next neighbor.
+            stack = [[start, agent.health, agent.moves, 0]]
+            on_path[start] = 1
+            if start == goal:
+                best_path = [start]
+                best_health, best_moves = agent.health, agent.moves
+                stack.clear()
+            else:
+                stats.popped += 1
+                self.expanded += 1
+            while stack:
+                stats.peak_queue = max(stats.peak_queue, len(stack))
+                top = stack[-1]
+                cell, health, moves, i = top
+                hood = steps[cell]
+                if i == len(hood):
+                    on_path[cell] = 0
+                    stack.pop()
+                    continue
+                top[3] = i + 1
+                nxt, health_cost, move_cost = hood[i]
+                if on_path[nxt]:
+                    continue
+                nh = health + health_cost
+                nm = moves + move_cost
+                spare_health = nh - health_need[nxt]
+                spare_moves = nm - moves_need[nxt]
+                if spare_health <= 0 or spare_moves <= 0:
+                    continue
+                bound = spare_health * spare_moves
+                if bound <= floor:
+                    stats.pruned += 1
+                    if not best_path and bound > next_threshold:
+                        next_threshold = bound
+                    continue
+                if nxt == goal:
+                    floor = nh * nm
+                    best_path = [entry[0] for entry in stack] + [nxt]
+                    best_health, best_moves = nh, nm
+                    continue
+                if table.covers(nxt, nh, nm):
+                    stats.duplicates += 1
+                    continue
+                table.add(nxt, nh, nm)
+                stats.popped += 1
+                self.expanded += 1
+                on_path[nxt] = 1
+                stack.append([nxt, nh, nm, 0])
+                stats.peak_live = max(stats.peak_live, len(stack) + len(table))
+            if best_path or next_threshold == 0:
+                break
+            threshold = next_threshold
+        t2 = time.perf_counter()
+        stats.search_time = t2 - t1
+        if not best_path:
+            return None
+        path = [position_of(c, dims) for c in best_path]
+        got = TravelingAgent(
+            agent=Agent(
+                position=path[-1],
+                health=best_health,
+                max_health=agent.max_health,
+                moves=best_moves,
+                max_moves=agent.max_moves,
+            ),
+            path=path,
+        )
+        stats.reconstruct_time = time.perf_counter() - t2
+        return got
@@ -0,0 +1,96 @@
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+from gridworld.agent import Agent
+from gridworld.costs import Costs
+from gridworld.game import Game
+from gridworld.goal_table import GoalSearch
+from gridworld.labels import Label, cell_of, check_costs, position_of
+from gridworld.wellness_solver import TravelingAgent
+
+
+@dataclass
+class IncrementalPlanner:
+    """
+    Plans the best remaining path of a game in progress, keeping its search
+    between moves.
+
+    As in D* Lite, the search is rooted at the goal rather than the agent:
+    labels hold the cost deltas of walking from a cell to the goal, so they
+    stay valid wherever the agent goes.  The search is resumed only as far
+    as the agent's current health needs: labels are settled in order of
+    least health spent, and a label spending at least the agent's health is
+    useless to it.  Since a move never raises health, a plan after a move
+    usually expands nothing at all.
+
+    The search is rebuilt from scratch only when the game's grid, costs,
+    goal or the agent's max moves change.
+    """
+
+    game: Game
+    # Labels expanded by the most recent plan(), and over the planner's life.
+    last_expanded: int = field(default=0, init=False)
+    expanded: int = field(default=0, init=False)
+    _basis: Optional[
+        Tuple[Tuple[int, int], bytes, Costs, Tuple[int, int], int]
+    ] = field(default=None, init=False, repr=False)
+    _search: Optional[GoalSearch] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if not isinstance(self.game, Game):
+            raise ValueError(f"invalid game: {self.game!r}")
+        check_costs(self.game.costs)
+
+    def _ensure_search(self) -> GoalSearch:
+        game = self.game
+        basis = (
+            game.grid.dimensions,
+            bytes(game.grid.cells),
+            game.costs,
+            game.goal_position,
+            game.agent.max_moves,
+        )
+        if basis != self._basis or self._search is None:
+            self._basis = basis
+            self._search = GoalSearch(
+                game.grid, game.costs, game.goal_position, game.agent.max_moves
+            )
+        return self._search
+
+    def plan(self) -> Optional[TravelingAgent]:
+        """
+        Returns the best path from the agent's current state to the goal, or
+        None if the game can no longer be won.
+        """
+        self.last_expanded = 0
+        search = self._ensure_search()
+        agent = self.game.agent
+        if agent.is_dead():
+            return None
+        self.last_expanded = search.advance(agent.health)
+        self.expanded += self.last_expanded
+        dims = self.game.grid.dimensions
+        best: Optional[Label] = None
+        best_key = (0, 0)
+        for b in search.fronts[cell_of(agent.position, dims)]:
+            health = agent.health + b.health
+            moves = agent.moves + b.moves
+            if health <= 0 or moves <= 0:
+                continue
+            key = (health * moves, -b.steps)
+            if best is None or key > best_key:
+                best, best_key = b, key
+        if best is None:
+            return None
+        cells = best.cells()
+        cells.reverse()
+        return TravelingAgent(
+            agent=Agent(
+                position=self.game.goal_position,
+                health=agent.health + best.health,
+                max_health=agent.max_health,
+                moves=agent.moves + best.moves,
+                max_moves=agent.max_moves,
+            ),
+            path=[position_of(c, dims) for c in cells],
+        )
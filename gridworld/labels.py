@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from functools import cache
+from typing import List, Optional, Sequence, Tuple
+
+from gridworld.costs import Costs
+from gridworld.grid import Grid
+from gridworld.terrain import Terrain
+
+
+@dataclass(slots=True, eq=False)
+class Label:
+    """
+    Label is one non-dominated (health, moves) state of a search at a cell.
+
+    Cells are flat indexes into Grid.cells.  Bigger health and moves are
+    better; searches that run backward from the goal store accumulated cost
+    deltas (non-positive) in the same fields so that dominance reads the
+    same in both directions.
+    """
+
+    cell: int
+    health: int
+    moves: int
+    parent: Optional["Label"] = None
+    steps: int = 0
+    dead: bool = False
+
+    def dominates(self, other: "Label") -> bool:
+        return self.health >= other.health and self.moves >= other.moves
+
+    def cells(self) -> List[int]:
+        """
+        Returns cells from the root label to this label, inclusive.
+        """
+        result = []
+        label: Optional[Label] = self
+        while label is not None:
+            result.append(label.cell)
+            label = label.parent
+        result.reverse()
+        return result
+
+
+def insert_label(front: List[Label], label: Label) -> bool:
+    """
+    Adds label to front unless a label already in front dominates it.
+
+    Labels in front dominated by the new label are dropped from front and
+    marked dead, so that queued copies of them can be skipped.
+
+    Returns True if label was added, False otherwise.
+    """
+    for other in front:
+        if other.dominates(label):
+            return False
+    kept = []
+    for other in front:
+        if label.dominates(other):
+            other.dead = True
+        else:
+            kept.append(other)
+    kept.append(label)
+    front[:] = kept
+    return True
+
+
+def check_costs(costs: Costs) -> None:
+    """
+    Raises ValueError unless every cost in costs is non-positive.
+
+    Label-setting relies on resources never increasing along a path.
+    """
+    for t in Terrain:
+        if costs.health_cost_of(t) > 0:
+            raise ValueError(f"positive health cost: {t.abbr}")
+        if costs.move_cost_of(t) > 0:
+            raise ValueError(f"positive move cost: {t.abbr}")
+
+
+def cost_tables(grid: Grid, costs: Costs) -> Tuple[List[int], List[int]]:
+    """
+    Returns per-cell (health, move) costs of entering each cell of grid.
+    """
+    hc = {t: costs.health_cost_of(t) for t in Terrain}
+    mc = {t: costs.move_cost_of(t) for t in Terrain}
+    health_costs = [hc[Terrain(t)] for t in grid.cells]
+    move_costs = [mc[Terrain(t)] for t in grid.cells]
+    return health_costs, move_costs
+
+
+@cache
+def neighbor_table(dimensions: Tuple[int, int]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Returns, for each flat cell index, the flat indexes of its neighbors.
+    """
+    m, n = dimensions
+    table = []
+    for r in range(m):
+        for c in range(n):
+            hood = []
+            if r > 0:
+                hood.append((r - 1) * n + c)
+            if c > 0:
+                hood.append(r * n + c - 1)
+            if c < n - 1:
+                hood.append(r * n + c + 1)
+            if r < m - 1:
+                hood.append((r + 1) * n + c)
+            table.append(tuple(hood))
+    return tuple(table)
+
+
+def cell_of(position: Tuple[int, int], dimensions: Tuple[int, int]) -> int:
+    r, c = position
+    return r * dimensions[1] + c
+
+
+def position_of(cell: int, dimensions: Tuple[int, int]) -> Tuple[int, int]:
+    return divmod(cell, dimensions[1])
+
+
+def best_label(labels: Sequence[Label]) -> Optional[Label]:
+    """
+    Returns the label with greatest health * moves, preferring fewer steps.
+    """
+    best = None
+    for label in labels:
+        if label.health <= 0 or label.moves <= 0:
+            continue
+        if best is None:
+            best = label
+            continue
+        w = label.health * label.moves
+        bw = best.health * best.moves
+        if w > bw or (w == bw and label.steps < best.steps):
+            best = label
+    return best
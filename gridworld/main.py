@@ -4,16 +4,48 @@ import operator
 import os.path
 import re
 import subprocess
+import sys
+import time
 import tracemalloc
 from enum import StrEnum
 from itertools import repeat
-from typing import Tuple
+from random import Random
+from typing import Optional, Sequence, Tuple
 
 from gridworld.agent import Agent
+from gridworld.anytime import Budget
+from gridworld.batch import DEFAULT_CHUNKSIZE, grid_paths, solve_batch
+from gridworld.beam_solver import DEFAULT_BEAM_WIDTH, gap_report
+from gridworld.benchmark import (
+    BENCHMARK_SIDES,
+    benchmark_games,
+    compare_benchmarks,
+    load_benchmark,
+    run_benchmark,
+    save_benchmark,
+)
+from gridworld.bucket_queue import queue_benchmark
+from gridworld.checkpoint import DEFAULT_CHECKPOINT_SECONDS
+from gridworld.contraction import contraction_report, speeder_heavy_grid
 from gridworld.costs import Costs
 from gridworld.direction import Direction
+from gridworld.dp_solver import DPSolver
+from gridworld.evolution_solver import DEFAULT_POPULATION, MIN_POPULATION
+from gridworld.feasibility import find_infeasibility
 from gridworld.grid import Grid
 from gridworld.game import Game
+from gridworld.hierarchical_solver import DEFAULT_PORTALS, DEFAULT_TILE_SIZE
+from gridworld.ida_solver import DEFAULT_TABLE_SIZE
+from gridworld.positions import side_positions
+from gridworld.solve_cache import SolveCache
+from gridworld.solvers import (
+    SOLVERS,
+    SolverEngine,
+    SolverOptions,
+    answer_options,
+    make_solver,
+)
+from gridworld.sweep import SweepCase, sweep
 from gridworld.wellness_solver import WellnessSolver
 
 
@@ -26,6 +58,21 @@ def two_dimensions(dim_str: str) -> Tuple[int, int]:
     return m, n
 
 
+GRID_SIDES = {
+    "top": Direction.UP,
+    "bottom": Direction.DOWN,
+    "left": Direction.LEFT,
+    "right": Direction.RIGHT,
+}
+
+
+def grid_side(side_str: str) -> Direction:
+    side = GRID_SIDES.get(side_str.strip().lower())
+    if side is None:
+        raise ValueError(f"invalid side: {side_str!r}")
+    return side
+
+
 def _some_game(dims=(2, 3), grid_str=None):
     start = (0, 0)
     if grid_str is None:
@@ -78,6 +125,38 @@ def gather_game_from_args(args) -> Game:
         return _some_game(grid_str=grid_str)
 
 
+def solver_options_from_args(
+    args,
+    starts: Optional[Sequence[Tuple[int, int]]] = None,
+    goals: Optional[Sequence[Tuple[int, int]]] = None,
+) -> SolverOptions:
+    return SolverOptions(
+        beam_width=args.beam_width,
+        tile_size=args.tile_size,
+        portals=args.portals,
+        table_size=args.table_size,
+        contract=args.contract,
+        memory_limit=args.memory_limit,
+        spill_dir=args.spill_dir,
+        checkpoint=args.checkpoint,
+        checkpoint_seconds=args.checkpoint_seconds,
+        starts=starts,
+        goals=goals,
+        workers=args.workers,
+        population=args.population,
+        seed=args.seed,
+    )
+
+
+def show_cache_counts(cache: Optional[SolveCache]) -> None:
+    # On stderr, to keep stdout to one JSON record per line.
+    if cache is not None:
+        print(
+            f"cache: hits={cache.hits}, misses={cache.misses}",
+            file=sys.stderr,
+        )
+
+
 def ruler(s: str, pos: Tuple[int, int]) -> str:
     rows = s.split("\n")
     # m = len(rows)
@@ -106,6 +185,10 @@ class ServerMode(StrEnum):
 
 
 WEB_PATH = os.path.join("gridworld", "web.py")
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "data", "grids")
+CONTRACTION_REPORT_SEEDS = 5
+QUEUE_BENCHMARK_SEEDS = 3
+QUEUE_BENCHMARK_DIMENSIONS = (200, 200)
 
 
 def run_web_server(port: int = 8000, server_mode: ServerMode = ServerMode.DEV):
@@ -226,18 +309,475 @@ def main():
         default="dev",
         help=f"server mode {sorted(m.name.lower() for m in ServerMode)}",
     )
+    parser.add_argument(
+        "--solver",
+        dest="solver",
+        type=str,
+        required=False,
+        default=SolverEngine.PARETO,
+        help=f"solver engine {sorted(SOLVERS)}",
+    )
+    parser.add_argument(
+        "--cache",
+        dest="cache",
+        type=str,
+        required=False,
+        help="sqlite file caching solve results",
+    )
+    parser.add_argument(
+        "--batch",
+        dest="batch",
+        type=str,
+        required=False,
+        help="directory or glob of grid files to solve in parallel",
+    )
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        required=False,
+        help=(
+            "worker processes for --batch, --sweep or the strip solver"
+            " (default: CPU count)"
+        ),
+    )
+    parser.add_argument(
+        "--chunksize",
+        dest="chunksize",
+        type=int,
+        required=False,
+        default=DEFAULT_CHUNKSIZE,
+        help="grid files or sweep cases handed to a worker at a time",
+    )
+    parser.add_argument(
+        "--sweep",
+        dest="sweep",
+        type=str,
+        required=False,
+        help=(
+            "file of JSON cases, one per line, of costs, health and moves"
+            " to solve the grid under in parallel"
+        ),
+    )
+    parser.add_argument(
+        "--deadline",
+        dest="deadline",
+        type=float,
+        required=False,
+        help="seconds to solve for before taking the best path found",
+    )
+    parser.add_argument(
+        "--max-expanded",
+        dest="max_expanded",
+        type=int,
+        required=False,
+        help="states to expand before taking the best path found",
+    )
+    parser.add_argument(
+        "--stats",
+        dest="stats",
+        type=str,
+        required=False,
+        help="file to write solver stats to as JSON ('-' for stdout)",
+    )
+    parser.add_argument(
+        "--beam-width",
+        dest="beam_width",
+        type=int,
+        required=False,
+        default=DEFAULT_BEAM_WIDTH,
+        help="states the beam solver keeps per depth",
+    )
+    parser.add_argument(
+        "--beam-gap",
+        dest="beam_gap",
+        action="store_true",
+        help=(
+            "report how far beam answers fall short of exact ones"
+            " over --batch grids (default: bundled grids)"
+        ),
+    )
+    parser.add_argument(
+        "--tile-size",
+        dest="tile_size",
+        type=int,
+        required=False,
+        default=DEFAULT_TILE_SIZE,
+        help="side of the tiles the hierarchical solver cuts the grid into",
+    )
+    parser.add_argument(
+        "--portals",
+        dest="portals",
+        type=int,
+        required=False,
+        default=DEFAULT_PORTALS,
+        help="crossing points per tile side for the hierarchical solver",
+    )
+    parser.add_argument(
+        "--table-size",
+        dest="table_size",
+        type=int,
+        required=False,
+        default=DEFAULT_TABLE_SIZE,
+        help="states the idastar solver's transposition table holds",
+    )
+    parser.add_argument(
+        "--population",
+        dest="population",
+        type=int,
+        required=False,
+        default=DEFAULT_POPULATION,
+        help="paths the evolution solver breeds per generation",
+    )
+    parser.add_argument(
+        "--seed",
+        dest="seed",
+        type=int,
+        required=False,
+        help="random seed for the evolution solver (default: unseeded)",
+    )
+    parser.add_argument(
+        "--contract",
+        dest="contract",
+        action="store_true",
+        help=(
+            "have the pareto solver cross zero-move regions in one step;"
+            " same answers, but measured 0.7x-1.0x the speed of plain"
+            " search on speeder-heavy grids, so off by default"
+        ),
+    )
+    parser.add_argument(
+        "--contraction-report",
+        dest="contraction_report",
+        action="store_true",
+        help=(
+            "report contraction node reduction and speedup"
+            " on speeder-heavy random grids of --dimensions"
+        ),
+    )
+    parser.add_argument(
+        "--queue-benchmark",
+        dest="queue_benchmark",
+        action="store_true",
+        help=(
+            "time lower-bound searches on heapq against a bucket queue"
+            " over --batch grids (default: bundled grids) and random 200x200"
+        ),
+    )
+    parser.add_argument(
+        "--benchmark",
+        dest="benchmark",
+        type=str,
+        required=False,
+        help=(
+            "JSON file to record every solver engine's time, peak memory"
+            " and wellness to, over --batch grids (default: bundled grids)"
+            " and random grids of sides"
+            f" {', '.join(str(s) for s in BENCHMARK_SIDES)}"
+        ),
+    )
+    parser.add_argument(
+        "--baseline",
+        dest="baseline",
+        type=str,
+        required=False,
+        help="JSON file of an earlier --benchmark to flag regressions against",
+    )
+    parser.add_argument(
+        "--start-side",
+        dest="start_side",
+        type=grid_side,
+        required=False,
+        help=f"start from any cell on a side of the grid {sorted(GRID_SIDES)}",
+    )
+    parser.add_argument(
+        "--goal-side",
+        dest="goal_side",
+        type=grid_side,
+        required=False,
+        help=f"finish on any cell on a side of the grid {sorted(GRID_SIDES)}",
+    )
+    parser.add_argument(
+        "--heatmap",
+        dest="heatmap",
+        action="store_true",
+        help="show the best wellness reachable on every cell of the grid",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        dest="memory_limit",
+        type=int,
+        required=False,
+        help="bytes of bfs queue and tables to hold before spilling to disk",
+    )
+    parser.add_argument(
+        "--spill-dir",
+        dest="spill_dir",
+        type=str,
+        required=False,
+        help="directory for bfs spill files (default: system temp dir)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        dest="checkpoint",
+        type=str,
+        required=False,
+        help="file to checkpoint a bfs solve to",
+    )
+    parser.add_argument(
+        "--checkpoint-seconds",
+        dest="checkpoint_seconds",
+        type=float,
+        required=False,
+        default=DEFAULT_CHECKPOINT_SECONDS,
+        help="seconds between bfs checkpoints",
+    )
+    parser.add_argument(
+        "--resume",
+        dest="resume",
+        type=str,
+        required=False,
+        help="checkpoint file of a bfs solve to continue",
+    )
     args = parser.parse_args()
+    if args.solver not in SOLVERS:
+        parser.error(f"unknown solver engine: {args.solver!r}")
+    if args.baseline is not None and args.benchmark is None:
+        parser.error("--baseline needs --benchmark")
+    if args.beam_width <= 0:
+        parser.error(f"non-positive beam width: {args.beam_width}")
+    if args.tile_size <= 0:
+        parser.error(f"non-positive tile size: {args.tile_size}")
+    if args.portals <= 0:
+        parser.error(f"non-positive portals: {args.portals}")
+    if args.population < MIN_POPULATION:
+        parser.error(f"population below {MIN_POPULATION}: {args.population}")
+    if args.table_size < 0:
+        parser.error(f"negative table size: {args.table_size}")
+    if args.memory_limit is not None and args.memory_limit <= 0:
+        parser.error(f"non-positive memory limit: {args.memory_limit}")
+    if args.checkpoint_seconds <= 0:
+        parser.error(
+            f"non-positive checkpoint seconds: {args.checkpoint_seconds}"
+        )
+    if args.resume is not None:
+        # Only the bfs solver checkpoints.
+        args.solver = SolverEngine.BFS
+        if args.cache is not None or args.batch is not None:
+            parser.error("--resume cannot be combined with --cache or --batch")
+    elif args.solver != SolverEngine.BFS and (
+        args.memory_limit is not None
+        or args.spill_dir is not None
+        or args.checkpoint is not None
+    ):
+        parser.error(
+            "--memory-limit, --spill-dir and --checkpoint need --solver=bfs"
+        )
+    if (
+        args.cache is not None
+        and args.solver == SolverEngine.EVOLUTION
+        and args.seed is None
+    ):
+        # Unseeded runs give different answers, so none can be reused.
+        parser.error("--cache with --solver=evolution needs --seed")
+    if args.solver == SolverEngine.STRIP and (
+        args.batch is not None or args.sweep is not None
+    ):
+        # Pool workers may not start processes of their own.
+        parser.error(
+            "--solver=strip cannot be combined with --batch or --sweep"
+        )
+    if args.sweep is not None and args.batch is not None:
+        parser.error("--sweep cannot be combined with --batch")
+    if args.start_side is not None or args.goal_side is not None:
+        if args.solver != SolverEngine.PARETO:
+            parser.error("--start-side and --goal-side need --solver=pareto")
+        if args.cache is not None or args.batch is not None:
+            parser.error(
+                "--start-side and --goal-side cannot be combined with"
+                " --cache or --batch"
+            )
+    budget = None
+    if args.deadline is not None or args.max_expanded is not None:
+        if not SOLVERS[args.solver].anytime:
+            anytime = sorted(e.name for e in SOLVERS.values() if e.anytime)
+            parser.error(
+                f"--deadline and --max-expanded need a solver in {anytime}"
+            )
+        if args.cache is not None:
+            parser.error("--cache cannot be combined with a solve budget")
+        if args.batch is not None or args.sweep is not None:
+            parser.error(
+                "--batch and --sweep cannot be combined with a solve budget"
+            )
+        try:
+            budget = Budget(args.deadline, args.max_expanded)
+        except ValueError as e:
+            parser.error(str(e))
     mode = args.mode
     # print(f"mode: {mode!r}")
     match mode:
-        case Mode.SOLVE:
+        case Mode.SOLVE if args.beam_gap:
+            paths = grid_paths(args.batch or GRIDS_DIR)
+            for gap in gap_report(paths, args.beam_width):
+                print(gap.to_json_str(), flush=True)
+        case Mode.SOLVE if args.contraction_report:
+            for seed in range(CONTRACTION_REPORT_SEEDS):
+                grid = speeder_heavy_grid(args.dimensions, 0.6, Random(seed))
+                report = contraction_report(Game.from_grid(grid))
+                print(report.to_json_str(), flush=True)
+        case Mode.SOLVE if args.queue_benchmark:
+            for path in grid_paths(args.batch or GRIDS_DIR):
+                with open(path) as f:
+                    grid = Grid.from_str(f.read())
+                bench = queue_benchmark(path, Game.from_grid(grid))
+                print(bench.to_json_str(), flush=True)
+            for seed in range(QUEUE_BENCHMARK_SEEDS):
+                grid = Grid.random(QUEUE_BENCHMARK_DIMENSIONS, Random(seed))
+                bench = queue_benchmark(f"random:{seed}", Game.from_grid(grid))
+                print(bench.to_json_str(), flush=True)
+        case Mode.SOLVE if args.benchmark is not None:
+            baseline = None
+            if args.baseline is not None:
+                baseline = load_benchmark(args.baseline)
+            games = benchmark_games(args.batch or GRIDS_DIR)
+            records = []
+            for record in run_benchmark(games):
+                print(record.to_json_str(), flush=True)
+                records.append(record)
+            save_benchmark(args.benchmark, records)
+            if baseline is not None:
+                regressions = compare_benchmarks(records, baseline)
+                for regression in regressions:
+                    print(regression)
+                print(f"regressions: {len(regressions)}")
+                if regressions:
+                    raise SystemExit(1)
+        case Mode.SOLVE if args.heatmap:
             g = gather_game_from_args(args)
             show_costs(g.costs)
             print(g.grid)
+            t0 = time.perf_counter()
+            heatmap = DPSolver(g).solve_all()
+            print(f"elapsed time: {time.perf_counter() - t0:0.4f}")
+            print("best wellness by tenths (0-9), '-' out of reach:")
+            print(heatmap.render())
+            reachable = int(heatmap.reachable.sum())
+            print(f"reachable: {reachable} of {len(g.grid)} cells")
+        case Mode.SOLVE if args.sweep is not None:
+            with open(args.sweep) as f:
+                try:
+                    cases = [
+                        SweepCase.from_json_str(line)
+                        for line in f
+                        if line.strip()
+                    ]
+                except (KeyError, ValueError) as e:
+                    parser.error(f"invalid case in {args.sweep}: {e}")
+            if not cases:
+                parser.error(f"no cases in {args.sweep}")
+            cache = None if args.cache is None else SolveCache(args.cache)
+            for record in sweep(
+                gather_game_from_args(args).grid,
+                cases,
+                engine=args.solver,
+                workers=args.workers,
+                chunksize=args.chunksize,
+                options=solver_options_from_args(args),
+                cache=cache,
+            ):
+                print(record.to_json_str(), flush=True)
+            show_cache_counts(cache)
+        case Mode.SOLVE if args.batch is not None:
+            cache = None if args.cache is None else SolveCache(args.cache)
+            for record in solve_batch(
+                grid_paths(args.batch),
+                engine=args.solver,
+                workers=args.workers,
+                chunksize=args.chunksize,
+                options=solver_options_from_args(args),
+                cache=cache,
+            ):
+                print(record.to_json_str(), flush=True)
+            show_cache_counts(cache)
+        case Mode.SOLVE:
+            if args.resume is not None:
+                try:
+                    sv = WellnessSolver.resume(
+                        args.resume,
+                        memory_limit=args.memory_limit,
+                        spill_dir=args.spill_dir,
+                        checkpoint=args.checkpoint,
+                        checkpoint_seconds=args.checkpoint_seconds,
+                    )
+                except ValueError as e:
+                    parser.error(str(e))
+                g = sv.game
+            else:
+                g = gather_game_from_args(args)
+            show_costs(g.costs)
+            print(g.grid)
+            starts = goals = None
+            if args.start_side is not None:
+                starts = side_positions(
+                    dimensions=g.grid.dimensions, side=args.start_side
+                )
+            if args.goal_side is not None:
+                goals = side_positions(
+                    dimensions=g.grid.dimensions, side=args.goal_side
+                )
+            if args.resume is None and starts is None and goals is None:
+                # Rule out hopeless grids before searching them.
+                infeasible = find_infeasibility(g)
+                if infeasible is not None:
+                    print(infeasible)
+                    print(None)
+                    return
             tracemalloc.start()
-            sv = WellnessSolver(g)
-            got = sv.solve()
+            options = solver_options_from_args(args, starts, goals)
+            if args.resume is None:
+                sv = make_solver(args.solver, g, **vars(options))
+            t0 = time.perf_counter()
+            if budget is not None:
+
+                def report(ta):
+                    dt = time.perf_counter() - t0
+                    print(
+                        f"improved at {dt:0.4f}:"
+                        f" health={ta.agent.health}, moves={ta.agent.moves}",
+                        flush=True,
+                    )
+
+                got = sv.solve(budget=budget, on_improve=report)
+            elif args.cache is None:
+                got = sv.solve()
+            else:
+                cache = SolveCache(args.cache)
+                got = cache.solve(
+                    g,
+                    args.solver,
+                    sv.solve,
+                    answer_options(args.solver, options),
+                )
+                print(f"cache: hits={cache.hits}, misses={cache.misses}")
+            print(f"elapsed time: {time.perf_counter() - t0:0.4f}")
+            if args.solver == SolverEngine.EVOLUTION and budget is None:
+                for seconds, generation, wellness in sv.history:
+                    print(
+                        f"improved at {seconds:0.4f}:"
+                        f" generation={generation}, wellness={wellness:0.4f}"
+                    )
             print(got)
+            if got is not None and (starts or goals):
+                print(f"start: {got.path[0]}, goal: {got.path[-1]}")
+            print(f"expanded: {sv.expanded}")
+            if budget is not None and not sv.complete:
+                print("budget ran out: path may not be optimal")
+            if args.stats == "-":
+                print(sv.stats.to_json_str())
+            elif args.stats is not None:
+                with open(args.stats, "w") as f:
+                    f.write(sv.stats.to_json_str() + "\n")
             mem_pair = tracemalloc.get_traced_memory()
             print(mem_pair)
             print([humansized(i) for i in mem_pair])
@@ -0,0 +1,188 @@
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from gridworld.adjacency import Edge
+from gridworld.agent import Agent
+from gridworld.anytime import Budget
+from gridworld.contraction import ContractedGraph
+from gridworld.game import Game
+from gridworld.labels import (
+    Label,
+    best_label,
+    cell_of,
+    check_costs,
+    insert_label,
+    position_of,
+)
+from gridworld.positions import is_valid_at
+from gridworld.solver_stats import SolverStats
+from gridworld.wellness_solver import TravelingAgent
+
+
+@dataclass
+class ParetoSolver:
+    """
+    Multi-criteria label-setting search over agent (health, moves).
+
+    Each cell keeps the set of its non-dominated labels.  Labels are
+    expanded best first in lexicographic (health, moves) order; since costs
+    never increase resources, no label found later can dominate one already
+    expanded, so every expanded label is final.
+
+    With contract, the search runs over a ContractedGraph of the grid,
+    crossing components of zero-move terrain in single steps.  It finds
+    the same answers but is seldom faster, so it is off by default.
+
+    starts and goals, if given, replace the agent's position and the
+    game's goal with sets of cells, such as whole sides of the grid.  One
+    search seeds a root label on every start, each with the agent's
+    vitals, and returns the best path from any start to any goal.
+    """
+
+    game: Game
+    contract: bool = False
+    starts: Optional[Sequence[Tuple[int, int]]] = None
+    goals: Optional[Sequence[Tuple[int, int]]] = None
+    expanded: int = field(default=0, init=False)
+    # False if the last solve() stopped early on its budget.
+    complete: bool = field(default=False, init=False)
+    stats: SolverStats = field(default_factory=SolverStats, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.game, Game):
+            raise ValueError(f"invalid game: {self.game!r}")
+        check_costs(self.game.costs)
+        dims = self.game.grid.dimensions
+        for kind, positions in (("start", self.starts), ("goal", self.goals)):
+            if positions is None:
+                continue
+            if not positions:
+                raise ValueError(f"no {kind}s: {positions!r}")
+            for r, c in positions:
+                if not is_valid_at(dimensions=dims, position=(r, c)):
+                    raise ValueError(f"invalid {kind}: {(r, c)!r}")
+
+    def solve(
+        self,
+        budget: Optional[Budget] = None,
+        on_improve: Optional[Callable[[TravelingAgent], None]] = None,
+    ) -> Optional[TravelingAgent]:
+        """
+        Returns the best path to the goal, or None if there is none.
+
+        With a budget, returns the best path found before the budget ran
+        out, which may be suboptimal or None.  on_improve is called with
+        each path that beats every earlier one.
+        """
+        stats = self.stats = SolverStats()
+        t0 = time.perf_counter()
+        game = self.game
+        dims = game.grid.dimensions
+        agent = game.agent
+        self.expanded = 0
+        self.complete = False
+        if agent.is_dead():
+            self.complete = True
+            return None
+        if budget is not None:
+            budget.start()
+        goals = sorted(
+            {cell_of(pos, dims) for pos in self.goals or (game.goal_position,)}
+        )
+        is_goal = bytearray(len(game.grid))
+        for cell in goals:
+            is_goal[cell] = 1
+        roots = [
+            Label(cell, agent.health, agent.moves)
+            for cell in sorted(
+                {
+                    cell_of(pos, dims)
+                    for pos in self.starts or (agent.position,)
+                }
+            )
+        ]
+        graph = None
+        if self.contract:
+            graph = ContractedGraph(
+                game.grid,
+                game.costs,
+                keep=[root.cell for root in roots] + goals,
+            )
+            steps = graph.steps
+        else:
+            edges = game.grid.compile(game.costs).steps
+
+            def steps(u: int) -> Tuple[Edge, ...]:
+                return edges[u]
+
+        def traveling_agent(label: Label) -> TravelingAgent:
+            if graph is None:
+                return TravelingAgent.from_label(label, agent, dims)
+            path = [position_of(c, dims) for c in graph.expand(label.cells())]
+            return TravelingAgent(
+                agent=Agent(
+                    position=path[-1],
+                    health=label.health,
+                    max_health=agent.max_health,
+                    moves=label.moves,
+                    max_moves=agent.max_moves,
+                ),
+                path=path,
+            )
+
+        fronts: List[List[Label]] = [[] for _ in range(len(game.grid))]
+        queue: List[Tuple[int, int, int, Label]] = []
+        for seq, root in enumerate(roots):
+            fronts[root.cell].append(root)
+            queue.append((-root.health, -root.moves, seq, root))
+        seq = len(roots)
+        incumbent = 0
+        live = stats.peak_queue = stats.peak_live = len(roots)
+        t1 = time.perf_counter()
+        stats.setup_time = t1 - t0
+        while queue:
+            if budget is not None and budget.is_exhausted(self.expanded):
+                break
+            label = heapq.heappop(queue)[3]
+            stats.popped += 1
+            if label.dead or is_goal[label.cell]:
+                continue
+            self.expanded += 1
+            for cell, health_cost, move_cost in steps(label.cell):
+                health = label.health + health_cost
+                moves = label.moves + move_cost
+                if health <= 0 or moves <= 0:
+                    continue
+                new_label = Label(
+                    cell, health, moves, parent=label, steps=label.steps + 1
+                )
+                front = fronts[cell]
+                before = len(front)
+                if not insert_label(front, new_label):
+                    stats.pruned += 1
+                else:
+                    stats.pruned += before + 1 - len(front)
+                    live += len(front) - before
+                    seq += 1
+                    heapq.heappush(queue, (-health, -moves, seq, new_label))
+                    if (
+                        is_goal[cell]
+                        and on_improve is not None
+                        and health * moves > incumbent
+                    ):
+                        incumbent = health * moves
+                        on_improve(traveling_agent(new_label))
+            stats.peak_queue = max(stats.peak_queue, len(queue))
+            stats.peak_live = max(stats.peak_live, live)
+        else:
+            self.complete = True
+        t2 = time.perf_counter()
+        stats.search_time = t2 - t1
+        best = best_label([b for cell in goals for b in fronts[cell]])
+        got = None
+        if best is not None:
+            got = traveling_agent(best)
+        stats.reconstruct_time = time.perf_counter() - t2
+        return got
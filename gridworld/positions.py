@@ -55,3 +55,23 @@ def valid_directions_from(
         (d, translate_along(position=position, direction=d)) for d in dirs
     ]
     return {d for d, p in dir_pos if p in hood}
+
+
+@cache
+def side_positions(
+    *, dimensions: Tuple[int, int], side: Direction
+) -> Tuple[Tuple[int, int], ...]:
+    """
+    Returns the positions along one side of a grid: the top row for UP,
+    the left column for LEFT, and so on.
+    """
+    m, n = dimensions
+    if side == Direction.UP:
+        return tuple((0, c) for c in range(n))
+    if side == Direction.DOWN:
+        return tuple((m - 1, c) for c in range(n))
+    if side == Direction.LEFT:
+        return tuple((r, 0) for r in range(m))
+    if side == Direction.RIGHT:
+        return tuple((r, n - 1) for r in range(m))
+    raise ValueError(f"invalid side: {side!r}")
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional
+
+from gridworld.game import Game
+from gridworld.terrain import Terrain
+from gridworld.wellness_solver import TravelingAgent
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+def solve_key(
+    game: Game, engine: str, options: Optional[Mapping[str, Any]] = None
+) -> str:
+    """
+    Returns a digest of everything a solve of game by engine depends on.
+
+    Covers grid dimensions and cells, cost tables, start and goal, the
+    agent's position, vitals and max budgets, and the engine options that
+    can change its answers; see solvers.answer_options().
+    """
+    agent = game.agent
+    costs = {
+        t.abbr: [game.costs.health_cost_of(t), game.costs.move_cost_of(t)]
+        for t in Terrain
+    }
+    header = {
+        "engine": engine,
+        "dimensions": game.grid.dimensions,
+        "costs": costs,
+        "start": game.start_position,
+        "goal": game.goal_position,
+        "agent": [
+            agent.position,
+            agent.health,
+            agent.max_health,
+            agent.moves,
+            agent.max_moves,
+        ],
+    }
+    if options:
+        header["options"] = dict(options)
+    h = hashlib.sha256()
+    h.update(json.dumps(header, sort_keys=True).encode())
+    h.update(bytes(game.grid.cells))
+    return h.hexdigest()
+
+
+class SolveCache:
+    """
+    SolveCache keeps solve results in a local sqlite file.
+
+    Entries are keyed by solve_key() and evicted least recently used first
+    once there are more than max_entries.  Unsolvable games are cached too.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str = ":memory:",
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        if max_entries <= 0:
+            raise ValueError(f"non-positive max_entries: {max_entries}")
+        self._db_path = str(db_path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        self.ensure_migrations()
+
+    def ensure_migrations(self):
+        create_solve_results_table_sql = r"""
+        CREATE TABLE IF NOT EXISTS solve_results (
+            key TEXT PRIMARY KEY
+          , result TEXT NOT NULL
+          , last_used INTEGER NOT NULL
+        )
+        """
+        create_last_used_index_sql = r"""
+        CREATE INDEX IF NOT EXISTS solve_results_last_used
+        ON solve_results (last_used)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(create_solve_results_table_sql)
+        cursor.execute(create_last_used_index_sql)
+        cursor.close()
+
+    def _touch_clock(self, cursor: sqlite3.Cursor) -> int:
+        select_clock_sql = r"""
+        SELECT COALESCE(MAX(last_used), 0) + 1 FROM solve_results
+        """
+        (clock,) = cursor.execute(select_clock_sql).fetchone()
+        return clock
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached result JSON for key, or None on a miss.
+
+        An unsolvable game is cached as the JSON string "null".
+        """
+        select_result_sql = r"""
+        SELECT result FROM solve_results WHERE key = ? LIMIT 1
+        """
+        touch_sql = r"""
+        UPDATE solve_results SET last_used = ? WHERE key = ?
+        """
+        cursor = self.conn.cursor()
+        got = cursor.execute(select_result_sql, (key,)).fetchone()
+        if got is None:
+            cursor.close()
+            self.misses += 1
+            return None
+        cursor.execute(touch_sql, (self._touch_clock(cursor), key))
+        self.conn.commit()
+        cursor.close()
+        self.hits += 1
+        return got[0]
+
+    def put(self, key: str, result: Optional[TravelingAgent]) -> None:
+        upsert_sql = r"""
+        INSERT INTO solve_results (key, result, last_used) VALUES (?, ?, ?)
+        ON CONFLICT (key) DO UPDATE SET
+            result = excluded.result
+          , last_used = excluded.last_used
+        """
+        evict_sql = r"""
+        DELETE FROM solve_results WHERE key IN (
+            SELECT key FROM solve_results
+            ORDER BY last_used DESC LIMIT -1 OFFSET ?
+        )
+        """
+        data = "null" if result is None else result.to_json_str()
+        cursor = self.conn.cursor()
+        cursor.execute(upsert_sql, (key, data, self._touch_clock(cursor)))
+        cursor.execute(evict_sql, (self.max_entries,))
+        self.conn.commit()
+        cursor.close()
+
+    def solve(
+        self,
+        game: Game,
+        engine: str,
+        solve: Callable[[], Optional[TravelingAgent]],
+        options: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[TravelingAgent]:
+        """
+        Returns the cached result for game, engine and engine options,
+        calling solve() and caching its result on a miss.
+        """
+        key = solve_key(game, engine, options)
+        data = self.get(key)
+        if data is not None:
+            if data == "null":
+                return None
+            return TravelingAgent.from_json_str(data)
+        result = solve()
+        self.put(key, result)
+        return result
+
+    def __len__(self) -> int:
+        count_sql = r"""
+        SELECT COUNT(*) FROM solve_results
+        """
+        cursor = self.conn.cursor()
+        (count,) = cursor.execute(count_sql).fetchone()
+        cursor.close()
+        return count
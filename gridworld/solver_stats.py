@@ -0,0 +1,29 @@
+import json
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class SolverStats:
+    """
+    SolverStats records what one solve() did.
+
+    popped counts states taken off the queue, including stale ones that
+    are then skipped.  pruned counts states dropped because another state
+    dominated them, and duplicates counts states skipped as already seen.
+    peak_live is the most search states held at once: live StateStore
+    slots for the breadth-first solver, labels on the Pareto fronts for
+    label-setting solvers, and reached table entries for the DP solver.
+    Times are in seconds.
+    """
+
+    popped: int = 0
+    pruned: int = 0
+    duplicates: int = 0
+    peak_queue: int = 0
+    peak_live: int = 0
+    setup_time: float = 0.0
+    search_time: float = 0.0
+    reconstruct_time: float = 0.0
+
+    def to_json_str(self) -> str:
+        return json.dumps(asdict(self))
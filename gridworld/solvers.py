@@ -0,0 +1,231 @@
+from dataclasses import dataclass, fields
+from enum import StrEnum
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from gridworld.astar_solver import AStarSolver
+from gridworld.beam_solver import DEFAULT_BEAM_WIDTH, BeamSolver
+from gridworld.bidirectional_solver import BidirectionalSolver
+from gridworld.checkpoint import DEFAULT_CHECKPOINT_SECONDS
+from gridworld.dp_solver import DPSolver
+from gridworld.evolution_solver import DEFAULT_POPULATION, EvolutionSolver
+from gridworld.game import Game
+from gridworld.hierarchical_solver import (
+    DEFAULT_PORTALS,
+    DEFAULT_TILE_SIZE,
+    HierarchicalSolver,
+)
+from gridworld.ida_solver import DEFAULT_TABLE_SIZE, IDAStarSolver
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.strip_solver import StripSolver
+from gridworld.wellness_solver import WellnessSolver
+
+
+class SolverEngine(StrEnum):
+    ASTAR = "astar"
+    BEAM = "beam"
+    BFS = "bfs"
+    BIDIRECTIONAL = "bidirectional"
+    DP = "dp"
+    EVOLUTION = "evolution"
+    HIERARCHICAL = "hierarchical"
+    IDASTAR = "idastar"
+    PARETO = "pareto"
+    STRIP = "strip"
+
+
+@dataclass
+class SolverOptions:
+    """
+    SolverOptions holds the settings make_solver() hands to every
+    engine's factory, each of which uses only those it needs.
+    """
+
+    beam_width: int = DEFAULT_BEAM_WIDTH
+    tile_size: int = DEFAULT_TILE_SIZE
+    portals: int = DEFAULT_PORTALS
+    table_size: int = DEFAULT_TABLE_SIZE
+    contract: bool = False
+    memory_limit: Optional[int] = None
+    spill_dir: Optional[str] = None
+    checkpoint: Optional[str] = None
+    checkpoint_seconds: float = DEFAULT_CHECKPOINT_SECONDS
+    starts: Optional[Sequence[Tuple[int, int]]] = None
+    goals: Optional[Sequence[Tuple[int, int]]] = None
+    workers: Optional[int] = None
+    population: int = DEFAULT_POPULATION
+    # Seeds the engines that draw random numbers.
+    seed: Optional[int] = None
+
+
+SolverFactory = Callable[[Game, SolverOptions], Any]
+
+
+@dataclass(frozen=True)
+class SolverEntry:
+    """
+    SolverEntry is a registered solver engine.
+
+    factory builds the engine's solver for a game.  anytime is True if
+    its solve() takes a Budget and an on_improve callback.
+    benchmark_cells is the most grid cells the benchmark runs the engine
+    on, or None for no limit.  options names the SolverOptions fields
+    that can change its answers, which solve caches key on.
+    """
+
+    name: str
+    factory: SolverFactory
+    anytime: bool = False
+    benchmark_cells: Optional[int] = None
+    options: Tuple[str, ...] = ()
+
+
+# Registered engines by name.
+SOLVERS: Dict[str, SolverEntry] = {}
+
+
+def register_solver(
+    name: str,
+    factory: SolverFactory,
+    anytime: bool = False,
+    benchmark_cells: Optional[int] = None,
+    options: Tuple[str, ...] = (),
+) -> SolverEntry:
+    """
+    Registers a solver engine under name, for make_solver(), --solver
+    and the benchmark.
+    """
+    if not name:
+        raise ValueError(f"invalid solver engine name: {name!r}")
+    if name in SOLVERS:
+        raise ValueError(f"duplicate solver engine: {name!r}")
+    if benchmark_cells is not None and benchmark_cells <= 0:
+        raise ValueError(f"non-positive benchmark_cells: {benchmark_cells}")
+    unknown = set(options) - {f.name for f in fields(SolverOptions)}
+    if unknown:
+        raise ValueError(f"unknown solver options: {sorted(unknown)}")
+    entry = SolverEntry(
+        str(name), factory, anytime, benchmark_cells, tuple(options)
+    )
+    SOLVERS[entry.name] = entry
+    return entry
+
+
+def solver_entry(engine: str) -> SolverEntry:
+    entry = SOLVERS.get(engine)
+    if entry is None:
+        raise ValueError(f"unknown solver engine: {engine!r}")
+    return entry
+
+
+def answer_options(engine: str, options: SolverOptions) -> Dict[str, Any]:
+    """
+    Returns the settings in options that can change engine's answers.
+    """
+    return {
+        name: getattr(options, name) for name in solver_entry(engine).options
+    }
+
+
+register_solver(SolverEngine.ASTAR, lambda game, o: AStarSolver(game))
+register_solver(
+    SolverEngine.BEAM,
+    lambda game, o: BeamSolver(game, width=o.beam_width),
+    benchmark_cells=2500,
+    options=("beam_width",),
+)
+register_solver(
+    SolverEngine.BFS,
+    lambda game, o: WellnessSolver(
+        game,
+        memory_limit=o.memory_limit,
+        spill_dir=o.spill_dir,
+        checkpoint=o.checkpoint,
+        checkpoint_seconds=o.checkpoint_seconds,
+    ),
+    anytime=True,
+    benchmark_cells=400,
+)
+register_solver(
+    SolverEngine.BIDIRECTIONAL, lambda game, o: BidirectionalSolver(game)
+)
+register_solver(
+    SolverEngine.DP, lambda game, o: DPSolver(game), benchmark_cells=2500
+)
+register_solver(
+    SolverEngine.EVOLUTION,
+    lambda game, o: EvolutionSolver(
+        game, population=o.population, seed=o.seed
+    ),
+    anytime=True,
+    benchmark_cells=10000,
+    options=("population", "seed"),
+)
+register_solver(
+    SolverEngine.HIERARCHICAL,
+    lambda game, o: HierarchicalSolver(
+        game, tile_size=o.tile_size, portals=o.portals
+    ),
+    benchmark_cells=10000,
+    options=("tile_size", "portals"),
+)
+register_solver(
+    SolverEngine.IDASTAR,
+    lambda game, o: IDAStarSolver(game, table_size=o.table_size),
+    benchmark_cells=10000,
+)
+register_solver(
+    SolverEngine.PARETO,
+    lambda game, o: ParetoSolver(
+        game, contract=o.contract, starts=o.starts, goals=o.goals
+    ),
+    anytime=True,
+    options=("contract", "starts", "goals"),
+)
+register_solver(
+    SolverEngine.STRIP,
+    lambda game, o: StripSolver(game, workers=o.workers),
+    benchmark_cells=10000,
+)
+
+# The built-in engines whose solve() takes a Budget and an on_improve
+# callback; see SolverEntry.anytime for all registered ones.
+ANYTIME_ENGINES = frozenset(
+    SolverEngine(e.name) for e in SOLVERS.values() if e.anytime
+)
+
+
+def make_solver(
+    engine: str,
+    game: Game,
+    beam_width: int = DEFAULT_BEAM_WIDTH,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    portals: int = DEFAULT_PORTALS,
+    table_size: int = DEFAULT_TABLE_SIZE,
+    contract: bool = False,
+    memory_limit: Optional[int] = None,
+    spill_dir: Optional[str] = None,
+    checkpoint: Optional[str] = None,
+    checkpoint_seconds: float = DEFAULT_CHECKPOINT_SECONDS,
+    starts: Optional[Sequence[Tuple[int, int]]] = None,
+    goals: Optional[Sequence[Tuple[int, int]]] = None,
+    workers: Optional[int] = None,
+    population: int = DEFAULT_POPULATION,
+    seed: Optional[int] = None,
+):
+    options = SolverOptions(
+        beam_width=beam_width,
+        tile_size=tile_size,
+        portals=portals,
+        table_size=table_size,
+        contract=contract,
+        memory_limit=memory_limit,
+        spill_dir=spill_dir,
+        checkpoint=checkpoint,
+        checkpoint_seconds=checkpoint_seconds,
+        starts=starts,
+        goals=goals,
+        workers=workers,
+        population=population,
+        seed=seed,
+    )
+    return solver_entry(engine).factory(game, options)
@@ -0,0 +1,128 @@
+import mmap
+import os
+import sqlite3
+import tempfile
+from array import array
+from typing import Iterator, Literal, Optional, Union
+
+# Entries of a spilled queue written to disk at a time.
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# A per-cell table, held in memory or mapped from disk.
+Table = Union[array, bytearray, memoryview]
+
+
+class SpillFile:
+    """
+    SpillFile holds the middle of a first-in first-out queue of ints in a
+    local sqlite file, for searches whose frontier outgrows memory.
+
+    A search appends to an in-memory tail and pops from an in-memory head;
+    once the two hold too many entries the tail is push()ed here as a
+    chunk, and the head is refilled by pop() before the tail is reached.
+    Without a directory the file is sqlite's own temporary file.  Either
+    way it is removed on close().
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._path = ""
+        if directory is not None:
+            fd, self._path = tempfile.mkstemp(
+                suffix=".sqlite", prefix="spill-", dir=directory
+            )
+            os.close(fd)
+        self.conn = sqlite3.connect(self._path, check_same_thread=False)
+        # Spilled chunks need not outlive a crash.
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.items = 0
+        self._chunks = 0
+        self.ensure_migrations()
+
+    def ensure_migrations(self):
+        create_chunks_table_sql = r"""
+        CREATE TABLE IF NOT EXISTS chunks (
+            seq INTEGER PRIMARY KEY
+          , data BLOB NOT NULL
+        )
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(create_chunks_table_sql)
+        self.conn.commit()
+
+    def push(self, chunk: array) -> None:
+        """
+        Appends chunk behind the chunks already spilled.
+        """
+        if not chunk:
+            return
+        self.conn.execute(
+            "INSERT INTO chunks (data) VALUES (?)", (chunk.tobytes(),)
+        )
+        self.items += len(chunk)
+        self._chunks += 1
+
+    def pop(self) -> Optional[array]:
+        """
+        Removes and returns the oldest chunk, or None if there is none.
+        """
+        row = self.conn.execute(
+            "SELECT seq, data FROM chunks ORDER BY seq LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        seq, data = row
+        self.conn.execute("DELETE FROM chunks WHERE seq = ?", (seq,))
+        chunk = array("i")
+        chunk.frombytes(data)
+        self.items -= len(chunk)
+        self._chunks -= 1
+        return chunk
+
+    def chunks(self) -> Iterator[array]:
+        """
+        Yields the spilled chunks oldest first, leaving them in place.
+        """
+        for (data,) in self.conn.execute(
+            "SELECT data FROM chunks ORDER BY seq"
+        ):
+            chunk = array("i")
+            chunk.frombytes(data)
+            yield chunk
+
+    def close(self) -> None:
+        self.conn.close()
+        if self._path:
+            os.remove(self._path)
+            self._path = ""
+
+    def __len__(self) -> int:
+        return self._chunks
+
+
+def mapped_table(
+    typecode: Literal["B", "i"],
+    count: int,
+    fill_byte: int = 0,
+    directory: Optional[str] = None,
+) -> memoryview:
+    """
+    Returns a table of count items of typecode, each byte set to
+    fill_byte, mapped from an unnamed temporary file in directory.
+
+    The file is gone once the table is dropped, and only the pages in use
+    need stay in memory.
+    """
+    if count < 0:
+        raise ValueError(f"negative count: {count}")
+    size = count * array(typecode).itemsize
+    with tempfile.TemporaryFile(dir=directory) as f:
+        # mmap rejects empty files.
+        f.truncate(max(size, 1))
+        mm = mmap.mmap(f.fileno(), max(size, 1))
+    if fill_byte:
+        block = bytes([fill_byte]) * min(size, DEFAULT_CHUNK_SIZE)
+        for i in range(0, size, len(block)):
+            j = min(i + len(block), size)
+            mm[i:j] = block[: j - i]
+    return memoryview(mm)[:size].cast(typecode)
@@ -0,0 +1,110 @@
+from array import array
+from typing import Dict, List
+
+
+class StateStore:
+    """
+    StateStore holds search states column-wise in typed arrays: the flat
+    cell index, health, moves and parent index of each state.
+
+    States are reference counted.  add() returns a state holding one
+    reference for its creator, and every state holds one on its parent.
+    Once release() drops a state's last reference its slot is reused, and
+    its parent is released in turn, so only states still reachable from
+    the search are kept.  Paths are rebuilt from parent indexes on demand.
+    """
+
+    NO_PARENT = -1
+
+    def __init__(self):
+        self.cell = array("i")
+        self.health = array("i")
+        self.moves = array("i")
+        self.parent = array("i")
+        self._refs = array("i")
+        self._free = array("i")
+        self.live = 0
+        self.peak_live = 0
+
+    def add(self, cell: int, health: int, moves: int, parent: int) -> int:
+        """
+        Returns the index of a new state with the given fields.
+        """
+        if parent != self.NO_PARENT:
+            self._refs[parent] += 1
+        if self._free:
+            s = self._free.pop()
+            self.cell[s] = cell
+            self.health[s] = health
+            self.moves[s] = moves
+            self.parent[s] = parent
+            self._refs[s] = 1
+        else:
+            s = len(self.cell)
+            self.cell.append(cell)
+            self.health.append(health)
+            self.moves.append(moves)
+            self.parent.append(parent)
+            self._refs.append(1)
+        self.live += 1
+        if self.live > self.peak_live:
+            self.peak_live = self.live
+        return s
+
+    def hold(self, s: int) -> None:
+        self._refs[s] += 1
+
+    def release(self, s: int) -> None:
+        refs = self._refs
+        while s != self.NO_PARENT:
+            refs[s] -= 1
+            if refs[s] > 0:
+                return
+            self._free.append(s)
+            self.live -= 1
+            s = self.parent[s]
+
+    def cells(self, s: int) -> List[int]:
+        """
+        Returns cells from the root state to state s, inclusive.
+        """
+        result = []
+        while s != self.NO_PARENT:
+            result.append(self.cell[s])
+            s = self.parent[s]
+        result.reverse()
+        return result
+
+    def columns(self) -> Dict[str, array]:
+        """
+        Returns the arrays holding the store, for saving it.
+        """
+        return {
+            "cell": self.cell,
+            "health": self.health,
+            "moves": self.moves,
+            "parent": self.parent,
+            "refs": self._refs,
+            "free": self._free,
+        }
+
+    @classmethod
+    def from_columns(
+        cls, columns: Dict[str, array], peak_live: int = 0
+    ) -> "StateStore":
+        """
+        Returns a store rebuilt from the arrays columns() returned.
+        """
+        store = cls()
+        store.cell = columns["cell"]
+        store.health = columns["health"]
+        store.moves = columns["moves"]
+        store.parent = columns["parent"]
+        store._refs = columns["refs"]
+        store._free = columns["free"]
+        store.live = len(store.cell) - len(store._free)
+        store.peak_live = max(peak_live, store.live)
+        return store
+
+    def __len__(self) -> int:
+        return self.live
@@ -0,0 +1,378 @@
+import heapq
+import os
+import time
+from dataclasses import dataclass, field
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+from gridworld.adjacency import Adjacency
+from gridworld.agent import Agent
+from gridworld.costs import Costs
+from gridworld.game import Game
+from gridworld.labels import (
+    Label,
+    best_label,
+    cell_of,
+    check_costs,
+    insert_label,
+    position_of,
+)
+from gridworld.solver_stats import SolverStats
+from gridworld.wellness_solver import TravelingAgent
+
+# Width, in health plus moves, of the bands searched between exchanges.
+DEFAULT_BAND = 64
+
+# The strip a root label came from: none, it is the agent's start.
+NO_ORIGIN = -1
+
+# A label stepping into a neighboring strip: its cell, health, moves and
+# steps, then the strip it left and the index there of its parent among
+# that strip's exports, or NO_ORIGIN twice.
+Crossing = Tuple[int, int, int, int, int, int]
+
+# Counts a strip returns after each round: expanded, popped, pruned, its
+# peak queue length, and its live labels.
+Counts = Tuple[int, int, int, int, int]
+
+
+class _Strip:
+    """
+    _Strip is the search one worker runs over rows [lo, hi) of a grid.
+
+    Labels stepping out of the strip are not kept but returned as
+    Crossings, for the neighboring strip to run() next round.  The strip
+    keeps what it has sent to each outside cell, so it never sends a label
+    dominated by one sent before.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        dimensions: Tuple[int, int],
+        rows: Tuple[int, int],
+        cells: bytes,
+        costs: Costs,
+        goal: int,
+    ):
+        # cells covers rows [lo - 1, hi + 1) clipped to the grid, so that
+        # steps out of the strip are costed.
+        m, n = dimensions
+        lo, hi = rows
+        top = max(lo - 1, 0)
+        bottom = min(hi + 1, m)
+        adjacency = Adjacency.compile((bottom - top, n), cells, costs)
+        offset = top * n
+        self.index = index
+        self.base = lo * n
+        self.end = hi * n
+        self.goal = goal
+        first, last = self.base - offset, self.end - offset
+        self.steps = [
+            tuple((v + offset, dh, dm) for v, dh, dm in edges)
+            for edges in adjacency.steps[first:last]
+        ]
+        self.fronts: List[List[Label]] = [
+            [] for _ in range(self.end - self.base)
+        ]
+        self.sent: Dict[int, List[Label]] = {}
+        self.queue: List[Tuple[int, int, int, Label]] = []
+        self.seq = 0
+        self.live = 0
+        self.pruned = 0
+        # Labels whose children crossed out, and the root labels that came
+        # in, with the (strip, export index) of their parents.
+        self.exports: List[Label] = []
+        self.origins: Dict[Label, Tuple[int, int]] = {}
+
+    def _push(self, label: Label) -> bool:
+        front = self.fronts[label.cell - self.base]
+        before = len(front)
+        if not insert_label(front, label):
+            self.pruned += 1
+            return False
+        self.pruned += before + 1 - len(front)
+        self.live += len(front) - before
+        self.seq += 1
+        heapq.heappush(
+            self.queue,
+            (-(label.health + label.moves), -label.health, self.seq, label),
+        )
+        return True
+
+    def run(
+        self, lo: int, crossings: List[Crossing]
+    ) -> Tuple[List[Crossing], List[Crossing], Optional[int], Counts]:
+        """
+        Takes in crossings, then expands queued labels whose health plus
+        moves is at least lo.
+
+        Returns the crossings out of the top and bottom of the strip, the
+        greatest health plus moves still queued (None if none), and counts.
+        """
+        self.pruned = 0
+        for cell, health, moves, steps, strip, i in crossings:
+            label = Label(cell, health, moves, steps=steps)
+            if self._push(label) and strip != NO_ORIGIN:
+                self.origins[label] = (strip, i)
+        queue = self.queue
+        base, end = self.base, self.end
+        up: List[Crossing] = []
+        down: List[Crossing] = []
+        expanded = popped = 0
+        peak_queue = len(queue)
+        while queue and -queue[0][0] >= lo:
+            label = heapq.heappop(queue)[3]
+            popped += 1
+            if label.dead or label.cell == self.goal:
+                continue
+            expanded += 1
+            exported = NO_ORIGIN
+            for cell, health_cost, move_cost in self.steps[label.cell - base]:
+                health = label.health + health_cost
+                moves = label.moves + move_cost
+                if health <= 0 or moves <= 0:
+                    continue
+                if base <= cell < end:
+                    self._push(
+                        Label(
+                            cell,
+                            health,
+                            moves,
+                            parent=label,
+                            steps=label.steps + 1,
+                        )
+                    )
+                    continue
+                sent = self.sent.setdefault(cell, [])
+                if not insert_label(sent, Label(cell, health, moves)):
+                    continue
+                if exported == NO_ORIGIN:
+                    exported = len(self.exports)
+                    self.exports.append(label)
+                crossing = (
+                    cell,
+                    health,
+                    moves,
+                    label.steps + 1,
+                    self.index,
+                    exported,
+                )
+                (up if cell < base else down).append(crossing)
+            peak_queue = max(peak_queue, len(queue))
+        top = -queue[0][0] if queue else None
+        counts = (expanded, popped, self.pruned, peak_queue, self.live)
+        return up, down, top, counts
+
+    def trace(self, label: Label) -> Tuple[List[int], Tuple[int, int]]:
+        """
+        Returns the cells from the strip's root label of label's path to
+        label, and where that root came from.
+        """
+        cells = label.cells()
+        root = label
+        while root.parent is not None:
+            root = root.parent
+        return cells, self.origins.get(root, (NO_ORIGIN, NO_ORIGIN))
+
+    def best(self) -> Optional[Tuple[int, int, List[int], Tuple[int, int]]]:
+        """
+        Returns the health, moves, cells and origin of the best label on
+        the goal, or None if the goal is elsewhere or unreached.
+        """
+        if not self.base <= self.goal < self.end:
+            return None
+        label = best_label(self.fronts[self.goal - self.base])
+        if label is None:
+            return None
+        return (label.health, label.moves, *self.trace(label))
+
+
+def _strip_worker(
+    conn: Connection,
+    index: int,
+    shm_name: str,
+    dimensions: Tuple[int, int],
+    rows: Tuple[int, int],
+    costs_str: str,
+    goal: int,
+) -> None:
+    # Copies its rows out of the shared grid, then answers commands until
+    # told to stop.  Costs come as JSON, since their mappings do not
+    # pickle for spawned processes.
+    m, n = dimensions
+    lo, hi = rows
+    shm = SharedMemory(name=shm_name)
+    try:
+        assert shm.buf is not None
+        first, last = max(lo - 1, 0) * n, min(hi + 1, m) * n
+        cells = bytes(shm.buf[first:last])
+    finally:
+        shm.close()
+    costs = Costs.from_json_str(costs_str)
+    strip = _Strip(index, dimensions, rows, cells, costs, goal)
+    while True:
+        command, *args = conn.recv()
+        match command:
+            case "run":
+                conn.send(strip.run(*args))
+            case "best":
+                conn.send(strip.best())
+            case "trace":
+                conn.send(strip.trace(strip.exports[args[0]]))
+            case "stop":
+                break
+    conn.close()
+
+
+@dataclass
+class StripSolver:
+    """
+    StripSolver runs a Pareto label search over one grid on several worker
+    processes, each owning a horizontal strip of rows.
+
+    The grid is handed over in shared memory.  Searches go in rounds:
+    every strip expands its labels in the current band of health plus
+    moves, then labels stepping into a neighboring strip are passed to it.
+    Once a band has no more crossings, every label in it is final, and the
+    next band starts.  Answers have the health and moves of ParetoSolver's.
+
+    workers defaults to the number of CPUs, and is capped at the number of
+    rows.
+    """
+
+    game: Game
+    workers: Optional[int] = None
+    band: int = DEFAULT_BAND
+    expanded: int = field(default=0, init=False)
+    # Exchanges between strips in the last solve().
+    rounds: int = field(default=0, init=False)
+    stats: SolverStats = field(default_factory=SolverStats, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.game, Game):
+            raise ValueError(f"invalid game: {self.game!r}")
+        check_costs(self.game.costs)
+        if self.workers is not None and self.workers <= 0:
+            raise ValueError(f"non-positive workers: {self.workers}")
+        if self.band <= 0:
+            raise ValueError(f"non-positive band: {self.band}")
+
+    def solve(self) -> Optional[TravelingAgent]:
+        """
+        Returns the best path to the goal, or None if there is none.
+        """
+        stats = self.stats = SolverStats()
+        t0 = time.perf_counter()
+        game = self.game
+        agent = game.agent
+        dims = m, n = game.grid.dimensions
+        self.expanded = 0
+        self.rounds = 0
+        if agent.is_dead():
+            return None
+        count = min(self.workers or os.cpu_count() or 1, m)
+        bounds = [(m * i // count, m * (i + 1) // count) for i in range(count)]
+        start = cell_of(agent.position, dims)
+        goal = cell_of(game.goal_position, dims)
+        shm = SharedMemory(create=True, size=m * n)
+        conns: List[Connection] = []
+        procs: List[Process] = []
+        try:
+            buf = shm.buf
+            assert buf is not None
+            buf[: m * n] = game.grid.cells.tobytes()
+            costs_str = game.costs.to_json_str()
+            for i, rows in enumerate(bounds):
+                conn, child = Pipe()
+                proc = Process(
+                    target=_strip_worker,
+                    args=(child, i, shm.name, dims, rows, costs_str, goal),
+                    daemon=True,
+                )
+                proc.start()
+                child.close()
+                conns.append(conn)
+                procs.append(proc)
+            # The strip of each row.
+            owner: List[int] = []
+            for i, (lo, hi) in enumerate(bounds):
+                owner += [i] * (hi - lo)
+            inboxes: List[List[Crossing]] = [[] for _ in bounds]
+            inboxes[owner[start // n]].append(
+                (start, agent.health, agent.moves, 0, NO_ORIGIN, NO_ORIGIN)
+            )
+            top: Optional[int] = agent.health + agent.moves
+            t1 = time.perf_counter()
+            stats.setup_time = t1 - t0
+            while top is not None:
+                lo = top - self.band + 1
+                for conn, inbox in zip(conns, inboxes):
+                    conn.send(("run", lo, inbox))
+                inboxes = [[] for _ in bounds]
+                crossed = False
+                tops = []
+                queued = live = 0
+                for i, conn in enumerate(conns):
+                    up, down, strip_top, counts = conn.recv()
+                    if up:
+                        inboxes[i - 1].extend(up)
+                        crossed = True
+                    if down:
+                        inboxes[i + 1].extend(down)
+                        crossed = True
+                    if strip_top is not None:
+                        tops.append(strip_top)
+                    expanded, popped, pruned, peak_queue, strip_live = counts
+                    self.expanded += expanded
+                    stats.popped += popped
+                    stats.pruned += pruned
+                    queued += peak_queue
+                    live += strip_live
+                self.rounds += 1
+                stats.peak_queue = max(stats.peak_queue, queued)
+                stats.peak_live = max(stats.peak_live, live)
+                if not crossed:
+                    # The band is final; on to the best label left.
+                    top = max(tops, default=None)
+            t2 = time.perf_counter()
+            stats.search_time = t2 - t1
+            conn = conns[owner[goal // n]]
+            conn.send(("best",))
+            best = conn.recv()
+            got = None
+            if best is not None:
+                health, moves, cells, origin = best
+                while origin[0] != NO_ORIGIN:
+                    conn = conns[origin[0]]
+                    conn.send(("trace", origin[1]))
+                    more, origin = conn.recv()
+                    cells = more + cells
+                path = [position_of(c, dims) for c in cells]
+                got = TravelingAgent(
+                    agent=Agent(
+                        position=path[-1],
+                        health=health,
+                        max_health=agent.max_health,
+                        moves=moves,
+                        max_moves=agent.max_moves,
+                    ),
+                    path=path,
+                )
+            stats.reconstruct_time = time.perf_counter() - t2
+            return got
+        finally:
+            for conn in conns:
+                try:
+                    conn.send(("stop",))
+                except OSError:
+                    pass
+                conn.close()
+            for proc in procs:
+                proc.join(timeout=5)
+                if proc.is_alive():
+                    proc.terminate()
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,241 @@
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from multiprocessing import Pool
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from gridworld.adjacency import topology
+from gridworld.agent import DEFAULT_HEALTH, DEFAULT_MOVES, Agent
+from gridworld.costs import Costs
+from gridworld.feasibility import find_infeasibility
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.solve_cache import SolveCache, solve_key
+from gridworld.solvers import (
+    SolverEngine,
+    SolverOptions,
+    answer_options,
+    make_solver,
+)
+from gridworld.wellness_solver import TravelingAgent
+
+DEFAULT_CHUNKSIZE = 1
+
+
+@dataclass
+class SweepCase:
+    """
+    SweepCase is one variant of a sweep: a Costs table and the health and
+    moves the agent starts with, which are also its maximums.
+    """
+
+    costs: Costs = field(default_factory=Costs)
+    health: int = DEFAULT_HEALTH
+    moves: int = DEFAULT_MOVES
+
+    def __post_init__(self):
+        if self.health <= 0:
+            raise ValueError(f"non-positive health: {self.health}")
+        if self.moves <= 0:
+            raise ValueError(f"non-positive moves: {self.moves}")
+
+    @classmethod
+    def from_json_str(cls, json_str: str) -> "SweepCase":
+        # Every key is optional: {"costs": {...}, "health": h, "moves": m}.
+        m = json.loads(json_str)
+        costs = Costs()
+        if "costs" in m:
+            costs = Costs.from_json_str(json.dumps(m["costs"]))
+        return cls(
+            costs,
+            m.get("health", DEFAULT_HEALTH),
+            m.get("moves", DEFAULT_MOVES),
+        )
+
+
+@dataclass
+class SweepRecord:
+    # Index of the case in the sweep.
+    case: int
+    costs: Dict[str, Any]
+    max_health: int
+    max_moves: int
+    solvable: bool
+    health: Optional[int]
+    moves: Optional[int]
+    wellness: Optional[float]
+    steps: Optional[int]
+    expanded: int
+    elapsed: float
+    # The resource that proved the case unsolvable without a search.
+    infeasible: Optional[str] = None
+
+    def to_json_str(self) -> str:
+        return json.dumps(asdict(self))
+
+
+# The grid and solve settings every case in a worker shares, set once per
+# worker by _init_worker().
+_shared: Optional[
+    Tuple[Grid, Tuple[int, int], Tuple[int, int], SolverEngine, SolverOptions]
+] = None
+
+
+def _init_worker(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    engine: SolverEngine,
+    options: SolverOptions,
+) -> None:
+    global _shared
+    _shared = (grid, start, goal, engine, options)
+    topology(grid.dimensions)
+
+
+def _case_game(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    case: SweepCase,
+) -> Game:
+    return Game(
+        grid=grid,
+        agent=Agent(
+            start,
+            health=case.health,
+            max_health=case.health,
+            moves=case.moves,
+            max_moves=case.moves,
+        ),
+        start_position=start,
+        goal_position=goal,
+        costs=case.costs,
+    )
+
+
+def _record(
+    i: int,
+    case: SweepCase,
+    got: Optional[TravelingAgent],
+    expanded: int,
+    elapsed: float,
+) -> SweepRecord:
+    costs = json.loads(case.costs.to_json_str())
+    if got is None:
+        return SweepRecord(
+            i,
+            costs,
+            case.health,
+            case.moves,
+            False,
+            None,
+            None,
+            None,
+            None,
+            expanded,
+            elapsed,
+        )
+    return SweepRecord(
+        i,
+        costs,
+        case.health,
+        case.moves,
+        True,
+        got.agent.health,
+        got.agent.moves,
+        got.wellness,
+        len(got.path) - 1,
+        expanded,
+        elapsed,
+    )
+
+
+def _solve_case(
+    task: Tuple[int, str, int, int]
+) -> Tuple[SweepRecord, Optional[TravelingAgent]]:
+    # Costs go over as JSON, since their mappings do not pickle.  Also
+    # returns the solver's answer, for the caller to cache.
+    assert _shared is not None
+    grid, start, goal, engine, options = _shared
+    i, costs_str, health, moves = task
+    case = SweepCase(Costs.from_json_str(costs_str), health, moves)
+    game = _case_game(grid, start, goal, case)
+    t0 = time.perf_counter()
+    infeasible = find_infeasibility(game)
+    if infeasible is not None:
+        record = _record(i, case, None, 0, time.perf_counter() - t0)
+        record.infeasible = infeasible.resource
+        return record, None
+    sv = make_solver(engine, game, **vars(options))
+    got = sv.solve()
+    return _record(i, case, got, sv.expanded, time.perf_counter() - t0), got
+
+
+def sweep(
+    grid: Grid,
+    cases: Sequence[SweepCase],
+    engine: SolverEngine = SolverEngine.PARETO,
+    workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    start: Tuple[int, int] = (0, 0),
+    goal: Optional[Tuple[int, int]] = None,
+    options: Optional[SolverOptions] = None,
+    cache: Optional[SolveCache] = None,
+) -> List[SweepRecord]:
+    """
+    Solves one grid under every case across a pool of worker processes.
+
+    Returns one record per case, in case order.  The grid goes to each
+    worker once, not once per case, and cases share its topology; only
+    the cost arrays are compiled per case.  goal defaults to the bottom
+    right corner, workers to the number of CPUs, and options to the
+    engine's defaults.  With a cache, cases solved before are answered
+    from it, and only the rest go to the pool; their answers are cached.
+    """
+    if not cases:
+        raise ValueError("no cases")
+    if engine == SolverEngine.STRIP:
+        # Pool workers may not start processes of their own.
+        raise ValueError(f"unsupported engine: {engine}")
+    if workers is not None and workers <= 0:
+        raise ValueError(f"non-positive workers: {workers}")
+    if chunksize <= 0:
+        raise ValueError(f"non-positive chunksize: {chunksize}")
+    if options is None:
+        options = SolverOptions()
+    m, n = grid.dimensions
+    if goal is None:
+        goal = (m - 1, n - 1)
+    records: List[Optional[SweepRecord]] = [None] * len(cases)
+    keys: Dict[int, str] = {}
+    if cache is not None:
+        settings = answer_options(engine, options)
+        for i, case in enumerate(cases):
+            t0 = time.perf_counter()
+            game = _case_game(grid, start, goal, case)
+            key = solve_key(game, engine, settings)
+            data = cache.get(key)
+            if data is None:
+                keys[i] = key
+                continue
+            got = (
+                None if data == "null" else TravelingAgent.from_json_str(data)
+            )
+            records[i] = _record(i, case, got, 0, time.perf_counter() - t0)
+    tasks = [
+        (i, case.costs.to_json_str(), case.health, case.moves)
+        for i, case in enumerate(cases)
+        if records[i] is None
+    ]
+    if tasks:
+        with Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(grid, start, goal, engine, options),
+        ) as pool:
+            for record, got in pool.map(_solve_case, tasks, chunksize):
+                records[record.case] = record
+                if cache is not None and record.infeasible is None:
+                    cache.put(keys[record.case], got)
+    return [r for r in records if r is not None]
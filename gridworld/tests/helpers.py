@@ -0,0 +1,43 @@
+from typing import Optional
+
+from gridworld.agent import DEFAULT_HEALTH, DEFAULT_MOVES, Agent
+from gridworld.costs import Costs
+from gridworld.direction import Direction
+from gridworld.game import Game
+from gridworld.grid import Grid
+
+
+def some_game(
+    grid: Grid,
+    health: int = DEFAULT_HEALTH,
+    moves: int = DEFAULT_MOVES,
+    start=(0, 0),
+    goal=None,
+    costs: Optional[Costs] = None,
+) -> Game:
+    # The goal defaults to the bottom right corner.
+    m, n = grid.dimensions
+    return Game(
+        grid=grid,
+        agent=Agent(start, health=health, moves=moves),
+        start_position=start,
+        goal_position=goal or (m - 1, n - 1),
+        costs=costs or Costs(),
+    )
+
+
+def replay(game: Game, path) -> Agent:
+    """
+    Returns the agent after walking path from game's agent, failing if
+    any step is illegal.
+    """
+    agent = game.agent
+    for pos in path[1:]:
+        r, c = agent.position
+        d = {(-1, 0): "U", (1, 0): "D", (0, -1): "L", (0, 1): "R"}[
+            (pos[0] - r, pos[1] - c)
+        ]
+        nxt = game.speculative_move(Direction(d), agent)
+        assert nxt is not None
+        agent = nxt
+    return agent
@@ -0,0 +1,99 @@
+import pickle
+from types import MappingProxyType
+
+import pytest
+
+from gridworld.adjacency import NO_EDGE, Adjacency, topology
+from gridworld.costs import STD_HEALTH_COSTS, STD_MOVE_COSTS, Costs
+from gridworld.direction import Direction
+from gridworld.grid import COMPILED_CACHE_SIZE, Grid
+from gridworld.labels import neighbor_table
+from gridworld.terrain import Terrain
+
+
+def test_adjacency_compile():
+    grid = Grid.from_rows([".+*", "#.."])
+    adjacency = grid.compile(Costs())
+    assert len(adjacency) == 6
+    assert list(adjacency.offsets) == [0, 2, 5, 7, 9, 12, 14]
+    # Up, left, right, down from each cell.
+    assert list(adjacency.targets) == [
+        1, 3,
+        0, 2, 4,
+        1, 5,
+        0, 4,
+        1, 3, 5,
+        2, 4,
+    ]  # fmt: skip
+    assert list(adjacency.health_costs) == [0, -5, -50, -10, 0, 0]
+    assert list(adjacency.move_costs) == [-1, 0, -10, -5, -1, -1]
+    assert adjacency.steps[0] == ((1, -5, 0), (3, -10, -5))
+    assert adjacency.steps[4] == ((1, -5, 0), (3, -10, -5), (5, 0, -1))
+
+
+def test_adjacency_matches_neighbor_table():
+    grid = Grid.from_rows(["....", "....", "...."])
+    adjacency = grid.compile(Costs())
+    hoods = neighbor_table(grid.dimensions)
+    for u, steps in enumerate(adjacency.steps):
+        assert tuple(v for v, _, _ in steps) == hoods[u]
+
+
+def test_adjacency_edge():
+    adjacency = Grid.from_rows([".+", "*#"]).compile(Costs())
+    assert adjacency.edge(0, Direction.UP) == NO_EDGE
+    assert adjacency.edge(0, Direction.LEFT) == NO_EDGE
+    e = adjacency.edge(0, Direction.RIGHT)
+    assert adjacency.targets[e] == 1
+    e = adjacency.edge(0, Direction.DOWN)
+    assert adjacency.targets[e] == 2
+    assert adjacency.health_deltas[e] == -50
+    assert adjacency.move_deltas[e] == -10
+    with pytest.raises(ValueError, match="invalid direction: 'X'"):
+        adjacency.edge(0, "X")  # type: ignore[arg-type]
+
+
+def test_grid_compile_cached():
+    grid = Grid.from_rows([".+", "*#"])
+    costs = Costs()
+    adjacency = grid.compile(costs)
+    assert grid.compile(costs) is adjacency
+    # Equal costs share the compiled adjacency.
+    assert grid.compile(Costs()) is adjacency
+    cheap = Costs(
+        health_costs=MappingProxyType({**STD_HEALTH_COSTS, Terrain.LAVA: -1})
+    )
+    other = grid.compile(cheap)
+    assert other is not adjacency
+    assert list(other.health_costs) == [0, -5, -1, -10]
+    assert grid.compile(costs) is adjacency
+
+
+def test_grid_compile_not_pickled():
+    grid = Grid.from_rows([".+", "*#"])
+    grid.compile(Costs())
+    copied = pickle.loads(pickle.dumps(grid))
+    assert copied == grid
+    assert copied._compiled == {}
+    assert isinstance(copied.compile(Costs()), Adjacency)
+
+
+def test_topology_shared_across_costs():
+    grid = Grid.from_rows([".+", "*#"])
+    costs = [
+        Costs(
+            move_costs=MappingProxyType({**STD_MOVE_COSTS, Terrain.BLANK: -k})
+        )
+        for k in range(1, COMPILED_CACHE_SIZE + 2)
+    ]
+    compiled = [grid.compile(c) for c in costs]
+    shared = topology(grid.dimensions)
+    for adjacency, k in zip(compiled, range(1, len(costs) + 1)):
+        assert adjacency.targets is shared.targets
+        assert adjacency.offsets is shared.offsets
+        assert adjacency.by_direction is shared.by_direction
+        assert list(adjacency.move_costs) == [-k, 0, -10, -5]
+    # The oldest compiled adjacency was dropped; the rest are kept.
+    assert len(grid._compiled) == COMPILED_CACHE_SIZE
+    assert grid.compile(costs[1]) is compiled[1]
+    assert grid.compile(costs[0]) is not compiled[0]
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from gridworld.anytime import Budget, solve_cancellable
+
+
+def test_budget_invalid():
+    with pytest.raises(ValueError, match="non-positive seconds: 0"):
+        Budget(seconds=0)
+    with pytest.raises(ValueError, match="non-positive expansions: -1"):
+        Budget(expansions=-1)
+
+
+def test_budget_unbounded():
+    budget = Budget()
+    budget.start()
+    assert budget.is_exhausted(10**9) is False
+
+
+def test_budget_expansions():
+    budget = Budget(expansions=3)
+    budget.start()
+    assert budget.is_exhausted(2) is False
+    assert budget.is_exhausted(3) is True
+
+
+def test_budget_seconds():
+    budget = Budget(seconds=0.01)
+    budget.start()
+    assert budget.is_exhausted(0) is False
+    time.sleep(0.02)
+    assert budget.is_exhausted(0) is True
+
+
+def test_budget_cancel_from_other_thread():
+    budget = Budget()
+    budget.start()
+    t = threading.Thread(target=budget.cancel)
+    t.start()
+    t.join()
+    assert budget.is_cancelled() is True
+    assert budget.is_exhausted(0) is True
+
+
+def spin(budget: Budget) -> int:
+    budget.start()
+    n = 0
+    while not budget.is_exhausted(n):
+        n += 1
+        time.sleep(0.001)
+    return n
+
+
+def test_solve_cancellable_returns():
+    got = asyncio.run(solve_cancellable(spin, Budget(expansions=5)))
+    assert got == 5
+
+
+def test_solve_cancellable_cancelled():
+    budget = Budget()
+
+    async def run():
+        task = asyncio.create_task(solve_cancellable(spin, budget))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert budget.is_cancelled() is True
@@ -0,0 +1,71 @@
+import os
+from random import Random
+
+import pytest
+
+from gridworld.astar_solver import AStarSolver, lower_bounds
+from gridworld.costs import Costs
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.tests.helpers import some_game
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def test_lower_bounds():
+    grid = Grid.from_rows([".*", "+#"])
+    health_need, moves_need = lower_bounds(grid, Costs(), (1, 1))
+    # Paid on entering: the goal itself is always paid for.
+    assert health_need == [15, 10, 10, 0]
+    assert moves_need == [5, 5, 5, 0]
+
+
+def test_astar_solver_trivial():
+    game = some_game(Grid.from_rows(["."]))
+    got = AStarSolver(game).solve()
+    assert got is not None
+    assert got.path == [(0, 0)]
+
+
+def test_astar_solver_prunes_unwinnable_start():
+    game = some_game(Grid.from_rows([".*", "*."]), health=50)
+    solver = AStarSolver(game)
+    assert solver.solve() is None
+    assert solver.expanded == 0
+
+
+def test_astar_solver_matches_pareto_solver():
+    rand = Random(4321)
+    for _ in range(30):
+        grid = Grid.random((5, 6), rand=rand)
+        game = some_game(grid, health=80, moves=40)
+        expected = ParetoSolver(game).solve()
+        got = AStarSolver(game).solve()
+        if expected is None:
+            assert got is None
+            continue
+        assert got is not None
+        assert got.wellness == pytest.approx(expected.wellness)
+        assert got.path[0] == (0, 0)
+        assert got.path[-1] == game.goal_position
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "solvable-10x10-grid.out",
+        "solvable-19x18-grid.out",
+        "solvable-20x20-grid.out",
+        "solvable-24x30-grid.out",
+    ],
+)
+def test_astar_solver_expands_less(name):
+    with open(os.path.join(GRIDS_DIR, name)) as f:
+        grid = Grid.from_str(f.read())
+    pareto = ParetoSolver(some_game(grid))
+    astar = AStarSolver(some_game(grid))
+    expected = pareto.solve()
+    got = astar.solve()
+    assert expected is not None and got is not None
+    assert got.wellness == pytest.approx(expected.wellness)
+    assert astar.expanded < pareto.expanded
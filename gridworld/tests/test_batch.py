@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+
+from gridworld.batch import (
+    BatchRecord,
+    grid_paths,
+    solve_batch,
+    solve_grid_file,
+)
+from gridworld.solve_cache import SolveCache
+from gridworld.solvers import SolverEngine, SolverOptions
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def test_grid_paths():
+    got = grid_paths(GRIDS_DIR)
+    assert len(got) == 6
+    assert got == sorted(got)
+    assert all(p.endswith(".out") for p in got)
+    pattern = os.path.join(GRIDS_DIR, "unsolvable-*.out")
+    assert [os.path.basename(p) for p in grid_paths(pattern)] == [
+        "unsolvable-16x16-grid.out",
+        "unsolvable-50x50-grid.out",
+    ]
+
+
+def test_solve_grid_file():
+    path = os.path.join(GRIDS_DIR, "solvable-10x10-grid.out")
+    got = solve_grid_file(path, engine=SolverEngine.ASTAR)
+    assert got.grid_path == path
+    assert got.solvable
+    assert (got.health, got.moves) == (135, 421)
+    assert got.path is not None
+    assert got.path[0] == (0, 0)
+    assert got.path[-1] == (9, 9)
+    assert got.elapsed >= 0.0
+
+
+def test_solve_grid_file_unsolvable():
+    path = os.path.join(GRIDS_DIR, "unsolvable-16x16-grid.out")
+    got = solve_grid_file(path)
+    assert not got.solvable
+    assert got.health is None and got.moves is None and got.path is None
+    assert got.infeasible == "health"
+
+
+def test_batch_record_to_json_str():
+    record = BatchRecord("a.out", True, 10, 20, [(0, 0), (0, 1)], 0.5)
+    assert json.loads(record.to_json_str()) == {
+        "grid_path": "a.out",
+        "solvable": True,
+        "health": 10,
+        "moves": 20,
+        "path": [[0, 0], [0, 1]],
+        "elapsed": 0.5,
+        "infeasible": None,
+    }
+
+
+def test_solve_batch():
+    paths = grid_paths(GRIDS_DIR)
+    got = list(solve_batch(paths, workers=2, chunksize=2))
+    assert sorted(r.grid_path for r in got) == paths
+    solvable = {os.path.basename(r.grid_path): r.solvable for r in got}
+    assert solvable == {
+        "solvable-10x10-grid.out": True,
+        "solvable-19x18-grid.out": True,
+        "solvable-20x20-grid.out": True,
+        "solvable-24x30-grid.out": True,
+        "unsolvable-16x16-grid.out": False,
+        "unsolvable-50x50-grid.out": False,
+    }
+
+
+def test_solve_batch_options():
+    path = os.path.join(GRIDS_DIR, "solvable-10x10-grid.out")
+    default, narrow = (
+        next(solve_batch([path], engine=SolverEngine.BEAM, options=o))
+        for o in (None, SolverOptions(beam_width=1))
+    )
+    assert (default.health, default.moves) == (135, 421)
+    assert (narrow.health, narrow.moves) == (115, 407)
+
+
+def test_solve_batch_cache():
+    paths = grid_paths(GRIDS_DIR)
+    cache = SolveCache()
+
+    def solved():
+        records = solve_batch(paths, SolverEngine.ASTAR, 2, cache=cache)
+        return {
+            r.grid_path: (r.solvable, r.health, r.moves, r.path)
+            for r in records
+        }
+
+    first = solved()
+    assert (cache.hits, cache.misses) == (0, 6)
+    # Infeasible grids are proven so again rather than cached.
+    assert solved() == first
+    assert (cache.hits, cache.misses) == (4, 8)
+    assert len(cache) == 4
+
+
+def test_solve_batch_bad_args():
+    with pytest.raises(ValueError) as workers_err:
+        list(solve_batch([], workers=0))
+    assert "non-positive workers: 0" in str(workers_err.value)
+    with pytest.raises(ValueError) as chunksize_err:
+        list(solve_batch([], chunksize=0))
+    assert "non-positive chunksize: 0" in str(chunksize_err.value)
@@ -0,0 +1,93 @@
+import os
+from random import Random
+
+import pytest
+
+from gridworld.agent import Agent
+from gridworld.beam_solver import BeamSolver, gap_report, utility_score
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.terrain import Terrain
+from gridworld.wellness_solver import TravelingAgent
+from gridworld.tests.helpers import replay, some_game
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def test_beam_solver_trivial():
+    game = some_game(Grid.from_rows(["."]))
+    got = BeamSolver(game).solve()
+    assert got is not None
+    assert got.path == [(0, 0)]
+
+
+def test_beam_solver_invalid_width():
+    game = some_game(Grid.from_rows([".."]))
+    with pytest.raises(ValueError, match="non-positive width: 0"):
+        BeamSolver(game, width=0)
+
+
+def test_beam_solver_unsolvable():
+    game = some_game(Grid.from_rows([".*", "*."]), health=50)
+    assert BeamSolver(game).solve() is None
+
+
+def test_utility_score():
+    agent = Agent((0, 0), health=100, moves=450)
+    want = TravelingAgent(agent=agent, path=[(0, 0)]).utility_score((3, 4))
+    assert utility_score(agent, (3, 4)) == want
+
+
+def test_beam_solver_wide_beam_is_exact():
+    # With nothing cut from the beam only dominated states are dropped.
+    rng = Random(12)
+    terrains = list(Terrain)
+    for _ in range(200):
+        m, n = rng.randint(1, 5), rng.randint(1, 5)
+        grid = Grid((m, n), [rng.choice(terrains) for _ in range(m * n)])
+        game = some_game(grid, rng.randint(1, 200), rng.randint(1, 30))
+        want = ParetoSolver(game).solve()
+        got = BeamSolver(game, width=10**6).solve()
+        if want is None:
+            assert got is None
+            continue
+        assert got is not None
+        assert got.wellness == want.wellness
+        assert replay(game, got.path) == got.agent
+
+
+def test_beam_solver_custom_score():
+    calls = []
+
+    def score(agent: Agent, goal) -> float:
+        calls.append(agent.position)
+        return agent.health * agent.moves
+
+    game = some_game(Grid.from_rows(["..#", "+*.", "..."]))
+    got = BeamSolver(game, width=2, score=score).solve()
+    assert got is not None
+    assert calls
+    assert replay(game, got.path) == got.agent
+
+
+def test_beam_solver_bounded_beam():
+    with open(os.path.join(GRIDS_DIR, "solvable-24x30-grid.out")) as f:
+        game = Game.from_grid(Grid.from_str(f.read()))
+    sv = BeamSolver(game, width=4)
+    sv.solve()
+    assert sv.stats.peak_queue <= 4 * 4
+
+
+def test_gap_report():
+    paths = [
+        os.path.join(GRIDS_DIR, "solvable-10x10-grid.out"),
+        os.path.join(GRIDS_DIR, "unsolvable-16x16-grid.out"),
+    ]
+    gaps = list(gap_report(paths, width=16))
+    assert [g.grid_path for g in gaps] == paths
+    assert gaps[0].exact_wellness is not None
+    assert 0.0 <= gaps[0].gap <= 1.0
+    assert gaps[1].exact_wellness is None
+    assert gaps[1].beam_wellness is None
+    assert gaps[1].gap == 0.0
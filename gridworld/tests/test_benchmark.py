@@ -0,0 +1,132 @@
+from unittest.mock import patch
+
+import pytest
+
+from gridworld import benchmark
+from gridworld.benchmark import (
+    NOISE_BYTES,
+    BenchmarkRecord,
+    benchmark_games,
+    compare_benchmarks,
+    load_benchmark,
+    run_benchmark,
+    save_benchmark,
+)
+from gridworld.solvers import SOLVERS
+
+
+def some_record(**kwargs) -> BenchmarkRecord:
+    record = {
+        "engine": "pareto",
+        "grid": "g",
+        "cells": 4,
+        "solvable": True,
+        "wellness": 0.5,
+        "quality": 1.0,
+        "expanded": 10,
+        "elapsed": 1.0,
+        "peak_memory": 1 << 20,
+        **kwargs,
+    }
+    return BenchmarkRecord(**record)
+
+
+def test_benchmark_games(tmp_path):
+    (tmp_path / "a.out").write_text(".+\n*#\n")
+    games = benchmark_games(str(tmp_path), sides=[3, 30], seed=4)
+    assert [name for name, _ in games] == [
+        "a.out",
+        "random-3x3:4",
+        "random-30x30:4",
+    ]
+    assert games[0][1].agent.max_health == 200
+    small, big = games[1][1], games[2][1]
+    assert small.grid.dimensions == (3, 3)
+    assert small.goal_position == (2, 2)
+    assert (small.agent.health, small.agent.moves) == (200, 450)
+    assert (big.agent.max_health, big.agent.max_moves) == (300, 675)
+    with pytest.raises(ValueError, match="non-positive side: 0"):
+        benchmark_games(str(tmp_path), sides=[0])
+
+
+def test_run_benchmark(tmp_path):
+    (tmp_path / "a.out").write_text("..\n..\n")
+    games = benchmark_games(str(tmp_path), sides=[21])
+    engines = ["astar", "beam", "bfs"]
+    records = list(run_benchmark(games, engines))
+    got = [(r.grid, r.engine) for r in records]
+    # bfs skips grids over its benchmark_cells.
+    assert SOLVERS["bfs"].benchmark_cells < 21 * 21
+    assert got == [
+        ("a.out", "astar"),
+        ("a.out", "beam"),
+        ("a.out", "bfs"),
+        ("random-21x21:0", "astar"),
+        ("random-21x21:0", "beam"),
+    ]
+    for r in records:
+        assert r.solvable and r.wellness is not None
+        assert r.quality == r.wellness / max(
+            s.wellness for s in records if s.grid == r.grid
+        )
+        assert r.elapsed > 0 and r.peak_memory > 0
+    assert records[0].quality == 1.0
+    path = str(tmp_path / "bench.json")
+    save_benchmark(path, records)
+    assert load_benchmark(path) == records
+
+
+def test_run_benchmark_compiles_before_timing(tmp_path):
+    (tmp_path / "a.out").write_text("..\n..\n")
+    games = benchmark_games(str(tmp_path), sides=[])
+    grid = games[0][1].grid
+    events = []
+    compile_grid = grid.compile
+    solve = benchmark._solve
+
+    def compiling(costs):
+        events.append("compile")
+        return compile_grid(costs)
+
+    def solving(engine, game, seed):
+        events.append("solve")
+        return solve(engine, game, seed)
+
+    with (
+        patch.object(grid, "compile", side_effect=compiling),
+        patch.object(benchmark, "_solve", side_effect=solving),
+    ):
+        list(run_benchmark(games, ["astar"]))
+    assert events[0] == "compile"
+    assert events.count("solve") == 2
+
+
+def test_compare_benchmarks():
+    baseline = [
+        some_record(),
+        some_record(grid="h"),
+        some_record(engine="beam"),
+    ]
+    same = [some_record(elapsed=1.4, peak_memory=(1 << 20) + NOISE_BYTES)]
+    assert compare_benchmarks(same, baseline) == []
+    worse = [
+        some_record(wellness=0.25, elapsed=1.6),
+        some_record(grid="h", solvable=False, wellness=None),
+        some_record(engine="beam", peak_memory=2 << 20),
+        some_record(engine="dp"),
+    ]
+    got = [
+        (r.engine, r.grid, r.metric, r.baseline, r.current)
+        for r in compare_benchmarks(worse, baseline)
+    ]
+    assert got == [
+        ("pareto", "g", "wellness", 0.5, 0.25),
+        ("pareto", "g", "elapsed", 1.0, 1.6),
+        ("pareto", "h", "wellness", 0.5, 0),
+        ("beam", "g", "peak_memory", 1 << 20, 2 << 20),
+    ]
+    assert str(compare_benchmarks(worse, baseline)[0]) == (
+        "regression: pareto on g: wellness 0.5 -> 0.25"
+    )
+    with pytest.raises(ValueError, match="time_tolerance below 1: 0.5"):
+        compare_benchmarks(worse, baseline, time_tolerance=0.5)
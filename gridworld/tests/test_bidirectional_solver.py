@@ -0,0 +1,64 @@
+import os
+from random import Random
+
+import pytest
+
+from gridworld.bidirectional_solver import BidirectionalSolver
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.tests.helpers import some_game
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def test_bidirectional_solver_trivial():
+    game = some_game(Grid.from_rows(["."]))
+    got = BidirectionalSolver(game).solve()
+    assert got is not None
+    assert got.path == [(0, 0)]
+    assert (got.agent.health, got.agent.moves) == (200, 450)
+
+
+def test_bidirectional_solver_pays_on_entering():
+    grid = Grid.from_rows(["#*"])
+    got = BidirectionalSolver(some_game(grid)).solve()
+    assert got is not None
+    assert got.path == [(0, 0), (0, 1)]
+    assert (got.agent.health, got.agent.moves) == (150, 440)
+
+
+def test_bidirectional_solver_unsolvable():
+    game = some_game(Grid.from_rows([".*", "*."]), health=50)
+    assert BidirectionalSolver(game).solve() is None
+
+
+def test_bidirectional_solver_matches_pareto_solver():
+    rand = Random(99)
+    for _ in range(40):
+        grid = Grid.random((5, 6), rand=rand)
+        start = (rand.randrange(5), rand.randrange(6))
+        goal = (rand.randrange(5), rand.randrange(6))
+        game = some_game(grid, health=80, moves=40, start=start, goal=goal)
+        expected = ParetoSolver(game).solve()
+        got = BidirectionalSolver(game).solve()
+        if expected is None:
+            assert got is None
+            continue
+        assert got is not None
+        assert got.wellness == pytest.approx(expected.wellness)
+        assert got.path[0] == start
+        assert got.path[-1] == goal
+        for a, b in zip(got.path, got.path[1:]):
+            assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+
+
+def test_bidirectional_solver_expands_less():
+    with open(os.path.join(GRIDS_DIR, "solvable-24x30-grid.out")) as f:
+        grid = Grid.from_str(f.read())
+    pareto = ParetoSolver(some_game(grid))
+    bidi = BidirectionalSolver(some_game(grid))
+    expected = pareto.solve()
+    got = bidi.solve()
+    assert expected is not None and got is not None
+    assert got.wellness == pytest.approx(expected.wellness)
+    assert bidi.expanded * 2 < pareto.expanded
@@ -0,0 +1,116 @@
+import heapq
+from random import Random
+
+import pytest
+
+from gridworld.bucket_queue import (
+    BucketQueue,
+    _heap_costs_to,
+    costs_to,
+    queue_benchmark,
+)
+from gridworld.costs import Costs
+from gridworld.game import Game
+from gridworld.grid import Grid
+
+
+def test_pop_least_first_fifo_among_equals():
+    queue = BucketQueue(5)
+    for priority, item in [(3, "a"), (0, "b"), (3, "c"), (5, "d"), (0, "e")]:
+        queue.push(priority, item)
+    assert len(queue) == 5
+    got = [queue.pop() for _ in range(5)]
+    assert got == [(0, "b"), (0, "e"), (3, "a"), (3, "c"), (5, "d")]
+    assert len(queue) == 0
+
+
+def test_matches_heapq_on_random_pushes():
+    rand = Random(7)
+    queue = BucketQueue(10)
+    heap = []
+    floor = 0
+    for seq in range(2000):
+        if heap and rand.random() < 0.45:
+            want = heapq.heappop(heap)
+            floor = want[0]
+            assert queue.pop() == want
+        else:
+            priority = floor + rand.randint(0, 10)
+            queue.push(priority, seq)
+            heapq.heappush(heap, (priority, seq))
+    while heap:
+        assert queue.pop() == heapq.heappop(heap)
+
+
+def test_drain_takes_pushes_made_meanwhile():
+    queue = BucketQueue(2)
+    queue.push(0, 0)
+    got = []
+    for priority, item in queue.drain():
+        got.append((priority, item))
+        if item < 4:
+            # Zero-cost and positive-cost steps alike.
+            queue.push(priority + item % 2, item + 1)
+    assert got == [(0, 0), (0, 1), (1, 2), (1, 3), (2, 4)]
+    assert len(queue) == 0
+
+
+def test_drain_stopped_early_leaves_the_rest():
+    queue = BucketQueue(1)
+    for priority, item in [(0, "a"), (0, "b"), (1, "c")]:
+        queue.push(priority, item)
+    for priority, item in queue.drain():
+        break
+    assert len(queue) == 2
+    assert queue.pop() == (0, "b")
+    assert list(queue.drain()) == [(1, "c")]
+
+
+def test_errors():
+    with pytest.raises(ValueError, match="negative max_step: -1"):
+        BucketQueue(-1)
+    queue = BucketQueue(3)
+    with pytest.raises(IndexError, match="pop from an empty queue"):
+        queue.pop()
+    with pytest.raises(ValueError, match="priority out of range: 4"):
+        queue.push(4, 0)
+    queue.push(2, 0)
+    queue.pop()
+    with pytest.raises(ValueError, match="priority out of range: 1"):
+        queue.push(1, 0)
+    queue.push(5, 0)
+    assert queue.pop() == (5, 0)
+
+
+def test_zero_max_step():
+    queue = BucketQueue(0)
+    queue.push(0, "a")
+    queue.push(0, "b")
+    assert list(queue.drain()) == [(0, "a"), (0, "b")]
+
+
+def test_costs_to():
+    grid = Grid.from_str(".*\n#.")
+    adjacency = grid.compile(Costs())
+    steps = adjacency.steps
+    # Entering the goal (1, 1) costs 1 move from either side.
+    assert costs_to(3, adjacency.move_costs, steps) == [6, 1, 1, 0]
+    assert costs_to(3, adjacency.health_costs, steps) == [10, 0, 0, 0]
+    for seed in range(5):
+        grid = Grid.random((12, 9), Random(seed))
+        adjacency = grid.compile(Costs())
+        for step_costs in (adjacency.health_costs, adjacency.move_costs):
+            assert costs_to(50, step_costs, adjacency.steps) == _heap_costs_to(
+                50, step_costs, adjacency.steps
+            )
+
+
+def test_queue_benchmark():
+    game = Game.from_grid(Grid.random((20, 20), Random(2)))
+    bench = queue_benchmark("random:2", game, rounds=1)
+    assert bench.name == "random:2"
+    assert bench.dimensions == (20, 20)
+    assert bench.cells == 400
+    assert bench.speedup == bench.heap_time / bench.bucket_time
+    with pytest.raises(ValueError, match="non-positive rounds: 0"):
+        queue_benchmark("random:2", game, rounds=0)
@@ -0,0 +1,86 @@
+import sqlite3
+from array import array
+
+import pytest
+
+from gridworld.agent import Agent
+from gridworld.checkpoint import load_checkpoint, save_checkpoint
+from gridworld.costs import Costs
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.solver_stats import SolverStats
+from gridworld.state_store import StateStore
+
+
+def some_game() -> Game:
+    grid = Grid.from_rows([".+", "#."])
+    return Game(
+        grid=grid,
+        agent=Agent((0, 0)),
+        start_position=(0, 0),
+        goal_position=(1, 1),
+        costs=Costs(),
+    )
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = tmp_path / "solve.checkpoint"
+    game = some_game()
+    store = StateStore()
+    root = store.add(0, 200, 450, StateStore.NO_PARENT)
+    child = store.add(1, 195, 450, root)
+    store.release(store.add(2, 190, 445, root))
+    best = array("i", [root, child, -1, -1])
+    seen = bytearray(16)
+    seen[2] = 1
+    stats = SolverStats(popped=3, peak_live=3)
+    frontier = [array("i", [child * 4]), array("i"), array("i", [1, 2])]
+    save_checkpoint(path, game, 3, stats, store, best, seen, frontier)
+    got = load_checkpoint(path)
+    assert got.game.to_json_str() == game.to_json_str()
+    assert got.expanded == 3
+    assert got.stats == stats
+    assert got.best == best
+    assert got.seen == seen
+    assert [list(c) for c in got.frontier()] == [[child * 4], [1, 2]]
+    assert len(got.store) == 2
+    assert got.store.cells(child) == [0, 1]
+    # Freed slots are reused as before.
+    assert got.store.add(3, 1, 1, child) == 2
+    # Saving again replaces the checkpoint.
+    save_checkpoint(path, game, 4, stats, store, best, seen, [])
+    assert load_checkpoint(path).expanded == 4
+    assert list(load_checkpoint(path).frontier()) == []
+
+
+def test_load_checkpoint_invalid(tmp_path):
+    with pytest.raises(ValueError, match="no such checkpoint"):
+        load_checkpoint(tmp_path / "missing")
+    junk = tmp_path / "junk"
+    junk.write_text("not sqlite")
+    with pytest.raises(ValueError, match="invalid checkpoint"):
+        load_checkpoint(junk)
+
+
+@pytest.mark.parametrize(
+    "sql, message",
+    [
+        ("DELETE FROM arrays WHERE name = 'best'", "missing 'best'"),
+        ("DELETE FROM meta WHERE key = 'game'", "missing 'game'"),
+        ("UPDATE meta SET value = 'x' WHERE key = 'expanded'", "'x'"),
+    ],
+)
+def test_load_checkpoint_damaged(tmp_path, sql, message):
+    path = tmp_path / "solve.checkpoint"
+    store = StateStore()
+    store.add(0, 200, 450, StateStore.NO_PARENT)
+    best = array("i", [0, -1, -1, -1])
+    save_checkpoint(
+        path, some_game(), 1, SolverStats(), store, best, bytearray(16), []
+    )
+    conn = sqlite3.connect(path)
+    conn.execute(sql)
+    conn.commit()
+    conn.close()
+    with pytest.raises(ValueError, match=f"invalid checkpoint: .*{message}"):
+        load_checkpoint(path)
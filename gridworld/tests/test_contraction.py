@@ -0,0 +1,95 @@
+from random import Random
+
+import pytest
+
+from gridworld.contraction import (
+    NO_COMPONENT,
+    ContractedGraph,
+    contraction_report,
+    speeder_heavy_grid,
+    zero_move_terrains,
+)
+from gridworld.costs import Costs
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.terrain import Terrain
+from gridworld.tests.helpers import replay, some_game
+
+
+def test_zero_move_terrains():
+    assert zero_move_terrains(Costs()) == {Terrain.SPEEDER}
+
+
+def block_rows(side: int):
+    # A side x side block of speeders ringed by blanks.
+    inner = "." + "+" * side + "."
+    return ["." * (side + 2)] + [inner] * side + ["." * (side + 2)]
+
+
+def test_contracted_graph_block():
+    grid = Grid.from_rows(block_rows(8))
+    graph = ContractedGraph(grid, Costs())
+    # The 6x6 inner speeders are contracted away.
+    assert graph.nodes == 100 - 36
+    assert graph.reduction == pytest.approx(36 / 100)
+    assert graph.component[44] != NO_COMPONENT
+    assert not graph.is_node(44)
+    assert graph.is_node(11)
+    # Straight across the block, through the inner cells.
+    assert (48, -35, 0) in graph.steps(41)
+    assert graph.expand([41, 48]) == list(range(41, 49))
+
+
+def test_contracted_graph_small_blocks_kept():
+    # Blocks with fewer inner than boundary cells are not contracted.
+    graph = ContractedGraph(Grid.from_rows(block_rows(5)), Costs())
+    assert graph.nodes == 49
+    graph = ContractedGraph(
+        Grid.from_rows(block_rows(8)), Costs(), max_boundary=27
+    )
+    assert graph.nodes == 100
+
+
+def test_contracted_graph_keep():
+    grid = Grid.from_rows(block_rows(8))
+    assert ContractedGraph(grid, Costs(), keep=[44]).nodes == 65
+
+
+def test_contracted_graph_invalid_max_boundary():
+    with pytest.raises(ValueError, match="non-positive max_boundary: 0"):
+        ContractedGraph(Grid.from_rows(["."]), Costs(), max_boundary=0)
+
+
+def test_pareto_solver_contract_matches_plain():
+    rng = Random(15)
+    for _ in range(60):
+        m, n = rng.randint(1, 24), rng.randint(1, 24)
+        grid = speeder_heavy_grid((m, n), rng.random(), rng)
+        game = some_game(grid, rng.randint(1, 200), rng.randint(1, 40))
+        want = ParetoSolver(game).solve()
+        got = ParetoSolver(game, contract=True).solve()
+        if want is None:
+            assert got is None
+            continue
+        assert got is not None
+        assert got.wellness == want.wellness
+        assert replay(game, got.path) == got.agent
+
+
+def test_speeder_heavy_grid():
+    grid = speeder_heavy_grid((20, 30), 0.6, Random(3))
+    speeders = sum(1 for t in grid if t == Terrain.SPEEDER)
+    assert 0.6 * 600 <= speeders < 0.8 * 600
+    with pytest.raises(ValueError, match="invalid share: 2"):
+        speeder_heavy_grid((2, 2), 2)
+
+
+def test_contraction_report():
+    grid = speeder_heavy_grid((30, 30), 0.6, Random(4))
+    report = contraction_report(Game.from_grid(grid))
+    assert report.cells == 900
+    assert 0 < report.nodes <= 900
+    assert report.reduction == 1 - report.nodes / 900
+    assert report.contracted_expanded <= report.plain_expanded
+    assert report.speedup > 0
@@ -0,0 +1,107 @@
+from random import Random
+
+import pytest
+
+from gridworld.costs import Costs
+from gridworld.dp_solver import UNREACHED, DPSolver
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.terrain import Terrain
+from gridworld.tests.helpers import some_game
+
+
+def test_dp_solver_table():
+    game = some_game(Grid.from_rows([".+", "#."]), health=20, moves=5)
+    solver = DPSolver(game)
+    got = solver.solve()
+    assert solver.table is not None
+    assert solver.table.shape == (6, 2, 2)
+    assert solver.table[5, 0, 0] == 20
+    # Speeder costs no moves, so it shares the start layer.
+    assert solver.table[5, 0, 1] == 15
+    assert solver.table[4, 1, 1] == 15
+    assert solver.table[0, 1, 1] == UNREACHED
+    assert got is not None
+    assert got.path == [(0, 0), (0, 1), (1, 1)]
+    assert (got.agent.health, got.agent.moves) == (15, 4)
+
+
+def test_dp_solver_trivial():
+    got = DPSolver(some_game(Grid.from_rows(["*"]))).solve()
+    assert got is not None
+    assert got.path == [(0, 0)]
+
+
+def test_dp_solver_unsolvable():
+    game = some_game(Grid.from_rows([".*", "*."]), health=50)
+    assert DPSolver(game).solve() is None
+
+
+def test_dp_solver_matches_pareto_solver():
+    rand = Random(2024)
+    for i in range(40):
+        grid = Grid.random((4, 5), rand=rand)
+        costs = Costs()
+        if i % 2:
+            # Include terrains that cost nothing at all.
+            costs = Costs(
+                health_costs={t: -rand.choice([0, 3, 7]) for t in Terrain},
+                move_costs={t: -rand.choice([0, 1, 2]) for t in Terrain},
+            )
+        game = some_game(grid, health=60, moves=25, costs=costs)
+        expected = ParetoSolver(game).solve()
+        got = DPSolver(game).solve()
+        if expected is None:
+            assert got is None
+            continue
+        assert got is not None
+        assert got.wellness == pytest.approx(expected.wellness)
+        assert got.path[0] == (0, 0)
+        assert got.path[-1] == game.goal_position
+
+
+def test_dp_solver_solve_all():
+    game = some_game(Grid.from_rows([".+", "#*"]), health=20, moves=5)
+    solver = DPSolver(game)
+    heatmap = solver.solve_all()
+    assert heatmap.health.tolist() == [[20, 15], [0, 0]]
+    assert heatmap.moves.tolist() == [[5, 5], [0, 0]]
+    assert heatmap.parent.tolist() == [[-1, 0], [-1, -1]]
+    # Mud takes all five moves and lava all the health left.
+    assert heatmap.reachable.tolist() == [[True, True], [False, False]]
+    assert solver.path_to((0, 1)) == [(0, 0), (0, 1)]
+    assert solver.path_to((1, 1)) is None
+
+
+def test_dp_solver_solve_all_matches_pareto_solver():
+    rng = Random(19)
+    for _ in range(30):
+        m, n = rng.randint(1, 6), rng.randint(1, 6)
+        grid = Grid.random((m, n), rng)
+        health, moves = rng.randint(1, 200), rng.randint(1, 25)
+        solver = DPSolver(some_game(grid, health, moves))
+        heatmap = solver.solve_all()
+        for r in range(m):
+            for c in range(n):
+                game = some_game(grid, health, moves)
+                game.goal_position = (r, c)
+                want = ParetoSolver(game).solve()
+                if want is None:
+                    assert not heatmap.reachable[r, c]
+                    assert solver.path_to((r, c)) is None
+                    continue
+                assert heatmap.health[r, c] * heatmap.moves[r, c] == (
+                    want.agent.health * want.agent.moves
+                )
+                path = solver.path_to((r, c))
+                assert path is not None
+                assert path[0] == (0, 0) and path[-1] == (r, c)
+                if (r, c) != (0, 0):
+                    p = heatmap.parent[r, c]
+                    assert abs(p // n - r) + abs(p % n - c) == 1
+
+
+def test_dp_solver_path_to_needs_table():
+    solver = DPSolver(some_game(Grid.from_rows([".."])))
+    with pytest.raises(ValueError, match="no table"):
+        solver.path_to((0, 1))
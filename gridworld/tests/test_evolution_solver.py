@@ -0,0 +1,113 @@
+import os
+from random import Random
+
+import numpy as np
+import pytest
+
+from gridworld.adjacency import DIRECTIONS
+from gridworld.anytime import Budget
+from gridworld.direction import Direction
+from gridworld.evolution_solver import EvolutionSolver
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.tests.helpers import replay, some_game
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def walk(game: Game, directions: str):
+    # The walk score() takes, one speculative_move() at a time.
+    agent = game.agent
+    path = [agent.position]
+    for d in directions:
+        nxt = game.speculative_move(Direction(d), agent)
+        if nxt is None:
+            return path, agent, False
+        agent = nxt
+        path.append(agent.position)
+        if agent.position == game.goal_position or not agent.is_alive():
+            break
+    reached = agent.position == game.goal_position and agent.is_alive()
+    return path, agent, reached
+
+
+def test_score_matches_speculative_moves():
+    rng = Random(5)
+    for _ in range(40):
+        m, n = rng.randint(1, 6), rng.randint(1, 6)
+        game = some_game(Grid.random((m, n), rng), rng.randint(1, 120))
+        sv = EvolutionSolver(game)
+        genes = np.array(
+            [[rng.randrange(4) for _ in range(12)] for _ in range(8)],
+            dtype=np.int8,
+        )
+        walks = sv.score(genes)
+        for i, row in enumerate(genes):
+            directions = "".join(DIRECTIONS[g] for g in row)
+            path, agent, reached = walk(game, directions)
+            end = int(walks.end[i])
+            assert end == len(path) - 1
+            assert bool(walks.reached[i]) == reached
+            got = list(zip(walks.rows[i, :end], walks.cols[i, :end]))
+            assert [(0, 0)] + got == path
+            if end:
+                assert walks.health[i, end - 1] == agent.health
+                assert walks.moves[i, end - 1] == agent.moves
+            assert (walks.fitness[i] > 1) == reached
+
+
+def test_evolution_solver_finds_optimum_on_small_grid():
+    with open(os.path.join(GRIDS_DIR, "solvable-10x10-grid.out")) as f:
+        game = Game.from_grid(Grid.from_str(f.read()))
+    want = ParetoSolver(game).solve()
+    sv = EvolutionSolver(game, seed=0)
+    got = sv.solve()
+    assert got is not None and want is not None
+    assert got.wellness == want.wellness
+    assert got.path[-1] == game.goal_position
+    agent = replay(game, got.path)
+    assert (agent.health, agent.moves) == (got.agent.health, got.agent.moves)
+    assert sv.complete
+    assert sv.expanded == sv.population * sv.generations
+    seconds = [s for s, _, _ in sv.history]
+    generations = [g for _, g, _ in sv.history]
+    wellness = [w for _, _, w in sv.history]
+    assert seconds == sorted(seconds)
+    assert generations == sorted(set(generations))
+    assert wellness == sorted(set(wellness))
+    assert wellness[-1] == got.wellness
+
+
+def test_evolution_solver_budget():
+    game = some_game(Grid.random((12, 12), Random(1)))
+    improved = []
+    sv = EvolutionSolver(game, population=16, seed=3)
+    sv.solve(budget=Budget(expansions=160), on_improve=improved.append)
+    assert sv.expanded == 160
+    assert not sv.complete
+    assert [ta.wellness for ta in improved] == [w for _, _, w in sv.history]
+
+
+def test_evolution_solver_trivial_and_hopeless():
+    game = some_game(Grid.from_rows(["."]))
+    got = EvolutionSolver(game).solve()
+    assert got is not None
+    assert got.path == [(0, 0)]
+    game = some_game(Grid.from_rows([".*", "*."]), health=50)
+    sv = EvolutionSolver(game, generations=5)
+    assert sv.solve() is None
+    assert sv.history == []
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"population": 3}, "population below 4: 3"),
+        ({"generations": 0}, "non-positive generations: 0"),
+    ],
+)
+def test_evolution_solver_invalid(kwargs, message):
+    game = some_game(Grid.from_rows([".."]))
+    with pytest.raises(ValueError, match=message):
+        EvolutionSolver(game, **kwargs)
@@ -0,0 +1,93 @@
+import json
+import os.path
+from types import MappingProxyType
+
+from gridworld.agent import Agent
+from gridworld.costs import STD_MOVE_COSTS, Costs
+from gridworld.feasibility import Infeasibility, Resource, find_infeasibility
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.terrain import Terrain
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def some_game(rows, health: int = 200, moves: int = 450) -> Game:
+    grid = Grid.from_rows(rows)
+    m, n = grid.dimensions
+    return Game(
+        grid=grid,
+        agent=Agent((0, 0), health=health, moves=moves),
+        start_position=(0, 0),
+        goal_position=(m - 1, n - 1),
+        costs=Costs(),
+    )
+
+
+def test_find_infeasibility_health():
+    # The goal is lava.
+    game = some_game([".#", ".*"], health=50)
+    assert find_infeasibility(game) == Infeasibility(Resource.HEALTH, 50, 50)
+    assert find_infeasibility(some_game([".#", ".*"], health=51)) is None
+
+
+def test_find_infeasibility_moves():
+    game = some_game(["...", "...", "..."], moves=4)
+    assert find_infeasibility(game) == Infeasibility(Resource.MOVES, 4, 4)
+    assert find_infeasibility(some_game(["..."], moves=3)) is None
+
+
+def test_find_infeasibility_dead_agent():
+    game = some_game(["."], health=0)
+    assert find_infeasibility(game) == Infeasibility(Resource.HEALTH, 0, 0)
+
+
+def test_find_infeasibility_bound_only():
+    # Past the agent's budget the check stops at a lower bound.
+    game = some_game(["." * 30], moves=10)
+    assert find_infeasibility(game) == Infeasibility(Resource.MOVES, 10, 10)
+
+
+def test_find_infeasibility_gains():
+    # Terrain that restores a resource makes no bound.
+    game = some_game(["...", "..."], moves=2)
+    game.costs = Costs(
+        move_costs=MappingProxyType({**STD_MOVE_COSTS, Terrain.SPEEDER: 1})
+    )
+    assert find_infeasibility(game) is None
+
+
+def test_find_infeasibility_bundled_grids():
+    for name, resource in (
+        ("unsolvable-16x16-grid.out", Resource.HEALTH),
+        ("unsolvable-50x50-grid.out", Resource.HEALTH),
+        ("solvable-24x30-grid.out", None),
+    ):
+        with open(os.path.join(GRIDS_DIR, name)) as f:
+            game = Game.from_grid(Grid.from_str(f.read()))
+        got = find_infeasibility(game)
+        assert (got and got.resource) == resource
+
+
+def test_find_infeasibility_sound():
+    # Never rules out a game a solver can win.
+    for rows in ([".+*", "#.*", "*+."], ["#*#", "*#*", "#*#"]):
+        for health in (10, 30, 60, 100):
+            for moves in (2, 5, 10):
+                game = some_game(rows, health=health, moves=moves)
+                if find_infeasibility(game) is not None:
+                    assert ParetoSolver(game).solve() is None
+
+
+def test_infeasibility_str():
+    got = Infeasibility(Resource.MOVES, 12, 10)
+    assert str(got) == (
+        "infeasible: every path to the goal costs at least 12 moves,"
+        " and the agent has 10"
+    )
+    assert json.loads(got.to_json_str()) == {
+        "resource": "moves",
+        "need": 12,
+        "have": 10,
+    }
@@ -483,3 +483,13 @@ def test_game_from_dimensions():
     assert game.grid.dimensions == dims
     terrains = set(Terrain)
     assert all(c in terrains for c in game.grid.cells)
+
+
+def test_game_from_grid():
+    grid = Grid.from_rows([".*+", "#.."])
+    game = Game.from_grid(grid)
+    assert game.grid is grid
+    assert game.start_position == (0, 0)
+    assert game.goal_position == (1, 2)
+    assert game.agent == Agent(position=(0, 0))
+    assert game.costs == Costs()
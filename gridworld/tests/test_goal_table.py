@@ -0,0 +1,149 @@
+from random import Random
+
+from gridworld.anytime import Budget
+from gridworld.costs import Costs
+from gridworld.direction import Direction
+from gridworld.game import Game
+from gridworld.goal_table import GoalSearch, GoalTable, goal_table_for
+from gridworld.grid import Grid
+from gridworld.labels import cell_of
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.terrain import Terrain
+from gridworld.tests.helpers import some_game
+
+
+def build(game: Game) -> GoalTable:
+    table = GoalTable.build(
+        game.grid,
+        game.costs,
+        game.goal_position,
+        game.agent.max_health,
+        game.agent.max_moves,
+    )
+    assert table is not None
+    return table
+
+
+def test_goal_search_advance_is_resumable():
+    grid = Grid.from_rows(["..#", "*#.", "..."])
+    once = GoalSearch(grid, Costs(), (2, 2), 450)
+    once.advance(200)
+    stepped = GoalSearch(grid, Costs(), (2, 2), 450)
+    for health in range(0, 201, 7):
+        stepped.advance(health)
+    stepped.advance(200)
+    assert once.expanded == stepped.expanded
+    for a, b in zip(once.fronts, stepped.fronts):
+        assert sorted((x.health, x.moves) for x in a) == sorted(
+            (x.health, x.moves) for x in b
+        )
+
+
+def test_goal_table_needs():
+    game = some_game(Grid.from_rows([".+", "#."]))
+    table = build(game)
+    dims = game.grid.dimensions
+    goal = cell_of((1, 1), dims)
+    assert table.needs(goal) == [(0, 0, goal)]
+    # From (0, 1) the only step enters the goal, a blank cell.
+    assert table.needs(cell_of((0, 1), dims)) == [(0, 1, goal)]
+
+
+def test_goal_table_at_goal():
+    game = some_game(Grid.from_rows([".."]))
+    game.agent.position = game.goal_position
+    table = build(game)
+    assert table.is_winnable(game.agent) is True
+    assert table.best_direction(game.agent) is None
+
+
+def test_goal_table_dead_agent():
+    game = some_game(Grid.from_rows([".."]), health=0)
+    table = build(game)
+    assert table.is_winnable(game.agent) is False
+    assert table.best_direction(game.agent) is None
+
+
+def test_goal_table_matches_pareto():
+    rng = Random(8)
+    terrains = list(Terrain)
+    for _ in range(200):
+        m, n = rng.randint(1, 5), rng.randint(1, 5)
+        grid = Grid((m, n), [rng.choice(terrains) for _ in range(m * n)])
+        health, moves = rng.randint(1, 200), rng.randint(1, 30)
+        game = some_game(grid, health=health, moves=moves)
+        game.agent.position = (rng.randrange(m), rng.randrange(n))
+        table = build(game)
+        want = ParetoSolver(game).solve()
+        assert table.is_winnable(game.agent) is (want is not None)
+        direction = table.best_direction(game.agent)
+        if want is None or len(want.path) == 1:
+            assert direction is None
+            continue
+        assert direction is not None
+        next_agent = game.speculative_move(direction)
+        assert next_agent is not None
+        # Stepping the best direction keeps the best wellness in reach.
+        game.agent = next_agent
+        got = ParetoSolver(game).solve()
+        assert got is not None
+        assert got.agent.health * got.agent.moves == (
+            want.agent.health * want.agent.moves
+        )
+
+
+def test_goal_table_for_is_shared():
+    game = some_game(Grid.from_rows([".+", "#."]))
+    args = (
+        game.grid,
+        game.costs,
+        game.goal_position,
+        game.agent.max_health,
+        game.agent.max_moves,
+    )
+    assert goal_table_for(*args) is goal_table_for(*args)
+
+
+def test_goal_table_budget():
+    game = some_game(Grid.random((30, 30), Random(3)))
+    args = (
+        game.grid,
+        game.costs,
+        game.goal_position,
+        game.agent.max_health,
+        game.agent.max_moves,
+    )
+    assert GoalTable.build(*args, budget=Budget(expansions=10)) is None
+    assert goal_table_for(*args, budget=Budget(expansions=10)) is None
+    # A run out budget is not cached; an unbounded build is.
+    table = goal_table_for(*args)
+    assert table is not None
+    assert goal_table_for(*args, budget=Budget(expansions=10)) is table
+    assert table.nbytes == 4 * (len(table.offsets) + 3 * len(table.next_cells))
+
+
+def test_goal_table_winnability_matches_needs():
+    rng = Random(11)
+    game = some_game(Grid.random((6, 6), rng), health=120, moves=60)
+    table = build(game)
+    for cell in range(len(game.grid)):
+        needs = table.needs(cell)
+        assert [h for h, _, _ in needs] == sorted({h for h, _, _ in needs})
+        assert [m for _, m, _ in needs] == sorted(
+            (m for _, m, _ in needs), reverse=True
+        )
+        game.agent.position = divmod(cell, 6)
+        for health in range(1, 121, 7):
+            for moves in range(1, 61, 5):
+                game.agent.health, game.agent.moves = health, moves
+                want = any(h < health and m < moves for h, m, _ in needs)
+                assert table.is_winnable(game.agent) is want
+
+
+def test_game_best_direction_walks_to_goal():
+    game = some_game(Grid.from_rows(["..#*", "*#..", "+..."]))
+    assert game.is_winnable() is True
+    while (direction := game.best_direction()) is not None:
+        assert direction in Direction
+        assert game.move(direction) is True
+    assert game.is_win() is True
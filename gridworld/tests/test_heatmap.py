@@ -0,0 +1,37 @@
+import json
+
+import numpy as np
+
+from gridworld.heatmap import NO_PARENT, Heatmap
+
+
+def some_heatmap() -> Heatmap:
+    return Heatmap(
+        max_health=100,
+        max_moves=10,
+        health=np.array([[100, 50], [0, 10]], dtype=np.int32),
+        moves=np.array([[10, 9], [0, 1]], dtype=np.int32),
+        parent=np.array([[NO_PARENT, 0], [NO_PARENT, 1]], dtype=np.int32),
+    )
+
+
+def test_heatmap_wellness():
+    heatmap = some_heatmap()
+    assert heatmap.dimensions == (2, 2)
+    assert heatmap.wellness.tolist() == [[1.0, 0.45], [0.0, 0.01]]
+    assert heatmap.reachable.tolist() == [[True, True], [False, True]]
+
+
+def test_heatmap_render():
+    assert some_heatmap().render() == "94\n-0"
+
+
+def test_heatmap_to_json_str():
+    assert json.loads(some_heatmap().to_json_str()) == {
+        "dimensions": [2, 2],
+        "max_health": 100,
+        "max_moves": 10,
+        "health": [[100, 50], [0, 10]],
+        "moves": [[10, 9], [0, 1]],
+        "parent": [[-1, 0], [-1, 1]],
+    }
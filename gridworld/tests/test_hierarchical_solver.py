@@ -0,0 +1,94 @@
+import os
+from random import Random
+
+import pytest
+
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.hierarchical_solver import HierarchicalSolver
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.terrain import Terrain
+from gridworld.tests.helpers import replay, some_game
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def test_hierarchical_solver_trivial():
+    game = some_game(Grid.from_rows(["."]))
+    got = HierarchicalSolver(game).solve()
+    assert got is not None
+    assert got.path == [(0, 0)]
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"tile_size": 0}, "non-positive tile_size: 0"),
+        ({"portals": -1}, "non-positive portals: -1"),
+    ],
+)
+def test_hierarchical_solver_invalid(kwargs, message):
+    game = some_game(Grid.from_rows([".."]))
+    with pytest.raises(ValueError, match=message):
+        HierarchicalSolver(game, **kwargs)
+
+
+def test_hierarchical_solver_unsolvable():
+    game = some_game(Grid.from_rows([".*", "*."]), health=50)
+    assert HierarchicalSolver(game, tile_size=1).solve() is None
+
+
+def test_hierarchical_solver_all_portals_is_exact():
+    # With every border cell a portal, any path crosses tiles at portals.
+    rng = Random(13)
+    terrains = list(Terrain)
+    for _ in range(200):
+        m, n = rng.randint(1, 7), rng.randint(1, 7)
+        grid = Grid((m, n), [rng.choice(terrains) for _ in range(m * n)])
+        game = some_game(grid, rng.randint(1, 200), rng.randint(1, 30))
+        tile_size = rng.randint(1, 4)
+        want = ParetoSolver(game).solve()
+        got = HierarchicalSolver(
+            game, tile_size=tile_size, portals=tile_size
+        ).solve()
+        if want is None:
+            assert got is None
+            continue
+        assert got is not None
+        assert got.wellness == want.wellness
+        assert replay(game, got.path) == got.agent
+
+
+def test_hierarchical_solver_few_portals():
+    with open(os.path.join(GRIDS_DIR, "solvable-20x20-grid.out")) as f:
+        game = Game.from_grid(Grid.from_str(f.read()))
+    want = ParetoSolver(game).solve()
+    sv = HierarchicalSolver(game, tile_size=8, portals=2)
+    got = sv.solve()
+    assert not sv.fell_back
+    assert want is not None
+    assert got is not None
+    assert 0 < got.wellness <= want.wellness
+    assert replay(game, got.path) == got.agent
+
+
+def test_hierarchical_solver_falls_back_to_exact():
+    # No path crosses these tiles at their default portals.
+    game = Game.from_grid(Grid.random((18, 15), Random(20)))
+    want = ParetoSolver(game).solve()
+    sv = HierarchicalSolver(game)
+    got = sv.solve()
+    assert sv.fell_back
+    assert want is not None and got is not None
+    assert got.wellness == want.wellness
+    assert replay(game, got.path) == got.agent
+
+
+def test_hierarchical_solver_builds_reachable_tiles_only():
+    rng = Random(5)
+    terrains = list(Terrain)
+    grid = Grid((300, 300), [rng.choice(terrains) for _ in range(300 * 300)])
+    sv = HierarchicalSolver(some_game(grid), tile_size=16)
+    assert sv.solve() is None
+    assert sv.fell_back
+    assert 0 < sv.tiles_built < (300 // 16) ** 2 // 4
@@ -0,0 +1,87 @@
+import os
+from random import Random
+
+import pytest
+
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.ida_solver import IDAStarSolver, TranspositionTable
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.terrain import Terrain
+from gridworld.tests.helpers import replay, some_game
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def test_transposition_table():
+    table = TranspositionTable(3)
+    table.add(0, 10, 10)
+    assert table.covers(0, 10, 10)
+    assert table.covers(0, 5, 9)
+    assert not table.covers(0, 11, 1)
+    assert not table.covers(1, 1, 1)
+    table.add(0, 11, 1)
+    table.add(0, 12, 12)
+    # Dominated entries are dropped.
+    assert len(table) == 1
+    table.add(1, 1, 1)
+    table.add(2, 1, 1)
+    table.add(3, 1, 1)
+    assert len(table) == 3
+    assert not table.covers(0, 1, 1)
+    assert table.covers(3, 1, 1)
+    table.clear()
+    assert len(table) == 0
+
+
+def test_transposition_table_disabled():
+    table = TranspositionTable(0)
+    table.add(0, 10, 10)
+    assert len(table) == 0
+    assert not table.covers(0, 1, 1)
+
+
+def test_ida_solver_trivial():
+    game = some_game(Grid.from_rows(["."]))
+    got = IDAStarSolver(game).solve()
+    assert got is not None
+    assert got.path == [(0, 0)]
+
+
+def test_ida_solver_invalid_table_size():
+    game = some_game(Grid.from_rows([".."]))
+    with pytest.raises(ValueError, match="negative table_size: -1"):
+        IDAStarSolver(game, table_size=-1)
+
+
+def test_ida_solver_unsolvable():
+    game = some_game(Grid.from_rows([".*", "*."]), health=50)
+    assert IDAStarSolver(game).solve() is None
+
+
+@pytest.mark.parametrize("table_size", [0, 4, 1 << 16])
+def test_ida_solver_matches_pareto(table_size):
+    rng = Random(14)
+    terrains = list(Terrain)
+    for _ in range(150):
+        m, n = rng.randint(1, 6), rng.randint(1, 6)
+        grid = Grid((m, n), [rng.choice(terrains) for _ in range(m * n)])
+        game = some_game(grid, rng.randint(1, 200), rng.randint(1, 30))
+        want = ParetoSolver(game).solve()
+        got = IDAStarSolver(game, table_size=table_size).solve()
+        if want is None:
+            assert got is None
+            continue
+        assert got is not None
+        assert got.wellness == want.wellness
+        assert replay(game, got.path) == got.agent
+
+
+def test_ida_solver_table_cuts_expansions():
+    with open(os.path.join(GRIDS_DIR, "solvable-20x20-grid.out")) as f:
+        game = Game.from_grid(Grid.from_str(f.read()))
+    bare = IDAStarSolver(game, table_size=0)
+    tabled = IDAStarSolver(game)
+    assert bare.solve() == tabled.solve()
+    assert tabled.expanded < bare.expanded
+    assert tabled.stats.peak_queue <= len(game.grid)
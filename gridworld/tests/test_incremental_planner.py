@@ -0,0 +1,77 @@
+import os
+from random import Random
+
+import pytest
+
+from gridworld.direction import Direction
+from gridworld.grid import Grid
+from gridworld.incremental_planner import IncrementalPlanner
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.tests.helpers import some_game
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def direction_between(a, b) -> Direction:
+    return {
+        (-1, 0): Direction.UP,
+        (1, 0): Direction.DOWN,
+        (0, -1): Direction.LEFT,
+        (0, 1): Direction.RIGHT,
+    }[(b[0] - a[0], b[1] - a[1])]
+
+
+def test_incremental_planner_at_goal():
+    game = some_game(Grid.from_rows(["."]))
+    got = IncrementalPlanner(game).plan()
+    assert got is not None
+    assert got.path == [(0, 0)]
+    assert (got.agent.health, got.agent.moves) == (200, 450)
+
+
+def test_incremental_planner_dead_agent():
+    game = some_game(Grid.from_rows([".."]))
+    game.agent.health = 0
+    assert IncrementalPlanner(game).plan() is None
+
+
+def test_incremental_planner_follows_game():
+    with open(os.path.join(GRIDS_DIR, "solvable-24x30-grid.out")) as f:
+        game = some_game(Grid.from_str(f.read()))
+    planner = IncrementalPlanner(game)
+    first = planner.plan()
+    expected = ParetoSolver(game).solve()
+    assert first is not None and expected is not None
+    assert first.wellness == pytest.approx(expected.wellness)
+    assert planner.last_expanded > 0
+    for a, b in zip(first.path, first.path[1:]):
+        assert game.move(direction_between(a, b))
+        got = planner.plan()
+        assert got is not None
+        assert got.path[0] == b
+        assert got.agent == first.agent
+        assert planner.last_expanded == 0
+
+
+def test_incremental_planner_matches_pareto_solver():
+    rand = Random(77)
+    for _ in range(20):
+        game = some_game(Grid.random((5, 5), rand=rand), health=90, moves=40)
+        planner = IncrementalPlanner(game)
+        for _ in range(6):
+            expected = ParetoSolver(game).solve()
+            got = planner.plan()
+            if expected is None:
+                assert got is None
+            else:
+                assert got is not None
+                assert got.wellness == pytest.approx(expected.wellness)
+            game.move(rand.choice(list(Direction)))
+
+
+def test_incremental_planner_rebuilds_on_new_grid():
+    game = some_game(Grid.from_rows(["..", ".."]))
+    planner = IncrementalPlanner(game)
+    assert planner.plan() is not None
+    planner.game = some_game(Grid.from_rows([".*", "*."]), health=50)
+    assert planner.plan() is None
@@ -0,0 +1,72 @@
+import pytest
+
+from gridworld.costs import Costs
+from gridworld.grid import Grid
+from gridworld.labels import (
+    Label,
+    best_label,
+    check_costs,
+    cost_tables,
+    insert_label,
+    neighbor_table,
+)
+from gridworld.terrain import Terrain
+
+
+def test_label_cells():
+    root = Label(0, 10, 10)
+    mid = Label(1, 9, 9, parent=root, steps=1)
+    leaf = Label(4, 8, 8, parent=mid, steps=2)
+    assert leaf.cells() == [0, 1, 4]
+    assert root.cells() == [0]
+
+
+def test_insert_label():
+    front: list[Label] = []
+    a = Label(0, 10, 5)
+    assert insert_label(front, a)
+    # Equal labels are dominated.
+    assert not insert_label(front, Label(0, 10, 5))
+    assert not insert_label(front, Label(0, 9, 5))
+    b = Label(0, 5, 10)
+    assert insert_label(front, b)
+    assert front == [a, b]
+    c = Label(0, 10, 10)
+    assert insert_label(front, c)
+    assert front == [c]
+    assert a.dead and b.dead and not c.dead
+
+
+def test_check_costs():
+    check_costs(Costs())
+    hc = {t: 0 for t in Terrain}
+    hc[Terrain.MUD] = 1
+    with pytest.raises(ValueError) as err:
+        check_costs(Costs(health_costs=hc))
+    assert "positive health cost: mud" in str(err.value)
+
+
+def test_cost_tables():
+    grid = Grid.from_rows([".*", "+#"])
+    assert cost_tables(grid, Costs()) == ([0, -50, -5, -10], [-1, -10, 0, -5])
+
+
+def test_neighbor_table():
+    assert neighbor_table((2, 3)) == (
+        (1, 3),
+        (0, 2, 4),
+        (1, 5),
+        (0, 4),
+        (1, 3, 5),
+        (2, 4),
+    )
+    assert neighbor_table((1, 1)) == ((),)
+
+
+def test_best_label():
+    assert best_label([]) is None
+    assert best_label([Label(0, 0, 10)]) is None
+    a = Label(0, 10, 10, steps=5)
+    b = Label(0, 20, 5, steps=3)
+    c = Label(0, 5, 19, steps=1)
+    assert best_label([a, b, c]) is b
@@ -0,0 +1,184 @@
+import os
+from random import Random
+
+import pytest
+
+from gridworld.anytime import Budget
+from gridworld.costs import Costs
+from gridworld.direction import Direction
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.positions import side_positions
+from gridworld.terrain import Terrain
+from gridworld.tests.helpers import replay, some_game
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def brute_force_wellness(game: Game) -> float:
+    # Costs never increase resources, so simple paths suffice.
+    best = 0.0
+    stack = [(game.agent, {game.agent.position})]
+    while stack:
+        agent, visited = stack.pop()
+        if agent.position == game.goal_position:
+            w = agent.health * agent.moves
+            best = max(best, w / (agent.max_health * agent.max_moves))
+            continue
+        for d in Direction:
+            nxt = game.speculative_move(d, agent)
+            if nxt is None or nxt.is_dead() or nxt.position in visited:
+                continue
+            stack.append((nxt, visited | {nxt.position}))
+    return best
+
+
+def load_game(name: str) -> Game:
+    with open(os.path.join(GRIDS_DIR, name)) as f:
+        return some_game(Grid.from_str(f.read()))
+
+
+def test_pareto_solver_trivial():
+    game = some_game(Grid.from_rows(["."]))
+    got = ParetoSolver(game).solve()
+    assert got is not None
+    assert got.path == [(0, 0)]
+    assert got.agent.health == 200
+    assert got.agent.moves == 450
+
+
+def test_pareto_solver_prefers_wellness():
+    # Straight across the lava row costs more than detouring via blanks.
+    grid = Grid.from_rows(["...", "**.", "..."])
+    game = some_game(grid, health=100, moves=100)
+    got = ParetoSolver(game).solve()
+    assert got is not None
+    assert got.path == [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2)]
+    assert got.agent.position == (2, 2)
+    assert (got.agent.health, got.agent.moves) == (100, 96)
+    assert got.agent.max_health == 200
+
+
+def test_pareto_solver_unsolvable():
+    grid = Grid.from_rows([".*", "*."])
+    game = some_game(grid, health=50)
+    assert ParetoSolver(game).solve() is None
+
+
+def test_pareto_solver_rejects_positive_costs():
+    hc = {t: 0 for t in Terrain}
+    hc[Terrain.BLANK] = 5
+    game = some_game(Grid.from_rows([".."]))
+    game.costs = Costs(health_costs=hc)
+    with pytest.raises(ValueError):
+        ParetoSolver(game)
+
+
+def test_pareto_solver_matches_brute_force():
+    rand = Random(1234)
+    for _ in range(40):
+        grid = Grid.random((3, 4), rand=rand)
+        game = some_game(grid, health=60, moves=20)
+        got = ParetoSolver(game).solve()
+        expected = brute_force_wellness(game)
+        if expected == 0.0:
+            assert got is None
+            continue
+        assert got is not None
+        assert got.wellness == pytest.approx(expected)
+        assert replay(game, got.path) == got.agent
+
+
+@pytest.mark.parametrize(
+    "name,solvable",
+    [
+        ("solvable-10x10-grid.out", True),
+        ("solvable-19x18-grid.out", True),
+        ("solvable-20x20-grid.out", True),
+        ("solvable-24x30-grid.out", True),
+        ("unsolvable-16x16-grid.out", False),
+        ("unsolvable-50x50-grid.out", False),
+    ],
+)
+def test_pareto_solver_grid_corpus(name, solvable):
+    game = load_game(name)
+    got = ParetoSolver(game).solve()
+    assert (got is not None) == solvable
+    if got is not None:
+        assert got.path[0] == game.start_position
+        assert got.path[-1] == game.goal_position
+        assert replay(game, got.path) == got.agent
+
+
+def test_pareto_solver_budget_reports_improvements():
+    game = load_game("solvable-24x30-grid.out")
+    want = ParetoSolver(game).solve()
+    assert want is not None
+    improved = []
+    sv = ParetoSolver(game)
+    got = sv.solve(budget=Budget(seconds=60), on_improve=improved.append)
+    assert sv.complete is True
+    assert got == want
+    scores = [ta.agent.health * ta.agent.moves for ta in improved]
+    assert scores == sorted(set(scores))
+    assert scores[-1] == want.agent.health * want.agent.moves
+
+
+def test_pareto_solver_budget_stops_early():
+    game = load_game("solvable-24x30-grid.out")
+    sv = ParetoSolver(game)
+    sv.solve(budget=Budget(expansions=5))
+    assert sv.complete is False
+    assert sv.expanded == 5
+
+
+def test_pareto_solver_sides_match_pairwise_solves():
+    rng = Random(20)
+    for _ in range(40):
+        m, n = rng.randint(1, 6), rng.randint(1, 6)
+        grid = Grid.random((m, n), rng)
+        health, moves = rng.randint(1, 200), rng.randint(1, 20)
+        starts = side_positions(dimensions=(m, n), side=Direction.LEFT)
+        goals = side_positions(dimensions=(m, n), side=Direction.RIGHT)
+        game = some_game(grid, health, moves)
+        got = ParetoSolver(game, starts=starts, goals=goals).solve()
+        want = 0
+        for start in starts:
+            for goal in goals:
+                pair = some_game(grid, health, moves)
+                pair.agent.position = pair.start_position = start
+                pair.goal_position = goal
+                one = ParetoSolver(pair).solve()
+                if one is not None:
+                    want = max(want, one.agent.health * one.agent.moves)
+        if want == 0:
+            assert got is None
+            continue
+        assert got is not None
+        assert got.agent.health * got.agent.moves == want
+        assert got.path[0] in starts
+        assert got.path[-1] in goals
+
+
+def test_pareto_solver_sides_beat_corners():
+    # Lava walls the corners off, but the middle row crosses cleanly.
+    grid = Grid.from_rows(["*.*", "...", "*.*"])
+    game = some_game(grid, health=40)
+    assert ParetoSolver(game).solve() is None
+    got = ParetoSolver(
+        game,
+        starts=[(0, 0), (1, 0), (2, 0)],
+        goals=[(0, 2), (1, 2), (2, 2)],
+    ).solve()
+    assert got is not None
+    assert got.path == [(1, 0), (1, 1), (1, 2)]
+    assert (got.agent.health, got.agent.moves) == (40, 448)
+
+
+def test_pareto_solver_invalid_sides():
+    game = some_game(Grid.from_rows(["..", ".."]))
+    with pytest.raises(ValueError, match="no starts"):
+        ParetoSolver(game, starts=[])
+    with pytest.raises(ValueError, match=r"invalid goal: \(2, 0\)"):
+        ParetoSolver(game, goals=[(1, 1), (2, 0)])
@@ -1,6 +1,7 @@
 from gridworld.positions import (
     neighborhood,
     neighbors,
+    side_positions,
     translate_along,
     valid_directions_from,
 )
@@ -62,3 +63,25 @@ def test_valid_directions_from():
         Direction.RIGHT,
     }
     assert valid_directions_from(dimensions=(1, 1), position=(0, 0)) == set()
+
+
+def test_side_positions():
+    dims = (2, 3)
+    assert side_positions(dimensions=dims, side=Direction.UP) == (
+        (0, 0),
+        (0, 1),
+        (0, 2),
+    )
+    assert side_positions(dimensions=dims, side=Direction.DOWN) == (
+        (1, 0),
+        (1, 1),
+        (1, 2),
+    )
+    assert side_positions(dimensions=dims, side=Direction.LEFT) == (
+        (0, 0),
+        (1, 0),
+    )
+    assert side_positions(dimensions=dims, side=Direction.RIGHT) == (
+        (0, 2),
+        (1, 2),
+    )
@@ -0,0 +1,100 @@
+import pytest
+
+from gridworld.agent import Agent
+from gridworld.costs import Costs
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.solve_cache import SolveCache, solve_key
+from gridworld.terrain import Terrain
+
+
+def some_game(rows=(".+", "#."), health=200) -> Game:
+    grid = Grid.from_rows(rows)
+    m, n = grid.dimensions
+    return Game(
+        grid=grid,
+        agent=Agent((0, 0), health=health),
+        start_position=(0, 0),
+        goal_position=(m - 1, n - 1),
+        costs=Costs(),
+    )
+
+
+def test_solve_key():
+    game = some_game()
+    key = solve_key(game, "pareto")
+    assert key == solve_key(some_game(), "pareto")
+    assert key != solve_key(game, "astar")
+    assert key != solve_key(some_game(rows=(".+", "*.")), "pareto")
+    assert key != solve_key(some_game(health=100), "pareto")
+    other_costs = some_game()
+    hc = dict(Costs().health_costs)
+    hc[Terrain.MUD] = -11
+    other_costs.costs = Costs(health_costs=hc)
+    assert key != solve_key(other_costs, "pareto")
+    # Engine options that change answers change the key.
+    assert key == solve_key(game, "pareto", {})
+    wide = solve_key(game, "beam", {"beam_width": 4096})
+    assert wide != solve_key(game, "beam", {"beam_width": 4})
+    assert wide == solve_key(game, "beam", {"beam_width": 4096})
+
+
+def test_solve_cache_init_bad_args():
+    with pytest.raises(ValueError) as err:
+        SolveCache(max_entries=0)
+    assert "non-positive max_entries: 0" in str(err.value)
+
+
+def test_solve_cache_solve():
+    cache = SolveCache()
+    game = some_game()
+    calls = []
+
+    def solve():
+        calls.append(1)
+        return ParetoSolver(game).solve()
+
+    first = cache.solve(game, "pareto", solve)
+    second = cache.solve(game, "pareto", solve)
+    assert first is not None
+    assert first == second
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_solve_cache_caches_unsolvable():
+    cache = SolveCache()
+    game = some_game(rows=(".*", "*."), health=50)
+    calls = []
+
+    def solve():
+        calls.append(1)
+        return ParetoSolver(game).solve()
+
+    assert cache.solve(game, "pareto", solve) is None
+    assert cache.solve(game, "pareto", solve) is None
+    assert len(calls) == 1
+
+
+def test_solve_cache_evicts_least_recently_used():
+    cache = SolveCache(max_entries=2)
+    cache.put("a", None)
+    cache.put("b", None)
+    assert cache.get("a") == "null"
+    cache.put("c", None)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "null"
+    assert cache.get("c") == "null"
+
+
+def test_solve_cache_persists(tmp_path):
+    db_path = tmp_path / "cache.sqlite3"
+    game = some_game()
+    expected = ParetoSolver(game).solve()
+    SolveCache(db_path).put(solve_key(game, "pareto"), expected)
+    cache = SolveCache(db_path)
+    got = cache.solve(game, "pareto", lambda: None)
+    assert got == expected
+    assert cache.hits == 1
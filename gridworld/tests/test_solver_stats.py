@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.solver_stats import SolverStats
+from gridworld.solvers import SolverEngine, make_solver
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def test_solver_stats_to_json_str():
+    stats = SolverStats(popped=3, pruned=1, peak_queue=2, search_time=0.5)
+    assert json.loads(stats.to_json_str()) == {
+        "popped": 3,
+        "pruned": 1,
+        "duplicates": 0,
+        "peak_queue": 2,
+        "peak_live": 0,
+        "setup_time": 0.0,
+        "search_time": 0.5,
+        "reconstruct_time": 0.0,
+    }
+
+
+@pytest.mark.parametrize("engine", list(SolverEngine))
+def test_solver_stats_per_engine(engine):
+    with open(os.path.join(GRIDS_DIR, "solvable-10x10-grid.out")) as f:
+        game = Game.from_grid(Grid.from_str(f.read()))
+    sv = make_solver(engine, game)
+    assert sv.solve() is not None
+    stats = sv.stats
+    assert stats.peak_live > 0
+    assert stats.search_time > 0.0
+    assert stats.setup_time >= 0.0
+    assert stats.reconstruct_time >= 0.0
+    if engine != SolverEngine.DP:
+        assert stats.popped >= sv.expanded > 0
+        assert stats.peak_queue > 0
+
+
+def test_solver_stats_bfs_counts():
+    game = Game.from_grid(Grid.from_rows(["..", ".."]))
+    sv = make_solver(SolverEngine.BFS, game)
+    sv.solve()
+    stats = sv.stats
+    assert stats.popped == sv.expanded
+    assert stats.duplicates > 0
+    # Every cell ends up holding its best state.
+    assert stats.peak_live >= 4
+    assert stats.peak_queue >= 2
+
+
+@pytest.mark.parametrize("engine", [SolverEngine.BFS, SolverEngine.PARETO])
+def test_solver_stats_reset_per_solve(engine):
+    game = Game.from_grid(Grid.from_rows(["...", "...", "..."]))
+    sv = make_solver(engine, game)
+    sv.solve()
+    first = sv.stats
+    sv.solve()
+    assert sv.stats is not first
+    assert sv.stats.popped == first.popped
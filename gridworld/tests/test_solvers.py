@@ -0,0 +1,85 @@
+import pytest
+
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.solvers import (
+    ANYTIME_ENGINES,
+    SOLVERS,
+    SolverEngine,
+    SolverOptions,
+    answer_options,
+    make_solver,
+    register_solver,
+    solver_entry,
+)
+
+
+@pytest.fixture
+def registered():
+    names = []
+
+    def register(name, factory, **kwargs):
+        entry = register_solver(name, factory, **kwargs)
+        names.append(name)
+        return entry
+
+    yield register
+    for name in names:
+        del SOLVERS[name]
+
+
+def test_builtin_engines_registered():
+    assert sorted(SOLVERS) == sorted(e.value for e in SolverEngine)
+    assert ANYTIME_ENGINES == {
+        SolverEngine.BFS,
+        SolverEngine.EVOLUTION,
+        SolverEngine.PARETO,
+    }
+    game = Game.from_grid(Grid.from_rows(["..", ".."]))
+    assert isinstance(make_solver("pareto", game), ParetoSolver)
+    sv = make_solver(SolverEngine.EVOLUTION, game, population=8, seed=3)
+    assert (sv.population, sv.seed) == (8, 3)
+
+
+def test_register_solver(registered):
+    seen = []
+
+    def factory(game, options):
+        seen.append(options.beam_width)
+        return ParetoSolver(game)
+
+    entry = registered("mine", factory, anytime=True, benchmark_cells=9)
+    assert solver_entry("mine") is entry
+    assert (entry.anytime, entry.benchmark_cells) == (True, 9)
+    game = Game.from_grid(Grid.from_rows([".."]))
+    assert isinstance(make_solver("mine", game, beam_width=7), ParetoSolver)
+    assert seen == [7]
+
+
+def test_register_solver_invalid(registered):
+    with pytest.raises(ValueError, match="duplicate solver engine: 'dp'"):
+        registered("dp", lambda game, o: None)
+    with pytest.raises(ValueError, match="invalid solver engine name: ''"):
+        registered("", lambda game, o: None)
+    with pytest.raises(ValueError, match="non-positive benchmark_cells: 0"):
+        registered("mine", lambda game, o: None, benchmark_cells=0)
+    assert "mine" not in SOLVERS
+    with pytest.raises(ValueError, match=r"unknown solver options: \['x'\]"):
+        registered("mine", lambda game, o: None, options=("x",))
+    with pytest.raises(ValueError, match="unknown solver engine: 'nope'"):
+        make_solver("nope", Game.from_grid(Grid.from_rows([".."])))
+
+
+def test_answer_options():
+    options = SolverOptions(beam_width=4, tile_size=8, seed=1, workers=3)
+    assert answer_options("beam", options) == {"beam_width": 4}
+    assert answer_options("evolution", options) == {
+        "population": options.population,
+        "seed": 1,
+    }
+    assert answer_options("hierarchical", options) == {
+        "tile_size": 8,
+        "portals": options.portals,
+    }
+    assert answer_options("strip", options) == {}
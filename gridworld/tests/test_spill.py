@@ -0,0 +1,48 @@
+from array import array
+
+import pytest
+
+from gridworld.spill import SpillFile, mapped_table
+
+
+def test_spill_file_fifo():
+    spill = SpillFile()
+    assert spill.pop() is None
+    spill.push(array("i", [1, 2, 3]))
+    spill.push(array("i"))
+    spill.push(array("i", [4, 5]))
+    assert len(spill) == 2
+    assert spill.items == 5
+    assert [list(c) for c in spill.chunks()] == [[1, 2, 3], [4, 5]]
+    assert spill.pop() == array("i", [1, 2, 3])
+    spill.push(array("i", [6]))
+    assert spill.pop() == array("i", [4, 5])
+    assert spill.pop() == array("i", [6])
+    assert spill.pop() is None
+    assert spill.items == 0
+    spill.close()
+
+
+def test_spill_file_directory(tmp_path):
+    spill = SpillFile(str(tmp_path))
+    spill.push(array("i", [7]))
+    assert len(list(tmp_path.iterdir())) == 1
+    spill.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_mapped_table(tmp_path):
+    best = mapped_table("i", 5, 0xFF, str(tmp_path))
+    assert list(best) == [-1] * 5
+    best[2] = 40
+    best[:] = array("i", [0, 1, 2, 3, 4])
+    assert list(best) == [0, 1, 2, 3, 4]
+    seen = mapped_table("B", 3)
+    assert bytes(seen) == b"\x00\x00\x00"
+    seen[1] = 1
+    assert bytes(seen) == b"\x00\x01\x00"
+    assert len(mapped_table("i", 0)) == 0
+    # The backing file is unnamed.
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(ValueError, match="negative count: -1"):
+        mapped_table("B", -1)
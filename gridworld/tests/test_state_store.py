@@ -0,0 +1,66 @@
+from gridworld.state_store import StateStore
+
+
+def test_state_store_add():
+    store = StateStore()
+    root = store.add(3, 200, 450, StateStore.NO_PARENT)
+    child = store.add(4, 190, 449, root)
+    assert (store.cell[child], store.health[child], store.moves[child]) == (
+        4,
+        190,
+        449,
+    )
+    assert store.parent[child] == root
+    assert store.cells(child) == [3, 4]
+    assert len(store) == 2
+
+
+def test_state_store_release_cascades():
+    store = StateStore()
+    root = store.add(0, 10, 10, StateStore.NO_PARENT)
+    a = store.add(1, 9, 9, root)
+    b = store.add(2, 8, 8, a)
+    store.release(root)
+    store.release(a)
+    # b still holds a, which holds root.
+    assert len(store) == 3
+    store.release(b)
+    assert len(store) == 0
+    assert store.peak_live == 3
+
+
+def test_state_store_reuses_slots():
+    store = StateStore()
+    root = store.add(0, 10, 10, StateStore.NO_PARENT)
+    a = store.add(1, 9, 9, root)
+    store.release(a)
+    b = store.add(2, 8, 8, root)
+    assert b == a
+    assert store.cells(b) == [0, 2]
+    assert len(store.cell) == 2
+
+
+def test_state_store_hold():
+    store = StateStore()
+    root = store.add(0, 10, 10, StateStore.NO_PARENT)
+    store.hold(root)
+    store.release(root)
+    assert len(store) == 1
+    store.release(root)
+    assert len(store) == 0
+
+
+def test_state_store_columns_round_trip():
+    store = StateStore()
+    root = store.add(0, 10, 10, StateStore.NO_PARENT)
+    a = store.add(1, 9, 9, root)
+    store.release(store.add(2, 8, 8, a))
+    copied = StateStore.from_columns(
+        {k: v[:] for k, v in store.columns().items()}, store.peak_live
+    )
+    assert len(copied) == 2
+    assert copied.peak_live == 3
+    assert copied.cells(a) == [0, 1]
+    copied.release(root)
+    copied.release(a)
+    assert len(copied) == 0
@@ -0,0 +1,125 @@
+import multiprocessing
+import os
+from random import Random
+from types import MappingProxyType
+from unittest.mock import patch
+
+import pytest
+
+from gridworld.costs import STD_HEALTH_COSTS, Costs
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.strip_solver import StripSolver
+from gridworld.terrain import Terrain
+from gridworld.tests.helpers import replay, some_game
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def assert_same(game: Game, got, want):
+    if want is None:
+        assert got is None
+        return
+    assert got is not None
+    assert (got.agent.health, got.agent.moves) == (
+        want.agent.health,
+        want.agent.moves,
+    )
+    assert got.path[0] == game.agent.position
+    assert got.path[-1] == game.goal_position
+    agent = replay(game, got.path)
+    assert (agent.health, agent.moves) == (got.agent.health, got.agent.moves)
+
+
+def test_strip_solver_trivial():
+    game = some_game(Grid.from_rows(["."]))
+    sv = StripSolver(game, workers=4)
+    got = sv.solve()
+    assert got is not None
+    assert got.path == [(0, 0)]
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"workers": 0}, "non-positive workers: 0"),
+        ({"band": 0}, "non-positive band: 0"),
+    ],
+)
+def test_strip_solver_invalid(kwargs, message):
+    game = some_game(Grid.from_rows([".."]))
+    with pytest.raises(ValueError, match=message):
+        StripSolver(game, **kwargs)
+
+
+def test_strip_solver_unsolvable():
+    game = some_game(Grid.from_rows([".*", "*."]), health=50)
+    assert StripSolver(game, workers=2).solve() is None
+
+
+def test_strip_solver_crosses_back_and_forth():
+    # Lava walls force the path down, up and down again across strips.
+    grid = Grid.from_rows(
+        [
+            ".*...",
+            ".*.*.",
+            ".*.*.",
+            ".*.*.",
+            "...*.",
+        ]
+    )
+    game = some_game(grid, start=(0, 0), goal=(0, 4))
+    want = ParetoSolver(game).solve()
+    for workers in (1, 2, 5):
+        sv = StripSolver(game, workers=workers)
+        got = sv.solve()
+        assert_same(game, got, want)
+        assert got is not None
+        assert len(got.path) == 13
+    assert sv.rounds > 1
+
+
+def test_strip_solver_matches_pareto():
+    rng = Random(22)
+    terrains = list(Terrain)
+    for _ in range(25):
+        m, n = rng.randint(1, 9), rng.randint(1, 9)
+        grid = Grid((m, n), [rng.choice(terrains) for _ in range(m * n)])
+        start = (rng.randrange(m), rng.randrange(n))
+        goal = (rng.randrange(m), rng.randrange(n))
+        game = some_game(
+            grid, rng.randint(1, 200), rng.randint(1, 40), start, goal
+        )
+        want = ParetoSolver(game).solve()
+        got = StripSolver(
+            game, workers=rng.randint(1, 4), band=rng.randint(1, 80)
+        ).solve()
+        assert_same(game, got, want)
+
+
+def test_strip_solver_bundled_grid():
+    with open(os.path.join(GRIDS_DIR, "solvable-24x30-grid.out")) as f:
+        game = Game.from_grid(Grid.from_str(f.read()))
+    want = ParetoSolver(game).solve()
+    sv = StripSolver(game, workers=3)
+    assert_same(game, sv.solve(), want)
+    assert sv.expanded > 0
+    assert sv.stats.popped >= sv.expanded
+    assert sv.stats.peak_live > 0
+
+
+def test_strip_solver_spawned_workers():
+    # Spawned workers, the default on macOS and Windows, get everything
+    # pickled, which Costs mappings are not.
+    grid = Grid.random((8, 6), Random(5))
+    costs = Costs(
+        health_costs=MappingProxyType({**STD_HEALTH_COSTS, Terrain.LAVA: -1})
+    )
+    game = some_game(grid, costs=costs)
+    spawn = multiprocessing.get_context("spawn")
+    with patch("gridworld.strip_solver.Process", spawn.Process):
+        got = StripSolver(game, workers=2).solve()
+    want = ParetoSolver(game).solve()
+    assert got is not None and want is not None
+    assert got.wellness == want.wellness
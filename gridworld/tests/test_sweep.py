@@ -0,0 +1,155 @@
+import json
+import os
+from random import Random
+from types import MappingProxyType
+
+import pytest
+
+from gridworld.agent import Agent
+from gridworld.costs import STD_HEALTH_COSTS, STD_MOVE_COSTS, Costs
+from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.pareto_solver import ParetoSolver
+from gridworld.solve_cache import SolveCache
+from gridworld.solvers import SolverEngine, SolverOptions
+from gridworld.sweep import SweepCase, sweep
+from gridworld.terrain import Terrain
+
+GRIDS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "grids")
+
+
+def some_game(grid: Grid, case: SweepCase) -> Game:
+    m, n = grid.dimensions
+    return Game(
+        grid=grid,
+        agent=Agent(
+            (0, 0),
+            health=case.health,
+            max_health=case.health,
+            moves=case.moves,
+            max_moves=case.moves,
+        ),
+        start_position=(0, 0),
+        goal_position=(m - 1, n - 1),
+        costs=case.costs,
+    )
+
+
+def lava_costs(health: int) -> Costs:
+    return Costs(
+        health_costs=MappingProxyType(
+            {**STD_HEALTH_COSTS, Terrain.LAVA: health}
+        )
+    )
+
+
+def test_sweep_matches_pareto_in_case_order():
+    grid = Grid.random((8, 9), Random(24))
+    cases = [
+        SweepCase(lava_costs(-k), health, moves)
+        for k in (1, 20, 50)
+        for health, moves in ((200, 450), (60, 25), (10, 12))
+    ]
+    records = sweep(grid, cases, workers=2)
+    assert [r.case for r in records] == list(range(len(cases)))
+    for record, case in zip(records, cases):
+        want = ParetoSolver(some_game(grid, case)).solve()
+        assert record.costs == json.loads(case.costs.to_json_str())
+        assert (record.max_health, record.max_moves) == (
+            case.health,
+            case.moves,
+        )
+        assert record.solvable == (want is not None)
+        if want is None:
+            assert record.health is None and record.wellness is None
+            continue
+        assert (record.health, record.moves) == (
+            want.agent.health,
+            want.agent.moves,
+        )
+        assert record.wellness == want.wellness
+        assert record.steps == len(want.path) - 1
+
+
+def test_sweep_reports_infeasible_cases():
+    grid = Grid.from_rows(["..", ".."])
+    cases = [SweepCase(health=5, moves=1), SweepCase(health=5, moves=3)]
+    first, second = sweep(grid, cases, engine=SolverEngine.ASTAR, workers=1)
+    assert not first.solvable
+    assert first.infeasible == "moves"
+    assert first.expanded == 0
+    assert second.solvable
+    assert (second.health, second.moves, second.steps) == (5, 1, 2)
+    assert json.loads(second.to_json_str())["infeasible"] is None
+
+
+def test_sweep_options():
+    with open(os.path.join(GRIDS_DIR, "solvable-10x10-grid.out")) as f:
+        grid = Grid.from_str(f.read())
+    default, narrow = (
+        sweep(grid, [SweepCase()], engine=SolverEngine.BEAM, options=o)[0]
+        for o in (None, SolverOptions(beam_width=1))
+    )
+    assert (default.health, default.moves) == (135, 421)
+    assert (narrow.health, narrow.moves) == (115, 407)
+
+
+def test_sweep_cache():
+    grid = Grid.random((6, 7), Random(3))
+    cases = [SweepCase(health=200, moves=m) for m in (3, 40, 60)]
+    cache = SolveCache()
+    first = sweep(grid, cases, workers=1, cache=cache)
+    assert first[0].infeasible == "moves"
+    assert first[1].solvable and first[2].solvable
+    assert cache.misses == 3 and len(cache) == 2
+    # Infeasible cases are proven so again rather than cached.
+    second = sweep(grid, cases, workers=1, cache=cache)
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert [r.case for r in second] == [0, 1, 2]
+    for a, b in zip(first, second):
+        assert (a.solvable, a.health, a.moves, a.steps) == (
+            b.solvable,
+            b.health,
+            b.moves,
+            b.steps,
+        )
+    assert second[1].expanded == 0
+
+
+def test_sweep_case_from_json_str():
+    case = SweepCase.from_json_str('{"moves": 30}')
+    assert case == SweepCase(Costs(), 200, 30)
+    cheap = {
+        "health_costs": {"blank": 0, "speeder": 0, "lava": -1, "mud": 0},
+        "move_costs": {t.abbr: v for t, v in STD_MOVE_COSTS.items()},
+    }
+    case = SweepCase.from_json_str(json.dumps({"costs": cheap, "health": 9}))
+    assert case.costs.health_cost_of(Terrain.LAVA) == -1
+    assert (case.health, case.moves) == (9, 450)
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"cases": []}, "no cases"),
+        ({"engine": SolverEngine.STRIP}, "unsupported engine: strip"),
+        ({"workers": 0}, "non-positive workers: 0"),
+        ({"chunksize": 0}, "non-positive chunksize: 0"),
+    ],
+)
+def test_sweep_invalid(kwargs, message):
+    args = {"grid": Grid.from_rows([".."]), "cases": [SweepCase()], **kwargs}
+    with pytest.raises(ValueError, match=message):
+        sweep(**args)
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"health": 0}, "non-positive health: 0"),
+        ({"moves": -1}, "non-positive moves: -1"),
+    ],
+)
+def test_sweep_case_invalid(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        SweepCase(**kwargs)
@@ -6,6 +6,9 @@ from unittest.mock import patch
 from gridworld.database import Database
 from gridworld.direction import Direction
 from gridworld.game import Game
+from gridworld.grid import Grid
+from gridworld.solve_cache import SolveCache
+from gridworld import web
 from gridworld.web import app
 
 client = TestClient(app)
@@ -112,7 +115,11 @@ def test_get_game_status_by_id_found_win(get_game_by_id_mock, get_db_mock):
     get_game_by_id_mock.return_value = game1
     response = client.get("/games/1/status")
     assert response.status_code == 200
-    assert response.json() == {"status": "win"}
+    assert response.json() == {
+        "status": "win",
+        "winnable": True,
+        "best_direction": None,
+    }
 
 
 @patch("gridworld.web.get_db")
@@ -125,7 +132,11 @@ def test_get_game_status_by_id_found_loss(get_game_by_id_mock, get_db_mock):
     get_game_by_id_mock.return_value = game1
     response = client.get("/games/2/status")
     assert response.status_code == 200
-    assert response.json() == {"status": "loss"}
+    assert response.json() == {
+        "status": "loss",
+        "winnable": False,
+        "best_direction": None,
+    }
 
 
 @patch("gridworld.web.get_db")
@@ -138,7 +149,29 @@ def test_get_game_status_by_id_found_ongoing(get_game_by_id_mock, get_db_mock):
     get_game_by_id_mock.return_value = game1
     response = client.get("/games/3/status")
     assert response.status_code == 200
-    assert response.json() == {"status": "ongoing"}
+    assert response.json() == {
+        "status": "ongoing",
+        "winnable": True,
+        "best_direction": "R",
+    }
+
+
+@patch("gridworld.web.get_db")
+@patch("gridworld.game_repo.GameRepo.get_game_by_id")
+def test_get_game_status_by_id_found_unwinnable(
+    get_game_by_id_mock, get_db_mock
+):
+    get_db_mock.return_value = Database()
+    game1 = Game.from_grid(Grid.from_rows([".*", "*."]))
+    game1.agent.health = 50
+    get_game_by_id_mock.return_value = game1
+    response = client.get("/games/4/status")
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "ongoing",
+        "winnable": False,
+        "best_direction": None,
+    }
 
 
 @patch("gridworld.web.get_db")
@@ -227,3 +260,95 @@ def test_update_game_by_id_bump_into_wall(
     assert response.json() == {"message": "direction had no effect: U"}
     # Verify that no mutation occurred.
     assert game1 == old_game1
+
+
+@patch("gridworld.web.get_db")
+@patch("gridworld.game_repo.GameRepo.get_game_by_id")
+def test_get_game_plan_by_id_not_found(get_game_by_id_mock, get_db_mock):
+    get_db_mock.return_value = Database()
+    get_game_by_id_mock.return_value = None
+    response = client.get("/games/42/plan")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "game not found"}
+
+
+@patch("gridworld.web.get_solve_cache")
+@patch("gridworld.web.get_db")
+@patch("gridworld.game_repo.GameRepo.get_game_by_id")
+def test_get_game_plan_by_id_found(
+    get_game_by_id_mock, get_db_mock, get_solve_cache_mock
+):
+    get_db_mock.return_value = Database()
+    get_solve_cache_mock.return_value = SolveCache()
+    game1 = Game.from_grid(Grid.from_rows([".+", "#."]))
+    get_game_by_id_mock.return_value = game1
+    response = client.get("/games/7/plan")
+    assert response.status_code == 200
+    assert response.json() == {
+        "path": [[0, 0], [0, 1], [1, 1]],
+        "health": 195,
+        "moves": 449,
+    }
+    # Replaying the planned move reuses the planner's search.
+    game2 = Game.from_json_str(game1.to_json_str())
+    assert game2.move(Direction.RIGHT) is True
+    get_game_by_id_mock.return_value = game2
+    response = client.get("/games/7/plan")
+    assert response.json() == {
+        "path": [[0, 1], [1, 1]],
+        "health": 195,
+        "moves": 449,
+    }
+    assert web.planners[7].last_expanded == 0
+
+
+@patch("gridworld.web.get_db")
+@patch("gridworld.game_repo.GameRepo.get_game_by_id")
+def test_get_game_plan_by_id_unwinnable(get_game_by_id_mock, get_db_mock):
+    get_db_mock.return_value = Database()
+    game1 = Game.from_grid(Grid.from_rows([".*", "*."]))
+    game1.agent.health = 50
+    get_game_by_id_mock.return_value = game1
+    response = client.get("/games/8/plan")
+    assert response.status_code == 200
+    assert response.json() == {"path": None, "infeasible": "health"}
+
+
+@patch("gridworld.web.get_solve_cache")
+@patch("gridworld.web.get_db")
+@patch("gridworld.game_repo.GameRepo.get_game_by_id")
+def test_get_game_plan_by_id_cached(
+    get_game_by_id_mock, get_db_mock, get_solve_cache_mock
+):
+    get_db_mock.return_value = Database()
+    cache = SolveCache()
+    get_solve_cache_mock.return_value = cache
+    get_game_by_id_mock.return_value = Game.from_grid(
+        Grid.from_rows([".+", "#."])
+    )
+    first = client.get("/games/9/plan").json()
+    web.planners.pop(9)
+    # Another game in the same state is answered without a planner.
+    get_game_by_id_mock.return_value = Game.from_grid(
+        Grid.from_rows([".+", "#."])
+    )
+    assert client.get("/games/10/plan").json() == first
+    assert 10 not in web.planners
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@patch("gridworld.web.STATUS_SECONDS", 1e-9)
+@patch("gridworld.web.get_db")
+@patch("gridworld.game_repo.GameRepo.get_game_by_id")
+def test_get_game_status_by_id_goal_table_over_budget(
+    get_game_by_id_mock, get_db_mock
+):
+    get_db_mock.return_value = Database()
+    get_game_by_id_mock.return_value = Game.from_dimensions((40, 40))
+    response = client.get("/games/5/status")
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "ongoing",
+        "winnable": None,
+        "best_direction": None,
+    }
@@ -0,0 +1,130 @@
+from typing import List
+
+import pytest
+
+from gridworld.agent import Agent
+from gridworld.anytime import Budget
+from gridworld.direction import Direction
+from gridworld.grid import Grid
+from gridworld.wellness_solver import TravelingAgent, WellnessSolver
+from gridworld.tests.helpers import some_game
+
+
+def test_traveling_agent_to_json_str():
+    ag = Agent((1, 1), health=10, max_health=100, moves=20, max_moves=200)
+    ta = TravelingAgent(agent=ag, path=[(0, 0), (0, 1), (1, 1)])
+    assert ta.to_json_str() == (
+        '{"agent": {"position": [1, 1],'
+        + ' "health": 10, "max_health": 100,'
+        + ' "moves": 20, "max_moves": 200},'
+        + ' "path": [[0, 0], [0, 1], [1, 1]]}'
+    )
+
+
+def test_traveling_agent_from_json_str():
+    ag = Agent((1, 1), health=10, max_health=100, moves=20, max_moves=200)
+    ta = TravelingAgent(agent=ag, path=[(0, 0), (0, 1), (1, 1)])
+    assert TravelingAgent.from_json_str(ta.to_json_str()) == ta
+
+
+def test_wellness_solver_does_not_print(capsys):
+    game = some_game(Grid.from_rows(["..", ".."]))
+    got = WellnessSolver(game).solve()
+    assert got is not None
+    assert capsys.readouterr().out == ""
+
+
+def test_wellness_solver_budget():
+    game = some_game(Grid.from_rows(["...", "...", "..."]))
+    full = WellnessSolver(game)
+    want = full.solve()
+    assert full.complete is True
+    improved: List[TravelingAgent] = []
+    sv = WellnessSolver(game)
+    got = sv.solve(budget=Budget(expansions=10), on_improve=improved.append)
+    assert sv.complete is False
+    assert sv.expanded == 10
+    if got is not None:
+        assert improved[-1] == got
+    # Without a limit the budgeted walk finds the same answer.
+    improved.clear()
+    sv = WellnessSolver(game)
+    got = sv.solve(budget=Budget(seconds=60), on_improve=improved.append)
+    assert sv.complete is True
+    assert got == want
+    assert improved[-1] == got
+    wellness = [ta.wellness for ta in improved]
+    assert wellness == sorted(wellness)
+
+
+def test_wellness_solver_cancelled():
+    game = some_game(Grid.from_rows(["...", "...", "..."]))
+    budget = Budget()
+    budget.cancel()
+    sv = WellnessSolver(game)
+    assert sv.solve(budget=budget) is None
+    assert sv.expanded == 0
+    assert sv.complete is False
+
+
+def test_wellness_solver_path_replays():
+    game = some_game(Grid.from_rows([".#*.", "+..#", "*.+.", "..#."]))
+    got = WellnessSolver(game).solve()
+    assert got is not None
+    assert got.path[0] == (0, 0)
+    assert got.path[-1] == game.goal_position
+    for a, b in zip(got.path, got.path[1:]):
+        step = (b[0] - a[0], b[1] - a[1])
+        direction = {
+            (-1, 0): Direction.UP,
+            (1, 0): Direction.DOWN,
+            (0, -1): Direction.LEFT,
+            (0, 1): Direction.RIGHT,
+        }[step]
+        assert game.move(direction) is True
+    assert game.agent == got.agent
+
+
+def test_wellness_solver_spills(tmp_path):
+    game = some_game(Grid.from_rows([".#*.+", "+..#.", "*.+..", "..#.*"]))
+    plain = WellnessSolver(game)
+    want = plain.solve()
+    # Small enough to spill both the queue and the per-cell tables.
+    sv = WellnessSolver(game, memory_limit=64, spill_dir=str(tmp_path))
+    assert sv.solve() == want
+    assert sv.expanded == plain.expanded
+    assert sv.stats.peak_queue == plain.stats.peak_queue
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_wellness_solver_resume(tmp_path):
+    game = some_game(Grid.from_rows([".#*.+", "+..#.", "*.+..", "..#.*"]))
+    plain = WellnessSolver(game)
+    want = plain.solve()
+    path = str(tmp_path / "bfs.checkpoint")
+    sv = WellnessSolver(game, memory_limit=64, checkpoint=path)
+    sv.solve(budget=Budget(expansions=plain.expanded // 2))
+    assert sv.complete is False
+    sv = WellnessSolver.resume(path)
+    assert sv.checkpoint == path
+    assert sv.solve() == want
+    assert sv.complete is True
+    assert sv.expanded == plain.expanded
+    assert sv.stats.popped == plain.stats.popped
+
+
+def test_wellness_solver_periodic_checkpoint(tmp_path):
+    game = some_game(Grid.from_rows(["....", "....", "....", "...."]))
+    path = tmp_path / "bfs.checkpoint"
+    sv = WellnessSolver(game, checkpoint=str(path), checkpoint_seconds=1e-9)
+    sv.solve()
+    assert path.exists()
+    assert WellnessSolver.resume(str(path)).solve() == sv.solve()
+
+
+def test_wellness_solver_invalid_spill_args():
+    game = some_game(Grid.from_rows([".."]))
+    with pytest.raises(ValueError, match="non-positive memory_limit: 0"):
+        WellnessSolver(game, memory_limit=0)
+    with pytest.raises(ValueError, match="non-positive checkpoint_seconds"):
+        WellnessSolver(game, checkpoint_seconds=0)
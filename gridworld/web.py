@@ -1,20 +1,39 @@
 import json
 import os
+from collections import OrderedDict
 from typing import Tuple
 
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from gridworld.anytime import Budget, solve_cancellable
 from gridworld.database import Database
 from gridworld.direction import Direction
+from gridworld.feasibility import find_infeasibility
 from gridworld.game import Game
 from gridworld.game_repo import GameRepo
+from gridworld.incremental_planner import IncrementalPlanner
+from gridworld.solve_cache import SolveCache
 
 app = FastAPI()
 
 db: Database | None = None
 
+# Planners keep their search between requests, most recently used last.
+MAX_PLANNERS = 64
+planners: OrderedDict[int, IncrementalPlanner] = OrderedDict()
+
+# Plan results, shared by every game; see get_solve_cache().
+solve_cache: SolveCache | None = None
+
+# The engine name plans are cached under.
+PLAN_ENGINE = "plan"
+
+# Seconds a status request may spend building a goal table before it
+# reports winnable and best_direction as unknown.
+STATUS_SECONDS = 0.5
+
 
 def get_db():
     db_name = os.getenv("DB_NAME", None)
@@ -26,6 +45,26 @@ def get_db():
     return db
 
 
+def get_solve_cache() -> SolveCache:
+    # SOLVE_CACHE names a sqlite file; unset, the cache is in memory.
+    global solve_cache
+    if solve_cache is None:
+        solve_cache = SolveCache(os.getenv("SOLVE_CACHE", ":memory:"))
+    return solve_cache
+
+
+def get_planner(game_id: int, game: Game) -> IncrementalPlanner:
+    planner = planners.pop(game_id, None)
+    if planner is None:
+        planner = IncrementalPlanner(game)
+    else:
+        planner.game = game
+    planners[game_id] = planner
+    while len(planners) > MAX_PLANNERS:
+        planners.popitem(last=False)
+    return planner
+
+
 def get_game_repo():
     game_repo = GameRepo(db=get_db())
     yield game_repo
@@ -108,8 +147,44 @@ async def get_game_status_by_id(
         raise HTTPException(status_code=404, detail="game not found")
     game: Game = game_maybe
     if game.is_win():
-        return {"status": "win"}
+        status = "win"
     elif game.is_loss():
-        return {"status": "loss"}
+        status = "loss"
     else:
-        return {"status": "ongoing"}
+        status = "ongoing"
+    # The goal table searches the whole grid: build it off the event
+    # loop, and give up on big grids rather than stall the request.
+    table = await solve_cancellable(
+        game.goal_table, Budget(seconds=STATUS_SECONDS)
+    )
+    if table is None:
+        return {"status": status, "winnable": None, "best_direction": None}
+    direction = table.best_direction(game.agent)
+    return {
+        "status": status,
+        "winnable": table.is_winnable(game.agent),
+        "best_direction": None if direction is None else direction.value,
+    }
+
+
+@app.get("/games/{game_id}/plan")
+async def get_game_plan_by_id(
+    game_id: int, repo: GameRepo = Depends(get_game_repo)
+):
+    game_maybe = repo.get_game_by_id(game_id)
+    if game_maybe is None:
+        raise HTTPException(status_code=404, detail="game not found")
+    game: Game = game_maybe
+    infeasible = find_infeasibility(game)
+    if infeasible is not None:
+        return {"path": None, "infeasible": infeasible.resource.value}
+    plan = get_solve_cache().solve(
+        game, PLAN_ENGINE, lambda: get_planner(game_id, game).plan()
+    )
+    if plan is None:
+        return {"path": None}
+    return {
+        "path": plan.path,
+        "health": plan.agent.health,
+        "moves": plan.agent.moves,
+    }
@@ -1,21 +1,30 @@
+import json
 import time
-import typing
-from copy import deepcopy
-from collections import deque
+from array import array
 
 # import heapq
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from functools import cache
-from typing import Tuple, List, Optional, Set
+from typing import Callable, Tuple, List, Optional
 
 import math
 
 from gridworld.agent import Agent
+from gridworld.anytime import Budget
+from gridworld.checkpoint import (
+    DEFAULT_CHECKPOINT_SECONDS,
+    Checkpoint,
+    load_checkpoint,
+    save_checkpoint,
+)
 from gridworld.costs import Costs
-from gridworld.direction import Direction
 from gridworld.game import Game
 from gridworld.grid import Grid
-from gridworld.positions import valid_directions_from, translate_along
+from gridworld.labels import Label, cell_of, position_of
+from gridworld.solver_stats import SolverStats
+from gridworld.spill import DEFAULT_CHUNK_SIZE, SpillFile, Table, mapped_table
+from gridworld.state_store import StateStore
+from gridworld.terrain import Terrain
 
 
 @cache
@@ -88,6 +97,41 @@ class TravelingAgent:
         # Weigh each metric of equal importance.
         return (w * 0.5) + (d * 0.5)
 
+    def to_json_str(self) -> str:
+        return (
+            "{"
+            f'"agent": {self.agent.to_json_str()}'
+            f', "path": {json.dumps(self.path)}'
+            "}"
+        )
+
+    @classmethod
+    def from_label(
+        cls, label: Label, agent: Agent, dimensions: Tuple[int, int]
+    ) -> "TravelingAgent":
+        """
+        Returns a TravelingAgent for a forward search label rooted at agent.
+        """
+        path = [position_of(c, dimensions) for c in label.cells()]
+        return cls(
+            agent=Agent(
+                position=path[-1],
+                health=label.health,
+                max_health=agent.max_health,
+                moves=label.moves,
+                max_moves=agent.max_moves,
+            ),
+            path=path,
+        )
+
+    @classmethod
+    def from_json_str(cls, json_str: str) -> "TravelingAgent":
+        v = json.loads(json_str)
+        return cls(
+            agent=Agent.from_json_str(json.dumps(v["agent"])),
+            path=[(r, c) for r, c in v["path"]],
+        )
+
 
 def _some_game(dims=(2, 3)):
     start = (0, 0)
@@ -115,87 +159,292 @@ def _some_game(dims=(2, 3)):
     return game
 
 
+# Marks a cell with no best state yet.
+NO_STATE = -1
+
+# Expansions between looks at the clock for a due checkpoint.
+CHECKPOINT_POLL = 4096
+
+
 @dataclass
 class WellnessSolver:
+    """
+    Breadth-first walk of the grid state space.
+
+    States live in a StateStore rather than as TravelingAgents with copied
+    paths, and queue entries are packed ints (state * 4 + neighbor slot)
+    in a typed array, so memory grows with the states still reachable
+    rather than with path length times states.  Only the winning path is
+    rebuilt.
+
+    With a memory_limit in bytes, queue entries past half of it spill to a
+    sqlite file in spill_dir, and the per-cell tables are mapped from disk
+    if they alone would fill the other half.  The StateStore stays in
+    memory.  With a checkpoint file the walk is saved there every
+    checkpoint_seconds, and when a budget stops it, for resume().
+    """
+
     game: Game
-    # Mirrors the dimensions of the game's grid.
-    # Holds the "best" path/agent in each element.
-    _best_states: list[list[Optional[TravelingAgent]]] = field(
-        default_factory=list
-    )
+    memory_limit: Optional[int] = None
+    spill_dir: Optional[str] = None
+    checkpoint: Optional[str] = None
+    checkpoint_seconds: float = DEFAULT_CHECKPOINT_SECONDS
+    expanded: int = field(default=0, init=False)
+    # False if the last solve() stopped early on its budget.
+    complete: bool = field(default=False, init=False)
+    stats: SolverStats = field(default_factory=SolverStats, init=False)
+    # A walk loaded by resume() for the next solve() to continue.
+    _resume: Optional[Checkpoint] = field(default=None, init=False, repr=False)
 
-    # Perform a breadth-first walk of the grid state space.
     def __post_init__(self):
         if not isinstance(self.game, Game):
             raise ValueError(f"invalid game: {self.game!r}")
-        m, n = self.game.grid.dimensions
-        self._best_states = [[None for _c in range(n)] for _r in range(m)]
-        print(
-            f"dims: {m} x {n},"
-            f" states: {len(self._best_states)} x {len(self._best_states[0])}"
-        )
+        if self.memory_limit is not None and self.memory_limit <= 0:
+            raise ValueError(f"non-positive memory_limit: {self.memory_limit}")
+        if self.checkpoint_seconds <= 0:
+            raise ValueError(
+                f"non-positive checkpoint_seconds: {self.checkpoint_seconds}"
+            )
 
-    def solve(self, debug: bool = False) -> Optional[TravelingAgent]:
-        ag = deepcopy(self.game.agent)
-        pos = ag.position
-        ta = TravelingAgent(agent=ag, path=[pos])
-        seen: Set[Tuple[Direction, Tuple[int, int]]] = set()
+    def _traveling_agent(self, store: StateStore, s: int) -> TravelingAgent:
         dims = self.game.grid.dimensions
-        dirs = valid_directions_from(position=pos, dimensions=dims)
-        dir_pos_pairs = [
-            (d, translate_along(position=pos, direction=d)) for d in dirs
-        ]
-        self._best_states[pos[0]][pos[1]] = ta
-        queue: typing.Deque[
-            Tuple[Direction, Tuple[int, int], TravelingAgent]
-        ] = deque()
-        for d, p in dir_pos_pairs:
-            entry = (d, p, deepcopy(ta))
-            queue.append(entry)
+        agent = self.game.agent
+        return TravelingAgent(
+            agent=Agent(
+                position=position_of(store.cell[s], dims),
+                health=store.health[s],
+                max_health=agent.max_health,
+                moves=store.moves[s],
+                max_moves=agent.max_moves,
+            ),
+            path=[position_of(c, dims) for c in store.cells(s)],
+        )
+
+    @classmethod
+    def resume(
+        cls,
+        path: str,
+        memory_limit: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        checkpoint: Optional[str] = None,
+        checkpoint_seconds: float = DEFAULT_CHECKPOINT_SECONDS,
+    ) -> "WellnessSolver":
+        """
+        Returns a solver whose next solve() continues the walk saved at
+        path, checkpointing back to path unless told otherwise.
+        """
+        saved = load_checkpoint(path)
+        solver = cls(
+            saved.game,
+            memory_limit=memory_limit,
+            spill_dir=spill_dir,
+            checkpoint=path if checkpoint is None else checkpoint,
+            checkpoint_seconds=checkpoint_seconds,
+        )
+        solver._resume = saved
+        return solver
+
+    def solve(
+        self,
+        debug: bool = False,
+        budget: Optional[Budget] = None,
+        on_improve: Optional[Callable[[TravelingAgent], None]] = None,
+    ) -> Optional[TravelingAgent]:
+        """
+        Returns the best path found to the goal, or None if there is none.
+
+        With a budget, the walk stops once the budget runs out and returns
+        the best path found so far.  on_improve is called with each path
+        to the goal that replaces the best one so far.
+        """
+        stats = self.stats = SolverStats()
         t0 = time.perf_counter()
-        while queue:
-            from_dir, new_pos, trav_ag = queue.popleft()
-            if debug:
-                print(
-                    f"from_dir={from_dir}"
-                    f", new_pos={new_pos}"
-                    f", terr={self.game.grid[new_pos]}"
-                    f", trav_ag={trav_ag}"
-                )
-            new_agent = self.game.speculative_move(from_dir, trav_ag.agent)
-            if debug:
-                print(f" - new_agent={new_agent}")
-            if new_agent is None or new_agent.is_dead():
-                continue
-            curr_best = self._best_states[new_pos[0]][new_pos[1]]
-            if (
-                curr_best is not None
-                and curr_best.agent.health > new_agent.health
-                and curr_best.agent.moves > new_agent.moves
-            ):
-                # If what we already have is clearly better, no need to go
-                # down this road any further.
-                continue
-            new_path = trav_ag.path[:]
-            new_path.append(new_pos)
-            new_ta = TravelingAgent(agent=new_agent, path=new_path)
-            if curr_best is None or curr_best.wellness < new_ta.wellness:
-                self._best_states[new_pos[0]][new_pos[1]] = new_ta
-            elif curr_best.wellness == new_ta.wellness and len(ta.path) < len(
-                curr_best.path
-            ):
-                self._best_states[new_pos[0]][new_pos[1]] = new_ta
-            seen.add((from_dir, new_pos))
-            dirs = valid_directions_from(position=new_pos, dimensions=dims)
-            dir_pos_pairs = [
-                (d, translate_along(position=new_pos, direction=d))
-                for d in dirs
-            ]
-            for d, p in dir_pos_pairs:
-                if not (d, p) in seen:
-                    queue.append((d, p, new_ta))
+        game = self.game
+        agent = game.agent
+        dims = game.grid.dimensions
+        steps = game.grid.compile(game.costs).steps
+        goal = cell_of(game.goal_position, dims)
+        saved, self._resume = self._resume, None
+        limit = self.memory_limit
+        # best holds the best state reached so far on each cell, which
+        # holds a reference.  seen marks the directed edges (cell * 4 +
+        # neighbor slot) already walked.  Both go to disk once they alone
+        # would fill half of memory_limit.
+        cells = len(game.grid)
+        best: Table
+        seen: Table
+        if limit is not None and 8 * cells > limit // 2:
+            best = mapped_table("i", cells, 0xFF, self.spill_dir)
+            seen = mapped_table("B", 4 * cells, 0, self.spill_dir)
+            if saved is not None:
+                best[:] = saved.best
+                seen[:] = saved.seen
+        elif saved is not None:
+            best, seen = saved.best, saved.seen
+        else:
+            best = array("i", [NO_STATE]) * cells
+            seen = bytearray(4 * cells)
+        # The queue runs from queue[head:] through any chunks spilled to
+        # disk to tail, where entries are appended.  Past held entries in
+        # memory the tail spills.
+        spill = None
+        held = chunk_size = 0
+        if limit is not None:
+            spill = SpillFile(self.spill_dir)
+            held = max(1, limit // 8)
+            chunk_size = max(1, min(DEFAULT_CHUNK_SIZE, held // 2))
+        queue = array("i")
+        head = 0
+        tail = array("i")
+        if saved is None:
+            store = StateStore()
+            start = cell_of(agent.position, dims)
+            root = store.add(start, agent.health, agent.moves, store.NO_PARENT)
+            best[start] = root
+            for k in range(len(steps[start])):
+                tail.append(root * 4 + k)
+                store.hold(root)
+            stats.peak_queue = len(tail)
+            self.expanded = 0
+        else:
+            store = saved.store
+            stats = self.stats = saved.stats
+            for chunk in saved.frontier():
+                if spill is not None and len(tail) >= chunk_size:
+                    spill.push(tail)
+                    tail = array("i")
+                tail.extend(chunk)
+            self.expanded = saved.expanded
+        self.complete = False
+        checkpoint = self.checkpoint
+        last_saved = time.monotonic()
+
+        def save(search_time: float) -> None:
+            assert checkpoint is not None
+            frontier = [queue[head:]]
+            if spill is not None:
+                frontier.extend(spill.chunks())
+            frontier.append(tail)
+            save_checkpoint(
+                checkpoint,
+                game,
+                self.expanded,
+                replace(
+                    stats,
+                    peak_live=store.peak_live,
+                    search_time=stats.search_time + search_time,
+                ),
+                store,
+                best,
+                seen,
+                frontier,
+            )
+
+        if budget is not None:
+            budget.start()
         t1 = time.perf_counter()
-        dt = t1 - t0
-        print(f"elapsed time: {dt:0.4f}")
-        goal_r, goal_c = self.game.goal_position
-        return self._best_states[goal_r][goal_c]
+        stats.setup_time += t1 - t0
+        try:
+            while True:
+                if head == len(queue):
+                    head = 0
+                    if spill is not None and len(spill):
+                        queue = spill.pop() or array("i")
+                    else:
+                        queue, tail = tail, array("i")
+                        if not queue:
+                            self.complete = True
+                            break
+                if budget is not None and budget.is_exhausted(self.expanded):
+                    if checkpoint is not None:
+                        save(time.perf_counter() - t1)
+                    break
+                if (
+                    checkpoint is not None
+                    and self.expanded % CHECKPOINT_POLL == 0
+                    and time.monotonic() - last_saved
+                    >= self.checkpoint_seconds
+                ):
+                    save(time.perf_counter() - t1)
+                    last_saved = time.monotonic()
+                s, k = divmod(queue[head], 4)
+                head += 1
+                if head >= 4096 and head * 2 >= len(queue):
+                    del queue[:head]
+                    head = 0
+                self.expanded += 1
+                stats.popped += 1
+                src = store.cell[s]
+                cell, health_cost, move_cost = steps[src][k]
+                health = store.health[s] + health_cost
+                moves = store.moves[s] + move_cost
+                if debug:
+                    print(
+                        f"from={position_of(src, dims)}"
+                        f", to={position_of(cell, dims)}"
+                        f", terr={Terrain(game.grid.cells[cell])}"
+                        f", health={health}, moves={moves}"
+                    )
+                if health <= 0 or moves <= 0:
+                    store.release(s)
+                    continue
+                curr = best[cell]
+                if (
+                    curr != NO_STATE
+                    and store.health[curr] > health
+                    and store.moves[curr] > moves
+                ):
+                    # If what we already have is clearly better, no need to
+                    # go down this road any further.
+                    stats.pruned += 1
+                    store.release(s)
+                    continue
+                new = store.add(cell, health, moves, s)
+                store.release(s)
+                wellness = health * moves
+                if curr == NO_STATE or (
+                    store.health[curr] * store.moves[curr] < wellness
+                ):
+                    improved = True
+                else:
+                    # Ties go to the newer state, unless the best is the
+                    # root.
+                    improved = (
+                        store.health[curr] * store.moves[curr] == wellness
+                        and store.parent[curr] != store.NO_PARENT
+                    )
+                if improved:
+                    best[cell] = new
+                    store.hold(new)
+                    if curr != NO_STATE:
+                        store.release(curr)
+                    if cell == goal and on_improve is not None:
+                        on_improve(self._traveling_agent(store, new))
+                seen[src * 4 + k] = 1
+                for j in range(len(steps[cell])):
+                    if seen[cell * 4 + j]:
+                        stats.duplicates += 1
+                    else:
+                        tail.append(new * 4 + j)
+                        store.hold(new)
+                store.release(new)
+                waiting = len(queue) - head + len(tail)
+                if spill is not None:
+                    if len(tail) >= chunk_size and waiting > held:
+                        spill.push(tail)
+                        waiting -= len(tail)
+                        tail = array("i")
+                    waiting += spill.items
+                if waiting > stats.peak_queue:
+                    stats.peak_queue = waiting
+        finally:
+            if spill is not None:
+                spill.close()
+        t2 = time.perf_counter()
+        stats.search_time += t2 - t1
+        stats.peak_live = store.peak_live
+        got = None
+        if best[goal] != NO_STATE:
+            got = self._traveling_agent(store, best[goal])
+        stats.reconstruct_time += time.perf_counter() - t2
+        return got